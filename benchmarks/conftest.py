@@ -0,0 +1,93 @@
+"""Shared fixtures of the benchmark suite."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+
+MOOS_FILES = Path(__file__).parent.parent / "tests" / "moos_files"
+
+SMALL_MISSION = """\
+ServerHost = localhost
+ServerPort = 9000
+Community  = alpha
+
+ProcessConfig = ANTLER
+{
+  MSBetweenLaunches = 200
+
+  Run = MOOSDB          @ NewConsole = false
+  Run = pHelmIvP        @ NewConsole = false
+}
+
+ProcessConfig = pHelmIvP
+{
+  AppTick   = 4
+  CommsTick = 4
+
+  behaviors  = alpha.bhv
+  domain     = course:0:359:360
+  domain     = speed:0:4:41
+}
+"""
+
+
+def synthetic_mission(lines: int) -> str:
+    """Generate a mission file of about ``lines`` lines.
+
+    Args:
+        lines: the number of lines to generate.
+
+    Returns:
+        The mission file contents.
+    """
+    apps = max(1, lines // 12)
+    text: List[str] = [
+        "ServerHost = localhost\n",
+        "ServerPort = 9000\n",
+        "Community  = alpha\n",
+        "\n",
+        "ProcessConfig = ANTLER\n",
+        "{\n",
+        "  MSBetweenLaunches = 200\n",
+    ]
+    text += [f"  Run = pApp{i}  @ NewConsole = false ~pApp{i}\n" for i in range(apps)]
+    text.append("}\n")
+    for i in range(apps):
+        text += [
+            "\n",
+            f"// pApp{i} config block\n",
+            f"ProcessConfig = pApp{i}\n",
+            "{\n",
+            "  AppTick   = 4\n",
+            "  CommsTick = 4  // comment\n",
+            f"  value_{i} = {i}\n",
+            "  domain    = course:0:359:360\n",
+            "  domain    = speed:0:4:41\n",
+            "}\n",
+        ]
+    return "".join(text)
+
+
+@pytest.fixture(
+    params=["small", "medium", "10k"],
+)
+def mission_text(request: pytest.FixtureRequest) -> str:
+    """A small, a medium (real world) and a synthetic 10k line mission."""
+    if request.param == "small":
+        return SMALL_MISSION
+    if request.param == "medium":
+        return (MOOS_FILES / "s15_pedi_alpha.moos").read_text()
+    return synthetic_mission(10_000)
+
+
+@pytest.fixture
+def fleet_missions(tmp_path: Path) -> List[Path]:
+    """Forty missions of a shoreside plus fleet setup."""
+    paths = []
+    for i in range(40):
+        path = tmp_path / f"vehicle{i}.moos"
+        path.write_text(synthetic_mission(2_000))
+        paths.append(path)
+    return paths
@@ -0,0 +1,16 @@
+"""Benchmarks of checking many mission files across a process pool."""
+
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from launch_moos.batch import check_missions
+
+
+@pytest.mark.parametrize("jobs", sorted({1, os.cpu_count() or 1}))
+def test_check_missions(benchmark, fleet_missions: List[Path], jobs: int) -> None:
+    results = benchmark(check_missions, fleet_missions, jobs=jobs)
+
+    assert all(result.ok for result in results)
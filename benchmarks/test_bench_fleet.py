@@ -0,0 +1,26 @@
+"""Benchmarks of expanding a mission into a fleet."""
+
+from pathlib import Path
+
+import pytest
+
+from launch_moos.fleet import expand_fleet
+from launch_moos.mission import Mission
+
+
+MISSION_FILE = (
+    Path(__file__).parent.parent / "tests" / "moos_files" / "s15_pedi_alpha.moos"
+)
+
+
+@pytest.mark.parametrize("vehicles", [10, 100])
+def test_expand_fleet(benchmark, vehicles: int) -> None:
+    mission = Mission.from_file(MISSION_FILE)
+    overrides = {
+        f"vehicle{i}": {"LatOrigin": 43.8 + i / 1000, "pHelmIvP": {"AppTick": 2}}
+        for i in range(vehicles)
+    }
+
+    fleet = benchmark(expand_fleet, mission, overrides)
+
+    assert len({vehicle.server_port for vehicle in fleet}) == vehicles
@@ -0,0 +1,40 @@
+"""Benchmarks of building launch actions, with ``echo`` standing in for MOOS apps."""
+
+import os
+
+import pytest
+from launch import LaunchDescription
+
+from launch_moos.actions import MOOSApp
+from launch_moos.mission import Mission
+from launch_moos.transform import mission_to_actions
+
+
+def echo_mission(apps: int) -> Mission:
+    runs = "".join(f"  Run = echo @ NewConsole = false ~pApp{i}\n" for i in range(apps))
+    blocks = "".join(
+        f"ProcessConfig = pApp{i}\n{{\n  AppTick = 4\n  value = {i}\n}}\n"
+        for i in range(apps)
+    )
+    return Mission.from_string(
+        f"ServerPort = 9000\nProcessConfig = ANTLER\n{{\n{runs}}}\n{blocks}"
+    )
+
+
+def test_create_moos_file(benchmark) -> None:
+    config = [(f"Var{i}", i) for i in range(20)]
+    global_config = [("ServerHost", "localhost"), ("ServerPort", 9000)]
+
+    def create() -> None:
+        os.unlink(MOOSApp.Create_moos_file("pHelmIvP", config, global_config))
+
+    benchmark(create)
+
+
+@pytest.mark.parametrize("apps", [1, 10, 100])
+def test_launch_description(benchmark, apps: int) -> None:
+    mission = echo_mission(apps)
+
+    ld = benchmark(lambda: LaunchDescription(mission_to_actions(mission)))
+
+    assert len(ld.entities) == apps
@@ -0,0 +1,15 @@
+"""Benchmarks of sampling the resource use of apps."""
+
+import os
+
+from launch_moos.metrics import ResourceSampler
+
+
+def test_sample_50_apps(benchmark) -> None:
+    sampler = ResourceSampler()
+    for i in range(50):
+        sampler.add(f"app{i}", os.getpid())
+
+    benchmark(sampler.sample)
+
+    assert len(sampler.history("app0")) > 0
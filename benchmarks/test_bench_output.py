@@ -0,0 +1,35 @@
+"""Benchmarks of the batched output of chatty apps."""
+
+import logging
+
+import pytest
+
+from launch_moos.output import STDOUT
+from launch_moos.output import OutputBatching
+from launch_moos.output import OutputMatcher
+from launch_moos.output import OutputPipeline
+
+
+# a second of uSimMarine output, in 4 KiB chunks as read from the pipe
+OUTPUT = b"".join(b"NAV_X=%d.5,NAV_Y=-12.25,NAV_SPEED=1.2\n" % i for i in range(5000))
+CHUNKS = [OUTPUT[i : i + 4096] for i in range(0, len(OUTPUT), 4096)]
+
+
+@pytest.mark.parametrize("matchers", [0, 4])
+def test_output_pipeline(benchmark, matchers: int) -> None:
+    logger = logging.getLogger("bench_output")
+    logger.propagate = False
+    batching = OutputBatching(
+        matchers=[
+            OutputMatcher(r"DEPLOY=(\w+)", lambda stream, match: None, contains="DEP")
+            for _ in range(matchers)
+        ]
+    )
+
+    def run() -> int:
+        pipeline = OutputPipeline(logger, batching)
+        for chunk in CHUNKS:
+            pipeline.feed(STDOUT, chunk)
+        return pipeline.flush()
+
+    assert benchmark(run) == 5000
@@ -0,0 +1,30 @@
+"""Benchmarks of parsing mission files."""
+
+from pathlib import Path
+
+import pytest
+
+from launch_moos import parser
+from launch_moos.cache import ParseCache
+from launch_moos.mission import Mission
+
+
+def test_pyparsing_grammar(benchmark, mission_text: str) -> None:
+    benchmark(parser.moos_file.parse_string, mission_text, parse_all=True)
+
+
+@pytest.mark.parametrize("backend", parser.PARSER_BACKENDS)
+def test_parse_mission(benchmark, mission_text: str, backend: str) -> None:
+    benchmark(parser.parse_mission, mission_text, backend=backend)
+
+
+def test_mission_from_string(benchmark, mission_text: str) -> None:
+    benchmark(Mission.from_string, mission_text)
+
+
+def test_parse_cache_hit(benchmark, mission_text: str, tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path)
+    content = mission_text.encode()
+    cache.parse(content)
+
+    benchmark(cache.parse, content)
@@ -0,0 +1,34 @@
+"""Benchmarks of rendering generated mission files."""
+
+import pytest
+
+from launch_moos.moosfile_generator import evaluate_template
+
+
+@pytest.fixture(params=[False, True], ids=["renderer", "empy"])
+def use_empy(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> bool:
+    """Render with the built-in renderer, then with empy."""
+    if request.param:
+        em = pytest.importorskip("em")
+        # see the empy fixture of tests/test_mission_file_generator.py
+        monkeypatch.setattr(em.Interpreter, "_wasProxyInstalled", False)
+    return bool(request.param)
+
+
+GLOBAL_VARIABLES = [
+    ("ServerHost", "localhost"),
+    ("ServerPort", 9000),
+    ("Community", "alpha"),
+    ("MOOSTimeWarp", 1),
+]
+
+
+@pytest.mark.parametrize("variables", [1, 50, 1000])
+def test_evaluate_template(benchmark, variables: int, use_empy: bool) -> None:
+    data = {
+        "process_name": "pHelmIvP",
+        "global_variables": GLOBAL_VARIABLES,
+        "process_variables": [(f"Var{i}", f"value {i}") for i in range(variables)],
+    }
+
+    benchmark(evaluate_template, data, use_empy=use_empy)
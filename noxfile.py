@@ -169,6 +169,24 @@ def tests(session: Session) -> None:
             session.notify("coverage", posargs=[])
 
 
+@session(python=python_versions[0])
+def benchmarks(session: Session) -> None:
+    """Run the benchmark suite, saving the results as JSON.
+
+    Results are kept in .benchmarks, compare them between commits with
+    ``nox --session=benchmarks -- --benchmark-compare``.
+    """
+    session.install(".")
+    session.install("pytest", "pytest-benchmark")
+    session.run(
+        "pytest",
+        "benchmarks",
+        "--benchmark-autosave",
+        "--benchmark-storage=.benchmarks",
+        *session.posargs,
+    )
+
+
 @session(python=python_versions[0])
 def coverage(session: Session) -> None:
     """Produce the coverage report."""
@@ -1,6 +1,44 @@
-"""launch_moos"""
+"""launch_moos
 
-from .mission_launch_description_source import MOOSMissionFileDescriptionSource
+The classes exported here need ``launch``, which is only imported once one of
+them is used, so that tools working on mission files alone import quickly.
+"""
+import importlib
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import List
 
 
-__all__ = ["MOOSMissionFileDescriptionSource"]
+if TYPE_CHECKING:
+    from .community import MOOSCommunity
+    from .frontend import CachedFrontendLaunchDescriptionSource
+    from .mission_launch_description_source import MOOSMissionFileDescriptionSource
+
+
+__all__ = [
+    "CachedFrontendLaunchDescriptionSource",
+    "MOOSCommunity",
+    "MOOSMissionFileDescriptionSource",
+]
+
+_EXPORTS = {
+    "CachedFrontendLaunchDescriptionSource": ".frontend",
+    "MOOSCommunity": ".community",
+    "MOOSMissionFileDescriptionSource": ".mission_launch_description_source",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the exported classes on first use."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List the exported classes along with the module attributes."""
+    return sorted(set(globals()) | set(__all__))
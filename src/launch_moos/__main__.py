@@ -1,12 +1,260 @@
-"""Command-line interface."""
+"""Command-line interface.
+
+Only click is imported up front, every command imports what it needs when it
+runs, so that ``--help`` and ``--dry-run`` start quickly.
+"""
+import sys
+from pathlib import Path
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+
 import click
 
 
-@click.command()
+_mission_file_argument = click.argument(
+    "mission_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+
+_define_option = click.option(
+    "-D",
+    "--define",
+    "defines",
+    multiple=True,
+    metavar="VAR=VALUE",
+    help="Define an nsplug macro before the mission file is read.",
+)
+
+
+@click.group()
 @click.version_option()
 def main() -> None:
     """launch.moos."""
 
 
+@main.command()
+@_mission_file_argument
+@_define_option
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Print the command lines and the generated mission file, spawn nothing.",
+)
+@click.option(
+    "--profile", is_flag=True, help="Print the time spent in every launch stage."
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Write the launch timeline to this Chrome trace JSON file.",
+)
+@click.option(
+    "--stagger/--no-stagger",
+    default=True,
+    show_default=True,
+    help="Start MOOSDB first and the other apps one after the other.",
+)
+@click.option(
+    "--hot-reload", is_flag=True, help="Restart the apps whose block changes."
+)
+@click.option(
+    "--preflight/--no-preflight",
+    default=True,
+    show_default=True,
+    help="Check the mission for launch-breaking mistakes before spawning.",
+)
+@click.option(
+    "--file-backend",
+    type=click.Choice(["disk", "memory"]),
+    default="disk",
+    show_default=True,
+    help="Where the community mission file is generated.",
+)
+def run(
+    mission_file: Path,
+    defines: Sequence[str],
+    dry_run: bool,
+    profile: bool,
+    trace: Optional[Path],
+    stagger: bool,
+    hot_reload: bool,
+    preflight: bool,
+    file_backend: str,
+) -> None:
+    """Launch the community of MISSION_FILE, as Antler would."""
+    macros = _parse_defines(defines)
+    tracer = None
+    if profile or trace is not None:
+        from . import tracing
+
+        # with --trace the summary is printed once the trace is written
+        tracer = tracing.enable(trace)
+
+    try:
+        if dry_run:
+            _dry_run(mission_file, macros, preflight)
+            return
+        returncode = _launch(
+            mission_file, macros, stagger, hot_reload, preflight, file_backend
+        )
+    finally:
+        if profile and trace is None and tracer is not None:
+            click.echo(tracer.summary(), err=True)
+    sys.exit(returncode)
+
+
+@main.command("compile")
+@_mission_file_argument
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="The launch file to write, MISSION.launch.py by default.",
+)
+@_define_option
+@click.option(
+    "--stagger/--no-stagger",
+    default=True,
+    show_default=True,
+    help="Start MOOSDB first and the other apps one after the other.",
+)
+@click.option("--force", is_flag=True, help="Compile even if up to date.")
+def compile_(
+    mission_file: Path,
+    output: Optional[Path],
+    defines: Sequence[str],
+    stagger: bool,
+    force: bool,
+) -> None:
+    """Compile MISSION_FILE into a Python launch file.
+
+    The launch file is only rewritten when the mission file, or a file it
+    includes, changed since it was compiled.
+    """
+    from .compiler import compile_mission
+    from .compiler import default_output
+
+    macros = _parse_defines(defines)
+    output = output or default_output(mission_file)
+    try:
+        compiled = compile_mission(mission_file, output, macros, stagger, force)
+    except _mission_errors() as e:
+        raise click.ClickException(f"{mission_file}: {e}") from e
+    click.echo(f"{'compiled' if compiled else 'up to date'}: {output}")
+
+
+@main.command()
+@click.argument(
+    "mission_files",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="The number of worker processes, the number of CPUs by default.",
+)
+@_define_option
+def check(
+    mission_files: Sequence[Path], jobs: Optional[int], defines: Sequence[str]
+) -> None:
+    """Parse and validate MISSION_FILES in parallel."""
+    from .batch import check_missions
+
+    results = check_missions(mission_files, jobs, _parse_defines(defines))
+    for result in results:
+        if result.ok:
+            assert result.mission is not None  # noqa: S101
+            click.echo(f"ok: {result.path} ({len(result.mission.runs)} apps)")
+        else:
+            click.echo(f"error: {result.path}: {result.error}", err=True)
+
+    failed = sum(not result.ok for result in results)
+    if failed:
+        raise click.ClickException(f"{failed} of {len(results)} missions are invalid")
+
+
+def _parse_defines(defines: Sequence[str]) -> Dict[str, str]:
+    macros = {}
+    for define in defines:
+        name, sep, value = define.partition("=")
+        if not sep or not name:
+            raise click.BadParameter(
+                f"'{define}' is not VAR=VALUE", param_hint="'-D' / '--define'"
+            )
+        macros[name] = value
+    return macros
+
+
+def _mission_errors() -> Tuple[Type[Exception], ...]:
+    # only evaluated once an exception is raised, pyparsing is not imported
+    # by the tokenizer until then
+    import pyparsing as pp
+
+    from .nsplug import PreprocessError
+    from .plan import InvalidMissionFileError
+
+    return PreprocessError, InvalidMissionFileError, pp.ParseBaseException
+
+
+def _dry_run(mission_file: Path, macros: Dict[str, str], preflight: bool) -> None:
+    from .cache import ParseCache
+    from .nsplug import Preprocessor
+    from .plan import MISSION_FILE_PLACEHOLDER
+    from .plan import plan_mission
+    from .preflight import preflight as check
+
+    try:
+        text = Preprocessor().preprocess_file(mission_file, macros)
+        mission = ParseCache().parse(text.encode())
+        # nothing is spawned, the plan is shown whatever is missing on this
+        # machine
+        problems = check(mission) if preflight else []
+        plan = plan_mission(mission)
+    except _mission_errors() as e:
+        raise click.ClickException(f"{mission_file}: {e}") from e
+
+    for problem in problems:
+        click.echo(f"{mission_file}: {problem}", err=True)
+
+    for app in plan.apps:
+        click.echo(f"{app.name}: {app.command_line}")
+    click.echo(f"\n# {MISSION_FILE_PLACEHOLDER}")
+    click.echo(plan.mission_file, nl=False)
+
+
+def _launch(
+    mission_file: Path,
+    macros: Dict[str, str],
+    staggered: bool,
+    hot_reload: bool,
+    preflight: bool,
+    file_backend: str,
+) -> int:
+    from launch import LaunchDescription
+    from launch import LaunchService
+    from launch.actions import IncludeLaunchDescription
+
+    from .mission_launch_description_source import MOOSMissionFileDescriptionSource
+
+    source = MOOSMissionFileDescriptionSource(
+        str(mission_file.resolve()),
+        staggered=staggered,
+        hot_reload=hot_reload,
+        preflight=preflight,
+        macros=macros,
+        file_backend=file_backend,
+    )
+    service = LaunchService()
+    service.include_launch_description(
+        LaunchDescription([IncludeLaunchDescription(source)])
+    )
+    return service.run()
+
+
 if __name__ == "__main__":
     main(prog_name="launch_moos")  # pragma: no cover
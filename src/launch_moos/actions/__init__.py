@@ -1,8 +1,18 @@
 """actions Module."""
 
+from .hot_reload_mission import HotReloadMission
+from .include_cached_launch_description import IncludeCachedLaunchDescription
+from .include_moos_mission import IncludeMOOSMission
 from .moosapp import MOOSApp
+from .resource_monitor import ResourceMonitor
+from .staggered_launch import StaggeredLaunch
 
 
 __all__ = [
+    "HotReloadMission",
+    "IncludeCachedLaunchDescription",
+    "IncludeMOOSMission",
     "MOOSApp",
+    "ResourceMonitor",
+    "StaggeredLaunch",
 ]
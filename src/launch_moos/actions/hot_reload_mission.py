@@ -0,0 +1,225 @@
+"""Module for the HotReloadMission action."""
+import asyncio
+from pathlib import Path
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Text
+from typing import Union
+
+import launch.logging
+import pyparsing as pp
+from launch.action import Action
+from launch.actions import EmitEvent
+from launch.actions import OpaqueFunction
+from launch.actions import RegisterEventHandler
+from launch.event import Event
+from launch.event_handler import EventHandler
+from launch.event_handlers import OnProcessExit
+from launch.event_handlers import OnShutdown
+from launch.events import matches_action
+from launch.events.process import ShutdownProcess
+from launch.launch_context import LaunchContext
+
+from .. import transform
+from ..community import MOOSCommunity
+from ..incremental import IncrementalParser
+from ..incremental import MissionDiff
+from ..nsplug import PreprocessError
+from ..scheduling import without_scheduling_keys
+from ..watch import DEFAULT_POLL_INTERVAL
+from ..watch import MissionFileWatcher
+from .moosapp import MOOSApp
+from .staggered_launch import StaggeredLaunch
+
+
+class MissionFileChanged(Event):
+    """Event emitted when a watched mission file changes."""
+
+    name = "launch_moos.events.MissionFileChanged"
+
+    def __init__(self, *, action: "HotReloadMission", text: str) -> None:
+        """
+        Create a MissionFileChanged event.
+
+        :param action: the action watching the file
+        :param text: the new contents of the file
+        """
+        super().__init__()
+        self.action = action
+        self.text = text
+
+
+class HotReloadMission(Action):
+    """Action restarting the apps whose ProcessConfig block changed.
+
+    The mission file and the files it includes are watched for as long as the
+    launch runs. When one of them changes, the mission file is re-parsed
+    incrementally and only the apps whose block was
+    modified, added or removed are restarted, with the community mission file
+    rewritten first. MOOSDB and every other app keep running.
+
+    Changes to the global configuration or to the ANTLER block are reported
+    but need a full relaunch.
+    """
+
+    def __init__(
+        self,
+        *,
+        mission_file: Union[str, Path],
+        apps: Mapping[Text, MOOSApp],
+        community: MOOSCommunity,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        preprocess: Optional[Callable[[str], str]] = None,
+        dependencies: Iterable[Union[str, Path]] = (),
+        launcher: Optional[StaggeredLaunch] = None,
+        **kwargs
+    ) -> None:
+        """
+        Create a HotReloadMission action.
+
+        :param mission_file: the source mission file to watch
+        :param apps: the apps launched from the mission, by the name of their
+            ProcessConfig block
+        :param community: the community the apps share a mission file with
+        :param poll_interval: seconds between checks if inotify is unavailable
+        :param preprocess: applied to the contents of the mission file before
+            parsing, for example to expand nsplug directives, it must read
+            the included files again on every call
+        :param dependencies: the files included by the mission file
+        :param launcher: the action starting the apps, if they are started
+            staggered, apps it did not start yet are replaced in it
+        """
+        super().__init__(**kwargs)
+        self.__mission_file = Path(mission_file)
+        self.__apps: Dict[Text, MOOSApp] = dict(apps)
+        self.__community = community
+        self.__poll_interval = poll_interval
+        self.__preprocess = preprocess or (lambda text: text)
+        self.__dependencies = [Path(dependency) for dependency in dependencies]
+        self.__launcher = launcher
+        self.__parser = IncrementalParser()
+        self.__parser.update(self.__preprocess(self.__mission_file.read_text()))
+        self.__watch_task: Optional["asyncio.Task[None]"] = None
+        self.__logger = launch.logging.get_logger(__name__)
+
+    @property
+    def apps(self) -> Dict[Text, MOOSApp]:
+        """The current app action of every watched app, by name."""
+        return dict(self.__apps)
+
+    def execute(self, context: LaunchContext) -> None:
+        """Start watching the mission file."""
+        watcher = MissionFileWatcher(
+            self.__mission_file,
+            self.__poll_interval,
+            dependencies=self.__dependencies,
+        )
+
+        context.register_event_handler(
+            EventHandler(
+                matcher=lambda event: isinstance(event, MissionFileChanged)
+                and event.action is self,
+                entities=OpaqueFunction(
+                    function=lambda context: self.reload(
+                        context, context.locals.event.text
+                    )
+                ),
+            )
+        )
+        context.register_event_handler(OnShutdown(on_shutdown=self.__on_shutdown))
+        self.__watch_task = context.asyncio_loop.create_task(
+            self.__watch(context, watcher)
+        )
+
+    async def __watch(
+        self, context: LaunchContext, watcher: MissionFileWatcher
+    ) -> None:
+        async for contents in watcher.changes():
+            text = contents.decode(errors="replace")
+            context.emit_event_sync(MissionFileChanged(action=self, text=text))
+
+    def __on_shutdown(self, event: Event, context: LaunchContext) -> None:
+        if self.__watch_task is not None:
+            self.__watch_task.cancel()
+
+    def reload(self, context: LaunchContext, text: str) -> Optional[List[Action]]:
+        """Apply a new version of the mission file.
+
+        Args:
+            context: the launch context.
+            text: the new mission file contents.
+
+        Returns:
+            The actions restarting the affected apps.
+        """
+        try:
+            diff = self.__parser.update(self.__preprocess(text))
+        except (pp.ParseException, PreprocessError) as e:
+            self.__logger.error(
+                "not reloading '{}', it is invalid: {}".format(self.__mission_file, e)
+            )
+            return None
+
+        self.__warn_relaunch(diff)
+
+        mission = self.__parser.mission
+        names = [name for name in diff.affected if name in self.__apps]
+        for name in names:
+            block = mission.process_config(name)
+            self.__community.update_process(
+                name, without_scheduling_keys(block.config) if block is not None else ()
+            )
+        if not names:
+            return None
+        mission_file = self.__community.get_mission_file(context)
+
+        actions: List[Action] = []
+        for name in names:
+            run = next((run for run in mission.runs if run.name == name), None)
+            if run is None:
+                continue
+            try:
+                app = transform.antler_run_statement_to_action(
+                    run, mission, self.__community, mission_file
+                )
+            except transform.InvalidMissionFileError as e:
+                self.__logger.error("not restarting '{}': {}".format(name, e))
+                continue
+            self.__logger.info(
+                "restarting '{}' with its new configuration".format(name)
+            )
+            actions += _restart(self.__apps[name], app, self.__launcher)
+            self.__apps[name] = app
+        return actions
+
+    def __warn_relaunch(self, diff: MissionDiff) -> None:
+        if diff.globals_changed:
+            self.__logger.warning(
+                "global configuration changes need a relaunch: {}".format(
+                    ", ".join(diff.globals_changed)
+                )
+            )
+        if "ANTLER" in diff.affected:
+            self.__logger.warning("ANTLER block changes need a relaunch")
+
+
+def _restart(
+    old: MOOSApp, new: MOOSApp, launcher: Optional[StaggeredLaunch]
+) -> List[Action]:
+    """Start ``new`` once ``old`` has exited, shutting ``old`` down."""
+    if launcher is not None and launcher.replace(old, new):
+        # not started yet, the launcher starts new in its turn instead
+        return []
+    future = old.get_asyncio_future()
+    if future is None or future.done():
+        return [new]
+    return [
+        RegisterEventHandler(
+            OnProcessExit(target_action=old, on_exit=[new], handle_once=True)
+        ),
+        EmitEvent(event=ShutdownProcess(process_matcher=matches_action(old))),
+    ]
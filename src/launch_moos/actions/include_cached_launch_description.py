@@ -0,0 +1,69 @@
+"""Module for the IncludeCachedLaunchDescription action."""
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from launch.action import Action
+from launch.actions import IncludeLaunchDescription
+from launch.frontend import Entity
+from launch.frontend import Parser
+from launch.frontend import expose_action
+from launch.some_substitutions_type import SomeSubstitutionsType
+
+from ..frontend import CachedFrontendLaunchDescriptionSource
+
+
+@expose_action("include_cached")
+class IncludeCachedLaunchDescription(IncludeLaunchDescription):
+    """Action that includes an XML or YAML launch file through the tree cache.
+
+    Same as ``<include>``, except that the entity tree of the file is parsed
+    once per process, see :func:`launch_moos.frontend.load_launch_file`. In
+    the launch file of a fleet including the file of a vehicle per vehicle::
+
+        <include_cached file="$(dirname)/vehicle.launch.xml">
+          <arg name="vname" value="alpha"/>
+        </include_cached>
+    """
+
+    def __init__(
+        self,
+        launch_file: SomeSubstitutionsType,
+        *,
+        launch_arguments: Optional[
+            Iterable[Tuple[SomeSubstitutionsType, SomeSubstitutionsType]]
+        ] = None,
+        **kwargs
+    ) -> None:
+        """
+        Create an IncludeCachedLaunchDescription.
+
+        :param launch_file: the path to the XML or YAML launch file
+        :param launch_arguments: the arguments given to the launch file
+        """
+        super().__init__(
+            CachedFrontendLaunchDescriptionSource(launch_file),
+            launch_arguments=launch_arguments,
+            **kwargs
+        )
+
+    @classmethod
+    def parse(cls, entity: Entity, parser: Parser):
+        """Parse include_cached."""
+        _, kwargs = Action.parse(entity, parser)
+        kwargs["launch_file"] = parser.parse_substitution(entity.get_attr("file"))
+
+        args = entity.get_attr("arg", data_type=List[Entity], optional=True)
+        if args is not None:
+            kwargs["launch_arguments"] = [
+                (
+                    parser.parse_substitution(arg.get_attr("name")),
+                    parser.parse_substitution(arg.get_attr("value")),
+                )
+                for arg in args
+            ]
+            for arg in args:
+                arg.assert_entity_completely_parsed()
+
+        return cls, kwargs
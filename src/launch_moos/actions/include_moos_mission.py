@@ -0,0 +1,76 @@
+"""Module for the IncludeMOOSMission action."""
+from typing import Any
+from typing import Dict
+from typing import List
+
+from launch.action import Action
+from launch.actions import IncludeLaunchDescription
+from launch.frontend import Entity
+from launch.frontend import Parser
+from launch.frontend import expose_action
+from launch.some_substitutions_type import SomeSubstitutionsType
+
+
+# boolean attributes of <include_moos_mission>, passed on to the source as is
+_FLAGS = ("staggered", "hot_reload", "preflight", "streaming")
+
+
+@expose_action("include_moos_mission")
+class IncludeMOOSMission(IncludeLaunchDescription):
+    """Action that includes the community of a MOOS mission file.
+
+    In XML launch files::
+
+        <include_moos_mission file="$(find-pkg-share alpha)/alpha.moos"
+                              hot_reload="true">
+          <define name="VNAME" value="alpha"/>
+        </include_moos_mission>
+    """
+
+    def __init__(self, mission_file: SomeSubstitutionsType, **kwargs: Any) -> None:
+        """
+        Create an IncludeMOOSMission.
+
+        :param mission_file: the path to the moos mission file
+        :param kwargs: the options of
+            :class:`launch_moos.MOOSMissionFileDescriptionSource`, and the
+            ``condition`` of the action
+        """
+        # the description source imports the actions of this package
+        from ..mission_launch_description_source import MOOSMissionFileDescriptionSource
+
+        condition = kwargs.pop("condition", None)
+        super().__init__(
+            MOOSMissionFileDescriptionSource(mission_file, **kwargs),
+            condition=condition,
+        )
+
+    @classmethod
+    def parse(cls, entity: Entity, parser: Parser):
+        """Parse include_moos_mission."""
+        _, kwargs = Action.parse(entity, parser)
+        kwargs["mission_file"] = parser.parse_substitution(entity.get_attr("file"))
+
+        for flag in _FLAGS:
+            value = entity.get_attr(flag, data_type=bool, optional=True)
+            if value is not None:
+                kwargs[flag] = value
+
+        file_backend = entity.get_attr("file_backend", optional=True)
+        if file_backend is not None:
+            kwargs["file_backend"] = file_backend
+
+        defines = entity.get_attr("define", data_type=List[Entity], optional=True)
+        if defines is not None:
+            kwargs["macros"] = cls.parse_nested_defines(defines)
+
+        return cls, kwargs
+
+    @staticmethod
+    def parse_nested_defines(defines: List[Entity]) -> Dict[str, str]:
+        """Parse the nsplug macros, ``<define name="..." value="..."/>``."""
+        macros = {}
+        for define in defines:
+            macros[define.get_attr("name")] = define.get_attr("value")
+            define.assert_entity_completely_parsed()
+        return macros
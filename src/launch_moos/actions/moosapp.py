@@ -1,5 +1,5 @@
 import pathlib
-from tempfile import NamedTemporaryFile
+from typing import Callable
 from typing import Dict
 from typing import Iterable
 from typing import List
@@ -7,21 +7,57 @@ from typing import Optional
 from typing import Text  # noqa: F401
 from typing import Tuple  # noqa: F401
 
+import launch.logging
 from launch.action import Action
 from launch.actions import ExecuteProcess
+from launch.event import Event
+from launch.event_handler import EventHandler
+from launch.event_handlers import OnProcessExit
+from launch.event_handlers import OnProcessIO
+from launch.event_handlers import OnProcessStart
+from launch.event_handlers import OnShutdown
 from launch.frontend import Entity
 from launch.frontend import Parser
 from launch.frontend import expose_action
 from launch.launch_context import LaunchContext
 from launch.some_substitutions_type import SomeSubstitutionsType
 from launch.substitutions import LocalSubstitution
-
+from launch.substitutions import TextSubstitution
+from launch.utilities import normalize_to_list_of_substitutions
+from launch.utilities import perform_substitutions
+from launch.utilities.type_utils import normalize_typed_substitution
+from launch.utilities.type_utils import perform_typed_substitution
+
+from .. import tracing
+from ..community import ConfigType
+from ..community import MOOSCommunity
+from ..community import perform_config_substitutions
+from ..generated_files import DISK
+from ..generated_files import GeneratedFile
+from ..generated_files import GeneratedFileStore
+from ..generated_files import write_generated_file
 from ..moosfile_generator import evaluate_template
+from ..output import STDERR
+from ..output import STDOUT
+from ..output import OutputBatching
+from ..output import OutputPipeline
+from ..scheduling import LAUNCH_ATTRIBUTES
+from ..scheduling import Scheduling
+from ..tracing import Tracer
 
 
 @expose_action("moosapp")
 class MOOSApp(ExecuteProcess):
-    """Action that executes a MOOS App."""
+    """Action that executes a MOOS App.
+
+    In XML launch files::
+
+        <moosapp exec="pHelmIvP" alias="pHelmIvP_alpha">
+          <global_config name="ServerPort" value="9000"/>
+          <config name="AppTick" value="4"/>
+          <config name="behaviors" value="$(var vname).bhv"/>
+        </moosapp>
+    """
 
     def __init__(
         self,
@@ -31,9 +67,14 @@ class MOOSApp(ExecuteProcess):
         alias: Optional[SomeSubstitutionsType] = None,
         arguments: Optional[Iterable[SomeSubstitutionsType]] = None,
         mission_file: Optional[SomeSubstitutionsType] = None,
-        global_config: Optional[List[Tuple[str, SomeSubstitutionsType]]] = None,
-        config: Optional[List[Tuple[str, SomeSubstitutionsType]]] = None,
-        **kwargs
+        global_config: Optional[ConfigType] = None,
+        config: Optional[ConfigType] = None,
+        community: Optional[MOOSCommunity] = None,
+        file_backend: str = DISK,
+        file_store: Optional[GeneratedFileStore] = None,
+        output_batching: Optional[OutputBatching] = None,
+        scheduling: Optional[Scheduling] = None,
+        **kwargs,
     ) -> None:
         """
         Construct a MOOS Application action.
@@ -57,9 +98,26 @@ class MOOSApp(ExecuteProcess):
         :param: alias the alias passed to the MOOS App.
         :param: arguments list of extra arguments for the node
         :param: mission_file path to the MOOS mission file that is passed to the app
-        :param: config list of configuration lines for the app
-        :param: global_config list of configuration lines for the app
+        :param: config list of configuration lines for the app, as ``(name, value)``
+            pairs or :class:`launch_moos.mission.Assignment`
+        :param: global_config list of global configuration lines for the app
+        :param: community the community to share a generated mission file with,
+            which then also holds the global configuration
+        :param: file_backend where the mission file is generated when neither
+            mission_file nor community is given, ``disk`` or ``memory``
+        :param: file_store content addressed store the mission file is then
+            generated in instead, the file being referenced until the app exits
+        :param: output_batching buffer the output of the app and log it in
+            batches, with a rate limit and regex matchers, instead of logging
+            every chunk of output as it arrives, see
+            :class:`launch_moos.output.OutputPipeline`
+        :param: scheduling the CPU affinity, priorities and cgroup the app is
+            spawned with, see :class:`launch_moos.scheduling.Scheduling`
         """
+        if community is not None and global_config is not None:
+            raise ValueError(
+                "global_config must be given to the community, not to its apps"
+            )
         cmd = [executable]
         cmd += [LocalSubstitution("mission_file", description="MOOS App Mission File")]
 
@@ -68,8 +126,25 @@ class MOOSApp(ExecuteProcess):
 
         cmd += arguments or []
 
+        if scheduling is not None:
+            # applied by a script executing the app, before any other prefix
+            prefix = [TextSubstitution(text=scheduling.prefix())]
+            if kwargs.get("prefix") is not None:
+                prefix.append(TextSubstitution(text=" "))
+                prefix += normalize_to_list_of_substitutions(kwargs["prefix"])
+            kwargs["prefix"] = prefix
+
+        self.__batched_output: SomeSubstitutionsType = kwargs.get("output", "log")
+        if output_batching is not None:
+            # logged by the pipeline, ExecuteLocal only hands the output over
+            kwargs["output"] = {"both": set()}
+
         kwargs["name"] = name
         super().__init__(cmd=cmd, **kwargs)
+        # a substitution when given by launch files, performed on execute
+        self.__respawn = normalize_typed_substitution(
+            kwargs.get("respawn", False), bool
+        )
 
         self.alias = alias
         self.mission_file = mission_file
@@ -80,12 +155,35 @@ class MOOSApp(ExecuteProcess):
 
         self.__global_config = global_config
         self.__config = config
+        self.__community = community
+        self.__file_backend = file_backend
+        self.__file_store = file_store
+        self.__output_batching = output_batching
+        self.__output_pipeline: Optional[OutputPipeline] = None
+        self.__scheduling = scheduling
+        if community is not None and mission_file is None:
+            community.add_process(alias or executable, config)
 
         self.__expanded_parameter_arguments = (
             None
         )  # type: Optional[List[Tuple[Text, bool]]]
         self.__substitutions_performed = False
 
+    @property
+    def app_executable(self) -> SomeSubstitutionsType:
+        """The MOOS App that is run, as given."""
+        return self.__app_executable
+
+    @property
+    def scheduling(self) -> Optional[Scheduling]:
+        """The CPU affinity, priorities and cgroup the app is spawned with."""
+        return self.__scheduling
+
+    @property
+    def output_pipeline(self) -> Optional[OutputPipeline]:
+        """The batched output of the app once executed, with its dropped lines."""
+        return self.__output_pipeline
+
     @classmethod
     def parse(cls, entity: Entity, parser: Parser):
         """Parse node."""
@@ -95,46 +193,93 @@ class MOOSApp(ExecuteProcess):
         if args is not None:
             kwargs["arguments"] = super()._parse_cmdline(args, parser)
 
-        alias = entity.get_attr("alias", optional=True)
-        if alias is not None:
-            kwargs["alias"] = parser.parse_substitution(alias)
+        for attribute in ("alias", "name", "mission_file"):
+            value = entity.get_attr(attribute, optional=True)
+            if value is not None:
+                kwargs[attribute] = parser.parse_substitution(value)
+
+        # ``exec`` as for ROS nodes, ``executable`` as for the constructor
+        executable = entity.get_attr("exec", optional=True)
+        if executable is None:
+            executable = entity.get_attr("executable")
+        kwargs["executable"] = parser.parse_substitution(executable)
+
+        scheduling = {}
+        for argument, attribute in LAUNCH_ATTRIBUTES.items():
+            value = entity.get_attr(attribute, optional=True)
+            if value is not None:
+                scheduling[argument] = value
+        if scheduling:
+            kwargs["scheduling"] = Scheduling(**scheduling)
+
+        for argument in ("config", "global_config"):
+            lines = entity.get_attr(argument, data_type=List[Entity], optional=True)
+            if lines is not None:
+                kwargs[argument] = cls.parse_nested_config(lines, parser)
 
-        node_name = entity.get_attr("name", optional=True)
-        if node_name is not None:
-            kwargs["name"] = parser.parse_substitution(node_name)
-
-        executable = entity.get_attr("executable", optional=True)
-        if executable is not None:
-            kwargs["executable"] = parser.parse_substitution(executable)
-
-        kwargs["executable"] = parser.parse_substitution(entity.get_attr("exec"))
+        return cls, kwargs
 
-        # parameters = entity.get_attr('param', data_type=List[Entity], optional=True)
-        # if parameters is not None:
-        #     kwargs['parameters'] = cls.parse_nested_parameters(parameters, parser)
+    @staticmethod
+    def parse_nested_config(
+        lines: List[Entity], parser: Parser
+    ) -> List[Tuple[str, SomeSubstitutionsType]]:
+        """Parse the nested ``<config name="..." value="..."/>`` lines of an app.
 
-        return cls, kwargs
+        The values may hold substitutions, they are expanded when the mission
+        file is generated.
+        """
+        config = []
+        for line in lines:
+            name = line.get_attr("name")
+            value = parser.parse_substitution(line.get_attr("value"))
+            line.assert_entity_completely_parsed()
+            config.append((name, value))
+        return config
 
     @staticmethod
     def Create_moos_file(
         process_name: str,
-        config: List[Tuple[str, str]],
-        global_config: List[Tuple[str, str]] = None,
+        config: Optional[ConfigType],
+        global_config: Optional[ConfigType] = None,
+        file_backend: str = DISK,
+        file_store: Optional[GeneratedFileStore] = None,
     ) -> str:
-        with NamedTemporaryFile(
-            mode="w", prefix="launch_moos_", suffix=".moos", delete=False
-        ) as h:
-            param_file_path = h.name
-            h.write(
-                evaluate_template(
-                    {
-                        "process_name": process_name,
-                        "global_variables": global_config or [],
-                        "process_variables": config or [],
-                    }
-                )
-            )
-            return param_file_path
+        """Generate the mission file of an app, the caller removes it."""
+        return MOOSApp.generate_mission_file(
+            process_name, config, global_config, file_backend, file_store
+        ).path
+
+    @staticmethod
+    def generate_mission_file(
+        process_name: str,
+        config: Optional[ConfigType],
+        global_config: Optional[ConfigType] = None,
+        file_backend: str = DISK,
+        file_store: Optional[GeneratedFileStore] = None,
+    ) -> GeneratedFile:
+        """Generate the mission file of an app.
+
+        Args:
+            process_name: the name of the ProcessConfig block.
+            config: the configuration lines of the block.
+            global_config: the global configuration lines.
+            file_backend: the backend the file is written with, see
+                :func:`launch_moos.generated_files.write_generated_file`.
+            file_store: the store the file is acquired from instead.
+
+        Returns:
+            The generated file, to be closed once the app is done with it.
+        """
+        content = evaluate_template(
+            {
+                "process_name": process_name,
+                "global_variables": global_config or [],
+                "process_variables": config or [],
+            }
+        )
+        if file_store is not None:
+            return file_store.acquire(content)
+        return write_generated_file(content, file_backend)
 
     def _perform_substitutions(self, context: LaunchContext) -> None:
         if self.__substitutions_performed:
@@ -208,16 +353,36 @@ class MOOSApp(ExecuteProcess):
         # if self.__node_name is not None:
         #     ros_specific_arguments['name'] = '__node:={}'.format(self.__expanded_node_name)
 
-        if self.mission_file is None:
-            # then we need to generate the moos file
-            self.mission_file = MOOSApp.Create_moos_file(
-                self.__app_executable, self.__config, self.__global_config
-            )
+        # launch files give them as substitutions
+        self.mission_file = _perform_if_substitutions(context, self.mission_file)
+        alias = _perform_if_substitutions(context, self.alias)
+        self.__respawn = perform_typed_substitution(context, self.__respawn, bool)
+
+        self.__prepare_mission_file(context)
+
+        if self.__scheduling is not None:
+            try:
+                self.__scheduling.prepare_cgroup()
+            except OSError as e:
+                launch.logging.get_logger(__name__).warning(
+                    "cannot set up the cgroup of '{}': {}".format(
+                        self.__scheduling.cgroup, e
+                    )
+                )
 
-        context.extend_locals({"alias": self.alias, "mission_file": self.mission_file})
+        context.extend_locals({"alias": alias, "mission_file": self.mission_file})
+
+        tracer = tracing.get_tracer()
+        started_at = tracer.now() if tracer is not None else 0.0
 
         ret = super().execute(context)
 
+        if tracer is not None:
+            self.__trace(context, tracer, started_at)
+
+        if self.__output_batching is not None:
+            self.__start_output_pipeline(context)
+
         # if self.is_node_name_fully_specified():
         #     add_node_name(context, self.node_name)
         #     node_name_count = get_node_name_count(context, self.node_name)
@@ -229,3 +394,128 @@ class MOOSApp(ExecuteProcess):
         #         )
 
         return ret
+
+    def __prepare_mission_file(self, context: LaunchContext) -> None:
+        """Resolve the mission file of the app, generating it if needed."""
+        if self.__community is not None:
+            # also given the file of its community, when restarted by
+            # HotReloadMission, which must stay in the store while it runs
+            community = self.__community
+            if self.mission_file is None:
+                self.mission_file = community.get_mission_file(context)
+                # whichever app of the community wrote the file, it is
+                # released once, when the launch shuts down
+                context.register_event_handler(
+                    OnShutdown(on_shutdown=lambda event, context: community.close())
+                )
+            store = community.file_store
+            path = self.mission_file
+            if store is not None and store.retain(path):
+                self.__close_when_done(context, lambda: store.release(path))
+        elif self.mission_file is None:
+            # then we need to generate the moos file, an aliased app reads the
+            # ProcessConfig block named after its alias
+            process_name = perform_substitutions(
+                context,
+                normalize_to_list_of_substitutions(self.alias or self.__app_executable),
+            )
+            generated = MOOSApp.generate_mission_file(
+                process_name,
+                perform_config_substitutions(context, self.__config),
+                perform_config_substitutions(context, self.__global_config),
+                self.__file_backend,
+                self.__file_store,
+            )
+            self.mission_file = generated.path
+            # removed, or released from the store, once the app is done
+            self.__close_when_done(context, generated.close)
+
+    def __trace(self, context: LaunchContext, tracer: Tracer, start: float) -> None:
+        """Trace the execution, then the spawn and first output of the process."""
+        name = self.process_details["name"]
+        tracer.add_span("execute", start, tracer.now(), lane=name)
+        spawned_at: Optional[float] = None
+        first_output = True
+
+        def on_start(event: Event, context: LaunchContext) -> None:
+            nonlocal spawned_at
+            spawned_at = tracer.now()
+            tracer.add_span("spawn", start, spawned_at, lane=name, pid=event.pid)
+
+        def on_output(event: Event) -> None:
+            nonlocal first_output
+            if first_output and spawned_at is not None:
+                first_output = False
+                tracer.add_span("first_output", spawned_at, tracer.now(), lane=name)
+
+        for handler in (
+            OnProcessStart(target_action=self, on_start=on_start),
+            OnProcessIO(target_action=self, on_stdout=on_output, on_stderr=on_output),
+        ):
+            context.register_event_handler(handler)
+
+    def __start_output_pipeline(self, context: LaunchContext) -> None:
+        name = self.process_details["name"]
+        # the loggers ExecuteLocal would log the output to, for the output
+        # setting given
+        output = self.__batched_output
+        if not isinstance(output, dict):
+            output = perform_substitutions(
+                context, normalize_to_list_of_substitutions(output)
+            )
+        stdout_logger, stderr_logger = launch.logging.get_output_loggers(name, output)
+        pipeline = OutputPipeline(
+            launch.logging.get_logger(name),
+            self.__output_batching,
+            stream_loggers={STDOUT: stdout_logger, STDERR: stderr_logger},
+            prefix=f"[{name}] ",
+        )
+        pipeline.start(context.asyncio_loop)
+        # fed the output of the process, flushed whenever it exits and
+        # restarted if it respawns
+        for handler in (
+            OnProcessIO(
+                target_action=self,
+                on_stdout=lambda event: pipeline.feed(STDOUT, event.text),
+                on_stderr=lambda event: pipeline.feed(STDERR, event.text),
+            ),
+            OnProcessStart(
+                target_action=self,
+                on_start=lambda event, context: pipeline.start(context.asyncio_loop),
+            ),
+            OnProcessExit(
+                target_action=self, on_exit=lambda event, context: pipeline.stop()
+            ),
+        ):
+            context.register_event_handler(handler)
+        self.__output_pipeline = pipeline
+
+    def __close_when_done(
+        self, context: LaunchContext, close: Callable[[], None]
+    ) -> None:
+        """Call ``close`` once the app exits for good, or the launch shuts down."""
+        closed = False
+
+        def close_once(event: Event, context: LaunchContext) -> None:
+            nonlocal closed
+            if not closed:
+                closed = True
+                close()
+
+        # the process is started again with the same file when it respawns,
+        # and is never started if the launch shuts down first
+        handlers: List[EventHandler] = [OnShutdown(on_shutdown=close_once)]
+        if not self.__respawn:
+            handlers.append(
+                OnProcessExit(target_action=self, on_exit=close_once, handle_once=True)
+            )
+        for handler in handlers:
+            context.register_event_handler(handler)
+
+
+def _perform_if_substitutions(
+    context: LaunchContext, value: Optional[SomeSubstitutionsType]
+) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return perform_substitutions(context, normalize_to_list_of_substitutions(value))
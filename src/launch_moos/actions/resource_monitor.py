@@ -0,0 +1,74 @@
+"""Module for the ResourceMonitor action."""
+from pathlib import Path
+from typing import Optional
+from typing import Union
+
+from launch.action import Action
+from launch.event import Event
+from launch.event_handlers import OnProcessExit
+from launch.event_handlers import OnProcessStart
+from launch.event_handlers import OnShutdown
+from launch.launch_context import LaunchContext
+
+from ..metrics import DEFAULT_HISTORY
+from ..metrics import DEFAULT_SAMPLE_INTERVAL
+from ..metrics import ResourceSampler
+from .moosapp import MOOSApp
+
+
+class ResourceMonitor(Action):
+    """Action sampling the CPU, memory and IO use of every MOOSApp of the launch.
+
+    Every app is sampled from ``/proc`` once started, see
+    :class:`launch_moos.metrics.ResourceSampler`, and after every round of
+    samples the metrics are written to ``prometheus_file``, for the textfile
+    collector of the Prometheus node exporter, and to ``json_file`` if given.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        history: int = DEFAULT_HISTORY,
+        prometheus_file: Optional[Union[str, Path]] = None,
+        json_file: Optional[Union[str, Path]] = None,
+        **kwargs
+    ) -> None:
+        """
+        Create a ResourceMonitor action.
+
+        :param interval: seconds between two samples of the apps
+        :param history: number of samples kept per app
+        :param prometheus_file: file the latest samples are written to in the
+            Prometheus text format
+        :param json_file: file the history of every app is written to as JSON
+        """
+        super().__init__(**kwargs)
+        self.__prometheus_file = prometheus_file
+        self.__json_file = json_file
+        self.sampler = ResourceSampler(interval, history, on_sample=self.__export)
+
+    def execute(self, context: LaunchContext) -> None:
+        """Sample the apps as they start, until shutdown."""
+        for handler in (
+            OnProcessStart(on_start=self.__on_start),
+            OnProcessExit(on_exit=self.__on_exit),
+            OnShutdown(on_shutdown=lambda event, context: self.sampler.stop()),
+        ):
+            context.register_event_handler(handler)
+        self.sampler.start(context.asyncio_loop)
+
+    def __on_start(self, event: Event, context: LaunchContext) -> None:
+        if isinstance(event.action, MOOSApp):
+            self.sampler.add(event.process_name, event.pid)
+
+    def __on_exit(self, event: Event, context: LaunchContext) -> None:
+        if isinstance(event.action, MOOSApp):
+            # sample one last time, the history is kept
+            self.sampler.sample()
+
+    def __export(self) -> None:
+        if self.__prometheus_file is not None:
+            self.sampler.write_prometheus(self.__prometheus_file)
+        if self.__json_file is not None:
+            self.sampler.write_json(self.__json_file)
@@ -0,0 +1,298 @@
+"""Module for the StaggeredLaunch action."""
+import asyncio
+import os
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Text
+
+import launch.logging
+from launch.action import Action
+from launch.actions import OpaqueFunction
+from launch.event import Event
+from launch.event_handler import EventHandler
+from launch.event_handlers import OnProcessExit
+from launch.event_handlers import OnProcessIO
+from launch.event_handlers import OnProcessStart
+from launch.event_handlers import OnShutdown
+from launch.launch_context import LaunchContext
+from launch.substitutions import TextSubstitution
+from launch.utilities import normalize_to_list_of_substitutions
+
+from .moosapp import MOOSApp
+
+
+DEFAULT_MAX_CONCURRENT_STARTUPS = 4
+
+# seconds an app may stay silent before it no longer counts as starting
+DEFAULT_STARTUP_TIMEOUT = 5.0
+
+# seconds to wait for MOOSDB to accept connections
+DEFAULT_MOOSDB_TIMEOUT = 10.0
+
+_PORT_POLL_INTERVAL = 0.02
+
+
+class StartApp(Event):
+    """Event emitted when a StaggeredLaunch starts one of its apps."""
+
+    name = "launch_moos.events.StartApp"
+
+    def __init__(self, *, action: "StaggeredLaunch", app: MOOSApp) -> None:
+        """
+        Create a StartApp event.
+
+        :param action: the action starting the app
+        :param app: the app to start
+        """
+        super().__init__()
+        self.action = action
+        self.app = app
+
+
+async def wait_for_port(host: str, port: int, timeout: float) -> bool:
+    """Wait until a TCP port accepts connections.
+
+    Args:
+        host: the host to connect to.
+        port: the port to connect to.
+        timeout: seconds to wait for.
+
+    Returns:
+        Whether the port accepted a connection in time.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(_PORT_POLL_INTERVAL)
+            continue
+        writer.close()
+        return True
+
+
+def startup_order(apps: Sequence[MOOSApp]) -> List[MOOSApp]:
+    """Order apps for startup, MOOSDB first and the others as given.
+
+    Args:
+        apps: the apps of a community.
+
+    Returns:
+        The apps in the order they are started.
+    """
+    moosdb = [app for app in apps if is_moosdb(app)]
+    return moosdb + [app for app in apps if app not in moosdb]
+
+
+def is_moosdb(app: MOOSApp) -> bool:
+    """Check whether an app runs MOOSDB, given by name or by path.
+
+    Args:
+        app: the app.
+
+    Returns:
+        Whether the executable of the app is MOOSDB.
+    """
+    executable = app.app_executable
+    if not isinstance(executable, str):
+        parts = normalize_to_list_of_substitutions(executable)
+        if not all(isinstance(part, TextSubstitution) for part in parts):
+            return False
+        executable = "".join(part.text for part in parts)
+    return os.path.basename(executable) == "MOOSDB"
+
+
+class StaggeredLaunch(Action):
+    """Action starting the apps of a community one after the other, as Antler does.
+
+    MOOSDB is started first and the other apps only once its port accepts
+    connections. Then at most ``max_concurrent_startups`` apps are starting
+    at any time, an app being done starting on its first line of output, when
+    it exits or after ``startup_timeout`` seconds. Consecutive launches are at
+    least ``ms_between_launches`` milliseconds apart.
+
+    The time every app took to print its first line of output is recorded in
+    :attr:`startup_times`. An app not started yet can be swapped for another
+    with :meth:`replace`.
+    """
+
+    def __init__(
+        self,
+        *,
+        apps: Sequence[MOOSApp],
+        ms_between_launches: int = 0,
+        moosdb_host: str = "localhost",
+        moosdb_port: int = 9000,
+        max_concurrent_startups: int = DEFAULT_MAX_CONCURRENT_STARTUPS,
+        startup_timeout: float = DEFAULT_STARTUP_TIMEOUT,
+        moosdb_timeout: float = DEFAULT_MOOSDB_TIMEOUT,
+        **kwargs
+    ) -> None:
+        """
+        Create a StaggeredLaunch action.
+
+        :param apps: the apps to start, in order
+        :param ms_between_launches: minimum delay between two launches, the
+            ``MSBetweenLaunches`` of the ANTLER block
+        :param moosdb_host: the ``ServerHost`` of the community
+        :param moosdb_port: the ``ServerPort`` of the community
+        :param max_concurrent_startups: number of apps allowed to be starting
+            at the same time
+        :param startup_timeout: seconds after which a silent app is considered
+            started
+        :param moosdb_timeout: seconds to wait for MOOSDB to accept connections
+        """
+        super().__init__(**kwargs)
+        if max_concurrent_startups < 1:
+            raise ValueError("max_concurrent_startups must be at least 1")
+        self.__apps = list(apps)
+        self.__ms_between_launches = ms_between_launches
+        self.__moosdb_host = moosdb_host
+        self.__moosdb_port = moosdb_port
+        self.__max_concurrent_startups = max_concurrent_startups
+        self.__startup_timeout = startup_timeout
+        self.__moosdb_timeout = moosdb_timeout
+        self.__task: Optional["asyncio.Task[None]"] = None
+        # the release of the startup slot of every app being started
+        self.__releases: Dict[StartApp, Callable[[], None]] = {}
+        self.__logger = launch.logging.get_logger(__name__)
+        self.startup_times: Dict[Text, float] = {}
+
+    @property
+    def apps(self) -> List[MOOSApp]:
+        """The apps to start, in order."""
+        return list(self.__apps)
+
+    def get_sub_entities(self) -> List[MOOSApp]:
+        """Return the apps, so that introspection lists them under this action."""
+        return self.apps
+
+    def execute(self, context: LaunchContext) -> None:
+        """Start the apps, in the background."""
+        context.register_event_handler(
+            EventHandler(
+                matcher=lambda event: isinstance(event, StartApp)
+                and event.action is self,
+                entities=OpaqueFunction(
+                    function=lambda context: self.__on_start_app(
+                        context, context.locals.event
+                    )
+                ),
+            )
+        )
+        # apps must not be started once the launch shuts down
+        context.register_event_handler(
+            OnShutdown(on_shutdown=lambda event, context: self.__cancel())
+        )
+        self.__task = context.asyncio_loop.create_task(self.__schedule(context))
+
+    def __cancel(self) -> None:
+        if self.__task is not None and not self.__task.done():
+            self.__task.cancel()
+
+    def get_asyncio_future(self) -> Optional[asyncio.Future]:
+        """Return the future completed once every app was started."""
+        return self.__task
+
+    def replace(self, old: MOOSApp, new: MOOSApp) -> bool:
+        """Start an app instead of another one that was not started yet.
+
+        Args:
+            old: the app to replace.
+            new: the app started in its turn instead.
+
+        Returns:
+            Whether ``old`` was replaced, False if it was already started or
+            is not an app of this action.
+        """
+        if old not in self.__apps or old.get_asyncio_future() is not None:
+            return False
+        self.__apps[self.__apps.index(old)] = new
+        # its StartApp event may already be on its way
+        for event in self.__releases:
+            if event.app is old:
+                event.app = new
+        return True
+
+    async def __schedule(self, context: LaunchContext) -> None:
+        try:
+            await self.__start_in_order(context)
+        except asyncio.CancelledError:
+            # on shutdown, the apps left are not started, the launch service
+            # then sees this future complete rather than cancelled
+            return
+
+    async def __start_in_order(self, context: LaunchContext) -> None:
+        loop = context.asyncio_loop
+        interval = self.__ms_between_launches / 1000
+        slots = asyncio.Semaphore(self.__max_concurrent_startups)
+        last_launch = None
+        # by index, apps may be replaced while others are starting
+        order = [self.__apps.index(app) for app in startup_order(self.__apps)]
+        for index in order:
+            await slots.acquire()
+            if last_launch is not None:
+                await asyncio.sleep(max(0.0, last_launch + interval - loop.time()))
+            app = self.__apps[index]
+            event = StartApp(action=self, app=app)
+            self.__releases[event] = slots.release
+            context.emit_event_sync(event)
+            last_launch = loop.time()
+
+            if is_moosdb(app):
+                ready = await wait_for_port(
+                    self.__moosdb_host, self.__moosdb_port, self.__moosdb_timeout
+                )
+                if not ready:
+                    self.__logger.warning(
+                        "MOOSDB is not accepting connections on {}:{}".format(
+                            self.__moosdb_host, self.__moosdb_port
+                        )
+                    )
+
+    def __on_start_app(self, context: LaunchContext, event: StartApp) -> List[Action]:
+        """Start the app of the event, tracking how long it takes to start."""
+        self.__track(context, event.app, self.__releases.pop(event))
+        return [event.app]
+
+    def __track(
+        self, context: LaunchContext, app: MOOSApp, release: Callable[[], None]
+    ) -> None:
+        loop = context.asyncio_loop
+        started_at = loop.time()
+        done = False
+
+        def on_started(*args: object) -> None:
+            nonlocal done
+            if not done:
+                done = True
+                release()
+
+        def on_output(event: Event) -> None:
+            name = app.process_details["name"]
+            if name not in self.startup_times:
+                self.startup_times[name] = loop.time() - started_at
+                self.__logger.info(
+                    "'{}' first output after {:.3f} s".format(
+                        name, self.startup_times[name]
+                    )
+                )
+            on_started()
+
+        def on_start(event: Event, context: LaunchContext) -> None:
+            nonlocal started_at
+            started_at = loop.time()
+            loop.call_later(self.__startup_timeout, on_started)
+
+        for handler in (
+            OnProcessStart(target_action=app, on_start=on_start),
+            OnProcessIO(target_action=app, on_stdout=on_output, on_stderr=on_output),
+            OnProcessExit(target_action=app, on_exit=on_started),
+        ):
+            context.register_event_handler(handler)
@@ -0,0 +1,126 @@
+"""Parsing and validation of many mission files across a process pool.
+
+Every worker process preprocesses, parses and validates whole mission files
+and sends back the :meth:`launch_moos.mission.Mission.to_records` form of the
+missions, plain tuples of strings that are cheap to pickle, rather than
+pyparsing results. Each worker keeps its own nsplug preprocessor, so files
+included by many missions are read once per worker.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from .mission import Mission
+
+
+# missions sent to a worker at once, per worker, to amortise the round trips
+_CHUNKS_PER_WORKER = 4
+
+_preprocessor: Any = None
+
+
+class CheckResult:
+    """The outcome of checking one mission file."""
+
+    __slots__ = ("path", "mission", "error")
+
+    def __init__(
+        self, path: Path, mission: Optional[Mission], error: Optional[str]
+    ) -> None:
+        """
+        Create a CheckResult.
+
+        :param path: the mission file
+        :param mission: the parsed mission, None if it is invalid
+        :param error: why the mission is invalid, None if it is valid
+        """
+        self.path = path
+        self.mission = mission
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the mission file is valid."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"CheckResult({self.path!r}, {self.mission!r}, {self.error!r})"
+
+
+def check_missions(
+    paths: Sequence[Union[str, Path]],
+    jobs: Optional[int] = None,
+    macros: Optional[Mapping[str, str]] = None,
+    backend: str = "tokenizer",
+) -> List[CheckResult]:
+    """Parse and validate mission files in parallel.
+
+    A mission is valid if it preprocesses and parses, and if the apps of its
+    ANTLER block can be launched, see :func:`launch_moos.plan.plan_mission`.
+
+    Args:
+        paths: the mission files.
+        jobs: the number of worker processes, the number of CPUs by default;
+            with 1 the missions are checked in this process.
+        macros: the nsplug macros defined before every mission file is read.
+        backend: the parser backend, see :func:`launch_moos.parser.parse_mission`.
+
+    Returns:
+        The result of every mission file, in the order given.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    tasks = [(str(path), dict(macros or {}), backend) for path in paths]
+    if jobs == 1 or len(tasks) <= 1:
+        _init_worker()
+        outcomes = [_check(task) for task in tasks]
+    else:
+        workers = min(jobs, len(tasks))
+        chunksize = max(1, len(tasks) // (workers * _CHUNKS_PER_WORKER))
+        with ProcessPoolExecutor(workers, initializer=_init_worker) as executor:
+            outcomes = list(executor.map(_check, tasks, chunksize=chunksize))
+
+    return [
+        CheckResult(
+            Path(path),
+            Mission.from_records(records) if records is not None else None,
+            error,
+        )
+        for (path, _, _), (records, error) in zip(tasks, outcomes)
+    ]
+
+
+def _init_worker() -> None:
+    from .nsplug import Preprocessor
+
+    # files are read once per check_missions call and worker
+    global _preprocessor
+    _preprocessor = Preprocessor()
+
+
+def _check(
+    task: Tuple[str, Mapping[str, str], str]
+) -> Tuple[Optional[Tuple[Any, ...]], Optional[str]]:
+    import pyparsing as pp
+
+    from .nsplug import PreprocessError
+    from .plan import InvalidMissionFileError
+    from .plan import plan_mission
+
+    path, macros, backend = task
+    try:
+        text = _preprocessor.preprocess_file(path, macros)
+        mission = Mission.from_string(text, backend=backend)
+        plan_mission(mission)
+    except (PreprocessError, InvalidMissionFileError, pp.ParseBaseException) as e:
+        return None, str(e)
+    except (UnicodeDecodeError, OSError) as e:
+        return None, f"cannot read '{path}': {e}"
+    return mission.to_records(), None
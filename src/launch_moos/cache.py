@@ -0,0 +1,154 @@
+"""Persistent, content addressed cache of parsed MOOS mission files."""
+import hashlib
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+from typing import Union
+
+from .mission import Mission
+from .parser import PARSER_VERSION
+from .plan import InvalidMissionFileError
+
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+# marshal is only stable within a Python minor version
+_CACHE_FORMAT = f"{PARSER_VERSION}-{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+def default_cache_dir() -> Path:
+    """Return the directory parsed missions are cached in by default.
+
+    ``$LAUNCH_MOOS_CACHE_DIR`` takes precedence, then ``$XDG_CACHE_HOME``.
+
+    Returns:
+        The cache directory path, which may not exist yet.
+    """
+    cache_dir = os.environ.get("LAUNCH_MOOS_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg_cache) / "launch_moos" / "missions"
+
+
+class ParseCache:
+    """Cache of parsed mission files keyed by their content hash.
+
+    Entries are the :meth:`launch_moos.mission.Mission.to_records` form of the
+    mission, stored as one :mod:`marshal` file each under ``cache_dir``.
+    Reading an entry refreshes its modification time, and when the cache grows
+    beyond ``max_size`` bytes the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        backend: str = "tokenizer",
+    ) -> None:
+        """
+        Create a ParseCache.
+
+        :param cache_dir: directory to keep entries in, see :func:`default_cache_dir`
+        :param max_size: maximum total size of the entries in bytes
+        :param backend: parser backend used on a cache miss
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_size = max_size
+        self.backend = backend
+
+    def _entry_path(self, content: bytes) -> Path:
+        digest = hashlib.sha256(content).hexdigest()
+        return self.cache_dir / f"{digest}-{_CACHE_FORMAT}.bin"
+
+    def parse_file(self, path: Union[str, Path]) -> Mission:
+        """Parse a mission file, reusing the cached result if it is unchanged.
+
+        Args:
+            path: the mission file.
+
+        Returns:
+            The parsed mission.
+        """
+        return self.parse(Path(path).read_bytes())
+
+    def parse(self, content: bytes) -> Mission:
+        """Parse mission file contents, reusing the cached result if present.
+
+        Args:
+            content: the raw mission file contents.
+
+        Returns:
+            The parsed mission.
+
+        Raises:
+            InvalidMissionFileError: if the contents are not UTF-8.
+        """
+        entry = self._entry_path(content)
+        try:
+            records = marshal.loads(entry.read_bytes())  # noqa: S302
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        else:
+            try:
+                os.utime(entry)
+            except OSError:
+                pass
+            return Mission.from_records(records)
+
+        try:
+            text = content.decode()
+        except UnicodeDecodeError as e:
+            raise InvalidMissionFileError(f"mission file is not UTF-8: {e}") from e
+        mission = Mission.from_string(text, backend=self.backend)
+        self._store(entry, marshal.dumps(mission.to_records()))
+        return mission
+
+    def _store(self, entry: Path, data: bytes) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # write then rename so concurrent launches never read a partial entry
+            partial = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+            partial.write_bytes(data)
+            os.replace(partial, entry)
+            self._evict()
+        except OSError:
+            # the cache is an optimisation, never fail a launch because of it
+            return
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith(".bin"):
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except FileNotFoundError:
+                    # evicted by another launch sharing the directory
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        if not self.cache_dir.is_dir():
+            return
+        for entry in self.cache_dir.glob("*.bin"):
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,147 @@
+"""Module for the MOOSCommunity class."""
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from launch.launch_context import LaunchContext
+from launch.some_substitutions_type import SomeSubstitutionsType
+from launch.utilities import normalize_to_list_of_substitutions
+from launch.utilities import perform_substitutions
+
+from .generated_files import DISK
+from .generated_files import GeneratedFile
+from .generated_files import GeneratedFileStore
+from .generated_files import write_generated_file
+from .mission import Assignment
+from .moosfile_generator import evaluate_community_template
+
+
+ConfigType = Sequence[Union[Assignment, Tuple[str, SomeSubstitutionsType]]]
+
+
+def perform_config_substitutions(
+    context: LaunchContext, config: Optional[ConfigType]
+) -> List[Tuple[str, Any]]:
+    """Expand the substitutions in the values of configuration lines.
+
+    Values that are already text, numbers or None are kept as they are.
+    """
+    return [(name, _perform_value(context, value)) for name, value in config or []]
+
+
+def _perform_value(context: LaunchContext, value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return perform_substitutions(context, normalize_to_list_of_substitutions(value))
+
+
+class MOOSCommunity:
+    """
+    Mission file shared by all the MOOSApps of one community.
+
+    Apps register their ProcessConfig block with the community when they are
+    created. The first app to execute writes a single mission file holding the
+    global configuration once, followed by the block of every registered app,
+    and every other app of the community is then started with that same file.
+    """
+
+    def __init__(
+        self,
+        global_config: Optional[ConfigType] = None,
+        file_backend: str = DISK,
+        file_store: Optional[GeneratedFileStore] = None,
+    ) -> None:
+        """
+        Create a MOOSCommunity.
+
+        :param global_config: the global configuration lines of the community
+        :param file_backend: where the mission file is generated, see
+            :func:`launch_moos.generated_files.write_generated_file`
+        :param file_store: content addressed store the mission file is
+            generated in instead, see
+            :class:`launch_moos.generated_files.GeneratedFileStore`
+        """
+        self.global_config = list(global_config or [])
+        self.file_backend = file_backend
+        self.file_store = file_store
+        self.__processes: List[Tuple[SomeSubstitutionsType, ConfigType]] = []
+        self.__mission_file: Optional[GeneratedFile] = None
+        self.__stale = True
+
+    def add_process(
+        self, process_name: SomeSubstitutionsType, config: Optional[ConfigType]
+    ) -> None:
+        """Register the ProcessConfig block of an app of the community."""
+        self.__processes.append((process_name, config or []))
+        self.__stale = True
+
+    def update_process(self, process_name: str, config: Optional[ConfigType]) -> None:
+        """Replace the ProcessConfig block of an app, registering it if needed.
+
+        The mission file is rewritten the next time it is requested. Apps that
+        are already running are not affected until they are restarted.
+        """
+        for index, (name, _) in enumerate(self.__processes):
+            if name == process_name:
+                self.__processes[index] = (name, config or [])
+                break
+        else:
+            self.__processes.append((process_name, config or []))
+        self.__stale = True
+
+    @property
+    def mission_file(self) -> Optional[str]:
+        """Path of the generated mission file, None until it is written."""
+        return self.__mission_file.path if self.__mission_file is not None else None
+
+    def get_mission_file(self, context: LaunchContext) -> str:
+        """Return the generated mission file, writing it if needed."""
+        if self.__stale:
+            content = evaluate_community_template(
+                {
+                    "global_variables": perform_config_substitutions(
+                        context, self.global_config
+                    ),
+                    "processes": [
+                        (
+                            perform_substitutions(
+                                context, normalize_to_list_of_substitutions(name)
+                            ),
+                            perform_config_substitutions(context, config),
+                        )
+                        for name, config in self.__processes
+                    ],
+                }
+            )
+            self.__write(content)
+            self.__stale = False
+        assert self.__mission_file is not None  # noqa: S101
+        return self.__mission_file.path
+
+    def close(self) -> None:
+        """Release the generated mission file, once the launch shuts down.
+
+        The file is written again if it is requested afterwards.
+        """
+        if self.__mission_file is not None:
+            self.__mission_file.close()
+            self.__mission_file = None
+            self.__stale = True
+
+    def __write(self, content: str) -> None:
+        if self.file_store is not None:
+            # files of a store are named after their contents, the previous
+            # file stays referenced by the apps that were started with it
+            previous = self.__mission_file
+            self.__mission_file = self.file_store.acquire(content)
+            if previous is not None:
+                previous.close()
+        elif self.__mission_file is not None:
+            # an app joined after the file was written, apps that already
+            # started have read the file and are not affected
+            self.__mission_file.write(content)
+        else:
+            self.__mission_file = write_generated_file(content, self.file_backend)
@@ -0,0 +1,308 @@
+"""Ahead-of-time compilation of mission files into Python launch files.
+
+:func:`compile_mission` turns a ``.moos`` mission file into a standalone
+launch file building the :class:`launch_moos.actions.MOOSApp` actions with
+their configuration inline, and byte-compiles it, so launching it parses
+nothing. The launch file records the hash of the mission file and of every
+file it includes: it is only rebuilt when one of them changes, by
+:func:`compile_mission` or by the launch file itself when it is launched.
+"""
+import hashlib
+import json
+import py_compile
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Union
+
+
+# bumped whenever the generated code changes, so older launch files are rebuilt
+COMPILER_VERSION = 2
+
+_HEADER_PREFIX = "# launch_moos: "
+
+_TEMPLATE = '''\
+# Generated by `launch_moos compile` from {source_name}, do not edit.
+{header}
+"""Launch the MOOS community of {source_name}, compiled ahead of time."""
+from launch import LaunchDescription
+from launch.actions import RegisterEventHandler
+from launch.event_handlers import OnShutdown
+
+from launch_moos.actions import MOOSApp
+from launch_moos.actions import StaggeredLaunch
+from launch_moos.community import MOOSCommunity
+from launch_moos.compiler import load_if_stale
+from launch_moos.generated_files import GeneratedFileStore
+from launch_moos.scheduling import Scheduling
+
+
+GLOBAL_CONFIG = {global_config}
+
+
+def generate_launch_description() -> LaunchDescription:
+    """Create the launch description, recompiled first if the mission changed."""
+    recompiled = load_if_stale(__file__)
+    if recompiled is not None:
+        return recompiled
+
+    store = GeneratedFileStore()
+    close_store = RegisterEventHandler(
+        OnShutdown(on_shutdown=lambda event, context: store.close())
+    )
+    community = MOOSCommunity(GLOBAL_CONFIG, file_store=store)
+    apps = [{apps}
+    ]
+    return LaunchDescription({entities})
+'''
+
+
+def default_output(mission_file: Union[str, Path]) -> Path:
+    """Return the launch file a mission file compiles to by default.
+
+    Args:
+        mission_file: the mission file.
+
+    Returns:
+        ``name.launch.py`` next to ``name.moos``.
+    """
+    mission_file = Path(mission_file)
+    return mission_file.with_name(mission_file.stem + ".launch.py")
+
+
+def compile_mission(
+    mission_file: Union[str, Path],
+    output: Optional[Union[str, Path]] = None,
+    macros: Optional[Mapping[str, str]] = None,
+    staggered: bool = True,
+    force: bool = False,
+) -> bool:
+    """Compile a mission file into a launch file, unless it is up to date.
+
+    Args:
+        mission_file: the mission file.
+        output: the launch file, see :func:`default_output`.
+        macros: the nsplug macros defined before the mission file is read.
+        staggered: start the apps the way Antler does, see
+            :class:`launch_moos.actions.StaggeredLaunch`.
+        force: compile even if the launch file is up to date.
+
+    Returns:
+        Whether the launch file was written.
+    """
+    from .mission import Mission
+    from .moosfile_generator import write_if_changed
+    from .nsplug import Preprocessor
+
+    mission_file = Path(mission_file).resolve()
+    output = Path(output) if output is not None else default_output(mission_file)
+    settings = {"macros": dict(macros or {}), "staggered": staggered}
+    if not force and is_up_to_date(output, **settings):
+        return False
+
+    preprocessor = Preprocessor()
+    mission = Mission.from_string(
+        preprocessor.preprocess_file(mission_file, settings["macros"])
+    )
+    header = {
+        "compiler": COMPILER_VERSION,
+        "source": str(mission_file),
+        **settings,
+        "depends": {str(path): _hash_file(path) for path in preprocessor.files},
+    }
+    write_if_changed(output, generate_launch_file(mission, header))
+    py_compile.compile(str(output), doraise=True)
+    return True
+
+
+def generate_launch_file(mission: Any, header: Mapping[str, Any]) -> str:
+    """Generate the source of the launch file of a parsed mission.
+
+    Args:
+        mission: the :class:`launch_moos.mission.Mission`.
+        header: what the launch file was compiled from, as written by
+            :func:`compile_mission`.
+
+    Returns:
+        The launch file source.
+    """
+    from .plan import antler_staggering
+    from .plan import plan_mission
+
+    # resolves the ANTLER parameters and validates the mission
+    plan_mission(mission)
+
+    apps = "".join(_app(run, mission) for run in mission.runs)
+    if header["staggered"]:
+        delay, host, port = antler_staggering(mission)
+        entities = (
+            "\n        [\n            close_store,\n            StaggeredLaunch(\n"
+            "                apps=apps,\n"
+            f"                ms_between_launches={delay},\n"
+            f"                moosdb_host={_str(host)},\n"
+            f"                moosdb_port={port},\n"
+            "            ),\n        ]\n    "
+        )
+    else:
+        entities = "[close_store, *apps]"
+    return _TEMPLATE.format(
+        source_name=Path(header["source"]).name,
+        header=_HEADER_PREFIX + json.dumps(header, sort_keys=True),
+        global_config=_config(mission.global_config, 0),
+        apps=apps,
+        entities=entities,
+    )
+
+
+def read_header(launch_file: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Read what a compiled launch file was compiled from.
+
+    Args:
+        launch_file: the compiled launch file.
+
+    Returns:
+        The header written by :func:`compile_mission`, None if the file does
+        not exist or was not compiled by it.
+    """
+    try:
+        with open(launch_file) as h:
+            for line in h:
+                if not line.startswith("#"):
+                    break
+                if line.startswith(_HEADER_PREFIX):
+                    header: Dict[str, Any] = json.loads(line[len(_HEADER_PREFIX) :])
+                    return header
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def is_up_to_date(
+    launch_file: Union[str, Path],
+    macros: Optional[Mapping[str, str]] = None,
+    staggered: Optional[bool] = None,
+) -> bool:
+    """Check whether a compiled launch file matches the files it depends on.
+
+    Args:
+        launch_file: the compiled launch file.
+        macros: the macros it should be compiled with, the recorded ones if
+            None.
+        staggered: whether it should stagger the apps, the recorded setting
+            if None.
+
+    Returns:
+        Whether the launch file was compiled by this version, with these
+        settings, from the current contents of the mission file and of the
+        files it includes.
+    """
+    header = read_header(launch_file)
+    if header is None or header.get("compiler") != COMPILER_VERSION:
+        return False
+    if macros is not None and header.get("macros") != dict(macros):
+        return False
+    if staggered is not None and header.get("staggered") != staggered:
+        return False
+    for path, digest in header.get("depends", {}).items():
+        try:
+            if _hash_file(Path(path)) != digest:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def load_if_stale(launch_file: Union[str, Path]) -> Any:
+    """Recompile a launch file whose mission changed and load the new one.
+
+    Called by the compiled launch files before they create their actions. A
+    launch file moved away from its mission, to the machine it runs on for
+    example, is launched as compiled.
+
+    Args:
+        launch_file: the compiled launch file.
+
+    Returns:
+        The launch description of the recompiled launch file, None if the
+        launch file is up to date or its mission cannot be read.
+    """
+    header = read_header(launch_file)
+    if header is None or is_up_to_date(launch_file):
+        return None
+
+    import launch.logging
+    from launch.launch_description_sources import (
+        get_launch_description_from_python_launch_file,
+    )
+
+    missing = [path for path in header.get("depends", {}) if not Path(path).is_file()]
+    if missing or not Path(header["source"]).is_file():
+        launch.logging.get_logger(__name__).warning(
+            "cannot check whether {} is up to date, {} not found, launching it "
+            "as compiled".format(launch_file, ", ".join(missing or [header["source"]]))
+        )
+        return None
+
+    compile_mission(
+        header["source"],
+        launch_file,
+        macros=header.get("macros"),
+        staggered=header.get("staggered", True),
+        force=True,
+    )
+    return get_launch_description_from_python_launch_file(str(launch_file))
+
+
+def _app(run: Any, mission: Any) -> str:
+    from .plan import app_prefix
+    from .plan import extra_process_params
+    from .scheduling import PROCESS_CONFIG_KEYS
+    from .scheduling import without_scheduling_keys
+
+    block = mission.process_config(run.name)
+    config = block.config if block is not None else ()
+    keys = {name.lower() for name in PROCESS_CONFIG_KEYS.values()}
+    scheduling = [line for line in config if line.name.lower() in keys]
+
+    arguments = [
+        f"executable={_str(run.executable)}",
+        f"name={_str(run.name)}",
+    ]
+    if run.moosname:
+        arguments.append(f"alias={_str(run.moosname)}")
+    params = extra_process_params(run, mission)
+    if params:
+        arguments.append(f"arguments=[{', '.join(_str(p) for p in params)}]")
+    arguments.append(f"config={_config(without_scheduling_keys(config), 3)}")
+    arguments.append("community=community")
+    prefix = app_prefix(run)
+    if prefix is not None:
+        arguments.append(f"prefix={_str(prefix)}")
+    if scheduling:
+        arguments.append(f"scheduling=Scheduling.from_config({_config(scheduling, 3)})")
+
+    indent = "\n" + " " * 12
+    return f"\n        MOOSApp({indent}{f',{indent}'.join(arguments)},\n        ),"
+
+
+def _config(lines: Iterable[Any], level: int) -> str:
+    pairs: List[str] = [f"({_str(name)}, {_str(value)})" for name, value in lines]
+    if not pairs:
+        return "[]"
+    indent = " " * 4 * (level + 1)
+    return "[\n{}\n{}]".format(
+        "\n".join(f"{indent}{pair}," for pair in pairs), " " * 4 * level
+    )
+
+
+def _str(value: str) -> str:
+    # a JSON string is a valid Python string literal, in double quotes
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
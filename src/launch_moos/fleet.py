@@ -0,0 +1,191 @@
+"""Expansion of one mission into the communities of a fleet of vehicles."""
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from .mission import Assignment
+from .mission import Mission
+from .mission import ProcessConfig
+from .moosfile_generator import render_global_config
+from .moosfile_generator import render_process_config
+from .scheduling import without_scheduling_keys
+
+
+# an override value, a sequence sets a repeated key to several values
+OverrideValue = Union[str, int, float, Sequence[Union[str, int, float]]]
+
+# global overrides by key, and block overrides by block name then by key
+VehicleOverrides = Mapping[str, Union[OverrideValue, Mapping[str, OverrideValue]]]
+
+
+class Vehicle:
+    """The community of one vehicle of a fleet."""
+
+    __slots__ = ("name", "mission", "mission_text")
+
+    def __init__(self, name: str, mission: Mission, mission_text: str) -> None:
+        """
+        Create a Vehicle.
+
+        :param name: the vehicle name, also its community by default
+        :param mission: the mission with the overrides of the vehicle applied
+        :param mission_text: the generated mission file of the community
+        """
+        self.name = name
+        self.mission = mission
+        self.mission_text = mission_text
+
+    @property
+    def server_port(self) -> int:
+        """The port the MOOSDB of the vehicle listens on."""
+        return int(self.mission.get_global("ServerPort") or 0)
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"Vehicle({self.name!r}, {self.mission!r}, {self.mission_text!r})"
+
+
+def expand_fleet(
+    mission: Mission, vehicles: Mapping[str, VehicleOverrides]
+) -> List[Vehicle]:
+    """Create the community of every vehicle of a fleet from one mission.
+
+    The overrides of a vehicle map global keys to their value, and block
+    names to overrides of that block. An overridden key, compared ignoring
+    case, has all its lines replaced by the new value where its first line
+    was, a key the mission does not set is appended.
+
+    ``Community`` defaults to the vehicle name, and a vehicle without a
+    ``ServerPort`` gets the first port after the mission's that no other
+    vehicle uses.
+
+    Blocks without overrides are shared with the mission and are rendered
+    only once for the whole fleet.
+
+    Args:
+        mission: the mission every vehicle runs.
+        vehicles: the overrides of every vehicle, by vehicle name.
+
+    Returns:
+        The communities, in the order of ``vehicles``.
+
+    Raises:
+        ValueError: if two vehicles have the same community or port, or if
+            a block to override is not in the mission.
+    """
+    ports = _assign_ports(mission, vehicles)
+    rendered: Dict[int, str] = {}
+
+    fleet = []
+    communities: Set[str] = set()
+    for (name, overrides), port in zip(vehicles.items(), ports):
+        global_overrides: Dict[str, OverrideValue] = {"Community": name}
+        block_overrides = {}
+        for key, value in overrides.items():
+            if isinstance(value, Mapping):
+                block_overrides[key] = value
+            else:
+                global_overrides[key] = value
+        global_overrides["ServerPort"] = port
+        for block_name in block_overrides:
+            if block_name not in mission:
+                raise ValueError(f"the mission has no '{block_name}' block to override")
+
+        global_config = _override(mission.global_config, global_overrides)
+        process_configs = tuple(
+            ProcessConfig(
+                block.name,
+                _override(block.config, block_overrides[block.name]),
+                block.runs,
+            )
+            if block.name in block_overrides
+            else block
+            for block in mission.process_configs
+        )
+        vehicle_mission = Mission(global_config, process_configs)
+
+        community = vehicle_mission.get_global("Community") or ""
+        if community in communities:
+            raise ValueError(f"community '{community}' is used by several vehicles")
+        communities.add(community)
+
+        text = render_global_config(global_config) + "".join(
+            _render_block(vehicle_mission, run_name, rendered)
+            for run_name in dict.fromkeys(run.name for run in vehicle_mission.runs)
+        )
+        fleet.append(Vehicle(name, vehicle_mission, text))
+    return fleet
+
+
+def _assign_ports(
+    mission: Mission, vehicles: Mapping[str, VehicleOverrides]
+) -> List[int]:
+    explicit: List[Optional[int]] = []
+    for overrides in vehicles.values():
+        port = overrides.get("ServerPort")
+        explicit.append(None if port is None else int(str(port)))
+
+    taken = [port for port in explicit if port is not None]
+    if len(set(taken)) != len(taken):
+        raise ValueError("several vehicles are given the same ServerPort")
+
+    used = set(taken)
+    next_port = int(mission.get_global("ServerPort") or 9000)
+    ports = []
+    for port in explicit:
+        if port is None:
+            while next_port in used:
+                next_port += 1
+            port = next_port
+            used.add(port)
+        ports.append(port)
+    return ports
+
+
+def _override(
+    assignments: Tuple[Assignment, ...], overrides: Mapping[str, OverrideValue]
+) -> Tuple[Assignment, ...]:
+    if not overrides:
+        return assignments
+
+    by_key = {key.lower(): (key, value) for key, value in overrides.items()}
+    done: Set[str] = set()
+    result = []
+    for assignment in assignments:
+        key = assignment.name.lower()
+        if key not in by_key:
+            result.append(assignment)
+        elif key not in done:
+            # later lines of a repeated key are dropped
+            result.extend(_assignments(assignment.name, by_key[key][1]))
+            done.add(key)
+    for key, (name, value) in by_key.items():
+        if key not in done:
+            result.extend(_assignments(name, value))
+    return tuple(result)
+
+
+def _assignments(name: str, value: OverrideValue) -> List[Assignment]:
+    if isinstance(value, (list, tuple)):
+        return [Assignment(name, str(v)) for v in value]
+    return [Assignment(name, str(value))]
+
+
+def _render_block(mission: Mission, name: str, rendered: Dict[int, str]) -> str:
+    block = mission.process_config(name)
+    if block is None:
+        return render_process_config(name, ())
+    # blocks without overrides are the same objects for every vehicle
+    text = rendered.get(id(block))
+    if text is None:
+        # as for the apps of a single mission, the scheduling is applied by
+        # the launch rather than read by the app
+        text = rendered[id(block)] = render_process_config(
+            name, without_scheduling_keys(block.config)
+        )
+    return text
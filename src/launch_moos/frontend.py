@@ -0,0 +1,101 @@
+"""Cache of the entity trees of XML and YAML launch files.
+
+The launch file of a vehicle is often included once per vehicle by the launch
+file of a fleet. Included with ``<include_cached>``, see
+:class:`launch_moos.actions.IncludeCachedLaunchDescription`, rather than
+``<include>``, the frontend parser only goes through it once per process for as
+long as its contents do not change: the entity tree it produces is cached by
+the hash of the file. The launch description is still created from the tree
+every time, since actions hold the state of one launch.
+
+The cache lives in the launch process, it is not kept across launches: loading
+a pickled tree is slower than parsing the XML again.
+"""
+import hashlib
+import io
+from collections import OrderedDict
+from pathlib import Path
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from launch.frontend import Entity
+from launch.frontend import Parser
+from launch.launch_description import LaunchDescription
+from launch.launch_description_source import LaunchDescriptionSource
+from launch.some_substitutions_type import SomeSubstitutionsType
+
+
+DEFAULT_MAX_ENTRIES = 64
+
+# keyed by content hash and file extension, which picks the frontend
+_trees: "OrderedDict[Tuple[str, str], Tuple[Entity, Parser]]" = OrderedDict()
+
+
+def load_launch_file(
+    path: Union[str, Path],
+    parser: Type[Parser] = Parser,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> Tuple[Entity, Parser]:
+    """Load a frontend launch file, reusing the entity tree if it is unchanged.
+
+    Args:
+        path: the launch file.
+        parser: the frontend parser, see :meth:`launch.frontend.Parser.load`.
+        max_entries: the number of trees kept, the least recently used tree
+            is dropped beyond that.
+
+    Returns:
+        The root entity of the file and the parser of its frontend.
+    """
+    path = Path(path)
+    content = path.read_bytes()
+    key = (hashlib.sha256(content).hexdigest(), path.suffix)
+    tree = _trees.get(key)
+    if tree is not None:
+        _trees.move_to_end(key)
+        return tree
+
+    # parse the contents that were hashed, the parser reads the name for the
+    # extension
+    fileobj = io.StringIO(content.decode())
+    fileobj.name = str(path)  # type: ignore[misc]
+    tree = parser.load(fileobj)
+    _trees[key] = tree
+    while len(_trees) > max_entries:
+        _trees.popitem(last=False)
+    return tree
+
+
+def clear_frontend_cache() -> None:
+    """Forget the entity trees loaded."""
+    _trees.clear()
+
+
+class CachedFrontendLaunchDescriptionSource(LaunchDescriptionSource):
+    """Encapsulation of an XML or YAML launch file, loaded through the cache."""
+
+    def __init__(
+        self,
+        launch_file_path: SomeSubstitutionsType,
+        *,
+        parser: Type[Parser] = Parser,
+    ) -> None:
+        """
+        Create a CachedFrontendLaunchDescriptionSource.
+
+        Same as :class:`launch.launch_description_sources.FrontendLaunchDescriptionSource`,
+        except that the file is loaded with :func:`load_launch_file`.
+
+        :param launch_file_path: the path to the launch file
+        :param parser: the frontend parser
+        """
+        super().__init__(
+            None, launch_file_path, "interpreted frontend launch file, cached"
+        )
+        self.__parser = parser
+
+    def _get_launch_description(self, location) -> LaunchDescription:
+        """Get the LaunchDescription from location."""
+        root_entity, parser = load_launch_file(location, self.__parser)
+        return parser.parse_description(root_entity)
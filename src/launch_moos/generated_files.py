@@ -0,0 +1,324 @@
+"""Storage of the mission files generated for the apps.
+
+Generated mission files are written to the temporary directory by default.
+With the ``memory`` backend they are instead anonymous in-memory files created
+with ``memfd_create``, handed to the apps as ``/proc/<pid>/fd/<fd>`` paths, so
+that a launch does no disk I/O. Where ``memfd_create`` is not available the
+files go to a tmpfs, ``/dev/shm``. The actions close the files they generate
+once the apps are done with them, or when the launch shuts down, so that
+neither memfds nor tmpfs files outlive their apps.
+
+A :class:`GeneratedFileStore` instead keeps them on disk named by the hash of
+their contents, so that identical files are written once and reused across
+relaunches, and removes them once no app uses them.
+"""
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from . import tracing
+
+
+DISK = "disk"
+MEMORY = "memory"
+BACKENDS = (DISK, MEMORY)
+
+TMPFS_DIR = Path("/dev/shm")
+
+DEFAULT_STORE_MAX_SIZE = 16 * 1024 * 1024
+
+# seconds an unreferenced file is kept regardless of the size cap, launches
+# sharing a store directory do not see each other's references
+STORE_GRACE_PERIOD = 60.0
+
+_PREFIX = "launch_moos_"
+_SUFFIX = ".moos"
+
+
+class GeneratedFile:
+    """A generated mission file, which apps read through :attr:`path`."""
+
+    __slots__ = ("path", "backend", "__fd", "__store")
+
+    def __init__(
+        self,
+        path: str,
+        backend: str,
+        fd: Optional[int] = None,
+        store: Optional["GeneratedFileStore"] = None,
+    ) -> None:
+        """
+        Create a GeneratedFile.
+
+        :param path: the path the apps read the file from
+        :param backend: the backend holding the file
+        :param fd: the in-memory file descriptor, if the file is a memfd
+        :param store: the store the file is referenced from, if any
+        """
+        self.path = path
+        self.backend = backend
+        self.__fd = fd
+        self.__store = store
+
+    @property
+    def in_memory(self) -> bool:
+        """Whether the file is an anonymous in-memory file."""
+        return self.__fd is not None
+
+    def write(self, content: str) -> None:
+        """Replace the contents of the file.
+
+        Apps that already read the file are not affected.
+
+        Args:
+            content: the new contents.
+
+        Raises:
+            ValueError: if the file is named after its contents in a store.
+        """
+        if self.__store is not None:
+            raise ValueError("files of a GeneratedFileStore cannot be rewritten")
+        data = content.encode()
+        if self.__fd is None:
+            Path(self.path).write_bytes(data)
+            return
+        os.ftruncate(self.__fd, 0)
+        os.pwrite(self.__fd, data, 0)
+
+    def close(self) -> None:
+        """Release the file, apps must not be started with it afterwards.
+
+        An in-memory file is freed once the apps that opened it close it, a
+        tmpfs or disk file is removed, and a reference to a file of a store is
+        released.
+        """
+        if self.__store is not None:
+            self.__store.release(self.path)
+        elif self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+        else:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"GeneratedFile({self.path!r}, {self.backend!r})"
+
+
+def write_generated_file(content: str, backend: str = DISK) -> GeneratedFile:
+    """Store a generated mission file.
+
+    The file stays available until it is closed, or until the launch exits
+    for in-memory files.
+
+    Args:
+        content: the mission file contents.
+        backend: ``disk`` for a file in the temporary directory, ``memory``
+            for an in-memory file, falling back to a tmpfs file.
+
+    Returns:
+        The generated file.
+
+    Raises:
+        ValueError: if the backend is unknown.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            "unknown generated file backend '{}', expected one of {}".format(
+                backend, ", ".join(BACKENDS)
+            )
+        )
+
+    with tracing.span("write_mission_file", backend=backend):
+        if backend == MEMORY:
+            generated = _memfd() or _temporary_file(backend, _tmpfs_dir())
+        else:
+            generated = _temporary_file(backend, None)
+        generated.write(content)
+    return generated
+
+
+def _memfd() -> Optional[GeneratedFile]:
+    memfd_create = getattr(os, "memfd_create", None)
+    if memfd_create is None:
+        return None
+    try:
+        # apps are started with close_fds, so rather than inheriting the
+        # descriptor they open the one of the launch process through /proc
+        fd = memfd_create(_PREFIX + "mission", getattr(os, "MFD_CLOEXEC", 0))
+    except OSError:
+        return None
+    return GeneratedFile(f"/proc/{os.getpid()}/fd/{fd}", MEMORY, fd)
+
+
+def _tmpfs_dir() -> Optional[str]:
+    if TMPFS_DIR.is_dir() and os.access(TMPFS_DIR, os.W_OK):
+        return str(TMPFS_DIR)
+    return None
+
+
+def _temporary_file(backend: str, directory: Optional[str]) -> GeneratedFile:
+    with NamedTemporaryFile(
+        mode="w", prefix=_PREFIX, suffix=_SUFFIX, dir=directory, delete=False
+    ) as h:
+        return GeneratedFile(h.name, backend)
+
+
+def default_store_dir() -> Path:
+    """Return the directory of the default :class:`GeneratedFileStore`.
+
+    ``$LAUNCH_MOOS_GENERATED_DIR`` takes precedence, then a directory of the
+    current user in the temporary directory.
+
+    Returns:
+        The store directory path, which may not exist yet.
+    """
+    store_dir = os.environ.get("LAUNCH_MOOS_GENERATED_DIR")
+    if store_dir:
+        return Path(store_dir)
+    return Path(tempfile.gettempdir()) / f"launch_moos-{os.getuid()}"
+
+
+class GeneratedFileStore:
+    """Content addressed store of generated mission files.
+
+    Files are named after the hash of their contents, so acquiring the same
+    contents again, in this launch or a later one, reuses the existing file.
+    Every :meth:`acquire` or :meth:`retain` holds a reference to the file
+    until it is released. Files nobody references are kept for reuse as long
+    as the store stays within ``max_size`` bytes, the least recently used ones
+    being removed first, and :meth:`close` drops the remaining references once
+    the launch shuts down.
+    """
+
+    def __init__(
+        self,
+        store_dir: Optional[Union[str, Path]] = None,
+        max_size: int = DEFAULT_STORE_MAX_SIZE,
+    ) -> None:
+        """
+        Create a GeneratedFileStore.
+
+        :param store_dir: directory to keep the files in, see
+            :func:`default_store_dir`
+        :param max_size: maximum total size of the unreferenced files in bytes
+        """
+        self.store_dir = Path(store_dir) if store_dir else default_store_dir()
+        self.max_size = max_size
+        self.__references: Dict[str, int] = {}
+
+    def acquire(self, content: str) -> GeneratedFile:
+        """Store a generated mission file, or reuse the one with these contents.
+
+        Args:
+            content: the mission file contents.
+
+        Returns:
+            The generated file, closing it releases the reference.
+        """
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        path = self.store_dir / f"{_PREFIX}{digest[:32]}{_SUFFIX}"
+        with tracing.span("write_mission_file", backend="store"):
+            try:
+                # already holds the contents it is named after, refresh the
+                # modification time, which orders the eviction
+                os.utime(path)
+            except FileNotFoundError:
+                self.store_dir.mkdir(parents=True, exist_ok=True)
+                # write then rename, so launches sharing the store directory
+                # never start an app with a partial file
+                partial = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                partial.write_text(content)
+                os.replace(partial, path)
+        self.__references[str(path)] = self.__references.get(str(path), 0) + 1
+        return GeneratedFile(str(path), DISK, store=self)
+
+    def retain(self, path: str) -> bool:
+        """Add a reference to a file of the store, for another app using it.
+
+        Args:
+            path: the file.
+
+        Returns:
+            Whether the path is a file of the store.
+        """
+        if path not in self.__references:
+            return False
+        self.__references[path] += 1
+        return True
+
+    def release(self, path: str) -> None:
+        """Drop a reference to a file, which may then be removed."""
+        count = self.__references.get(path, 0)
+        if count > 1:
+            self.__references[path] = count - 1
+            return
+        if count == 1:
+            self.__references[path] = 0
+            self._evict()
+
+    def references(self, path: str) -> int:
+        """Return the number of references to a file of the store."""
+        return self.__references.get(path, 0)
+
+    def close(self) -> None:
+        """Drop every reference, once the launch shuts down."""
+        self.__references = {path: 0 for path in self.__references}
+        self._evict()
+
+    def _evict(self) -> None:
+        now = time.time()
+        try:
+            entries = sorted(self._unreferenced())
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if total <= self.max_size or now - mtime < STORE_GRACE_PERIOD:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            self.__references.pop(path, None)
+
+    def _unreferenced(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        with os.scandir(self.store_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith(_SUFFIX):
+                    continue
+                if self.__references.get(dir_entry.path):
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except FileNotFoundError:
+                    # evicted by another launch sharing the directory
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+        return entries
+
+    def clear(self) -> None:
+        """Remove every file nobody references."""
+        if not self.store_dir.is_dir():
+            return
+        for path in self.store_dir.glob(f"*{_SUFFIX}"):
+            if not self.__references.get(str(path)):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                self.__references.pop(str(path), None)
@@ -0,0 +1,179 @@
+"""Incremental re-parsing of mission files that are being edited."""
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .mission import Assignment
+from .mission import Mission
+from .mission import ProcessConfig
+from .tokenizer import parse_records
+from .tokenizer import split_regions
+
+
+# pseudo configuration key reported when the ``Run =`` lines of a block change
+RUN_KEY = "run"
+
+
+class MissionDiff:
+    """Structural difference between two versions of a mission."""
+
+    __slots__ = ("added", "removed", "modified", "globals_changed")
+
+    def __init__(
+        self,
+        added: Tuple[str, ...] = (),
+        removed: Tuple[str, ...] = (),
+        modified: Optional[Dict[str, Tuple[str, ...]]] = None,
+        globals_changed: Tuple[str, ...] = (),
+    ) -> None:
+        """
+        Create a MissionDiff.
+
+        :param added: names of the ProcessConfig blocks that appeared
+        :param removed: names of the ProcessConfig blocks that disappeared
+        :param modified: changed configuration keys of every modified block,
+            lower-cased
+        :param globals_changed: the changed global configuration keys, lower-cased
+        """
+        self.added = added
+        self.removed = removed
+        self.modified = modified or {}
+        self.globals_changed = globals_changed
+
+    @property
+    def affected(self) -> Tuple[str, ...]:
+        """Names of every block that was added, removed or modified."""
+        return self.added + self.removed + tuple(self.modified)
+
+    def __bool__(self) -> bool:
+        """Return whether anything changed."""
+        return bool(self.affected or self.globals_changed)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by value."""
+        if not isinstance(other, MissionDiff):
+            return NotImplemented
+        return (
+            self.added == other.added
+            and self.removed == other.removed
+            and self.modified == other.modified
+            and self.globals_changed == other.globals_changed
+        )
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return (
+            f"MissionDiff({self.added!r}, {self.removed!r}, {self.modified!r}, "
+            f"{self.globals_changed!r})"
+        )
+
+
+def diff_missions(old: Mission, new: Mission) -> MissionDiff:
+    """Compare two versions of a mission, block by block.
+
+    Blocks are matched by name, with the first block of a name winning as in
+    :meth:`launch_moos.mission.Mission.process_config`. Configuration keys are
+    compared ignoring case, a repeated key is changed if any of its values is.
+
+    Args:
+        old: the previous version.
+        new: the current version.
+
+    Returns:
+        The difference.
+    """
+    old_names = _block_names(old)
+    new_names = _block_names(new)
+
+    modified = {}
+    for name in new_names:
+        old_block = old.process_config(name)
+        new_block = new.process_config(name)
+        if old_block is None or new_block is None or old_block is new_block:
+            continue
+        keys = _changed_keys(old_block.config, new_block.config)
+        if old_block.runs != new_block.runs:
+            keys += (RUN_KEY,)
+        if keys:
+            modified[name] = keys
+
+    return MissionDiff(
+        added=tuple(name for name in new_names if name not in old),
+        removed=tuple(name for name in old_names if name not in new),
+        modified=modified,
+        globals_changed=_changed_keys(old.global_config, new.global_config),
+    )
+
+
+class IncrementalParser:
+    """Parser keeping the previous version of a mission around.
+
+    Only the ProcessConfig blocks whose text changed since the previous call
+    to :meth:`update` are parsed again, every other block is reused as is.
+    Comparing unchanged blocks of the two versions is then an identity check.
+    """
+
+    def __init__(self) -> None:
+        """Create an IncrementalParser with an empty mission."""
+        self.__regions: Dict[str, Mission] = {}
+        self.__mission = Mission()
+
+    @property
+    def mission(self) -> Mission:
+        """The mission as of the last update."""
+        return self.__mission
+
+    def update(self, text: str) -> MissionDiff:
+        """Parse a new version of the mission file.
+
+        Args:
+            text: the mission file contents.
+
+        Returns:
+            The difference with the previous version.
+
+        Raises:
+            ParseException: if ``text`` is not a valid mission file, raised by
+                :func:`launch_moos.tokenizer.parse_records`, the previous
+                version is kept.
+        """
+        regions = {}
+        global_config: List[Assignment] = []
+        process_configs: List[ProcessConfig] = []
+        for _, region in split_regions(text):
+            part = self.__regions.get(region)
+            if part is None:
+                part = Mission.from_records(parse_records(region))
+            regions[region] = part
+            global_config.extend(part.global_config)
+            process_configs.extend(part.process_configs)
+
+        old = self.__mission
+        self.__regions = regions
+        self.__mission = Mission(tuple(global_config), tuple(process_configs))
+        return diff_missions(old, self.__mission)
+
+
+def _block_names(mission: Mission) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(block.name for block in mission.process_configs))
+
+
+def _changed_keys(
+    old: Iterable[Assignment], new: Iterable[Assignment]
+) -> Tuple[str, ...]:
+    old_values = _values_by_key(old)
+    new_values = _values_by_key(new)
+    return tuple(
+        name
+        for name in dict.fromkeys([*old_values, *new_values])
+        if old_values.get(name) != new_values.get(name)
+    )
+
+
+def _values_by_key(assignments: Iterable[Assignment]) -> Dict[str, List[str]]:
+    values: Dict[str, List[str]] = {}
+    for assignment in assignments:
+        values.setdefault(assignment.name.lower(), []).append(assignment.value)
+    return values
@@ -0,0 +1,267 @@
+"""Sampling of the CPU, memory and IO use of the apps from /proc.
+
+A :class:`ResourceSampler` reads ``/proc/<pid>/stat``, ``status`` and ``io``
+of every app it is given, keeps a fixed size history of samples per app and
+exports the latest ones in the Prometheus text format or as JSON.
+"""
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+
+DEFAULT_SAMPLE_INTERVAL = 1.0
+
+DEFAULT_HISTORY = 60
+
+PROC_DIR = "/proc"
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class ResourceSample:
+    """Resource use of an app at one point in time."""
+
+    __slots__ = ("timestamp", "cpu_percent", "rss_bytes", "read_bytes", "write_bytes")
+
+    def __init__(
+        self,
+        timestamp: float,
+        cpu_percent: float,
+        rss_bytes: int,
+        read_bytes: Optional[int],
+        write_bytes: Optional[int],
+    ) -> None:
+        """
+        Create a ResourceSample.
+
+        :param timestamp: when the sample was taken, seconds since the epoch
+        :param cpu_percent: CPU use since the previous sample, 100 being a core
+        :param rss_bytes: resident memory
+        :param read_bytes: bytes read from storage so far, None if unreadable
+        :param write_bytes: bytes written to storage so far, None if unreadable
+        """
+        self.timestamp = timestamp
+        self.cpu_percent = cpu_percent
+        self.rss_bytes = rss_bytes
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the sample as a JSON serialisable dictionary."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        values = ", ".join(repr(getattr(self, slot)) for slot in self.__slots__)
+        return f"ResourceSample({values})"
+
+
+class _App:
+    __slots__ = ("pid", "history", "cpu_ticks", "sampled_at")
+
+    def __init__(self, pid: int, history: int) -> None:
+        self.pid: Optional[int] = pid
+        self.history: Deque[ResourceSample] = deque(maxlen=history)
+        self.cpu_ticks: Optional[int] = None
+        self.sampled_at = 0.0
+
+
+class ResourceSampler:
+    """Periodic sampler of the resource use of the apps of a launch.
+
+    All the apps are sampled by a single asyncio task. An app that exited is
+    no longer sampled but its history is kept until it is removed.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        history: int = DEFAULT_HISTORY,
+        proc_dir: Union[str, Path] = PROC_DIR,
+        on_sample: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Create a ResourceSampler.
+
+        :param interval: seconds between two samples
+        :param history: number of samples kept per app
+        :param proc_dir: where procfs is mounted
+        :param on_sample: called after every periodic sample, to export them
+        """
+        self.interval = interval
+        self.on_sample = on_sample
+        self.history_size = history
+        self.proc_dir = str(proc_dir)
+        self.__apps: Dict[str, _App] = {}
+        self.__task: Optional["asyncio.Task[None]"] = None
+
+    def add(self, name: str, pid: int) -> None:
+        """Sample a process from now on, replacing the app of the same name."""
+        self.__apps[name] = _App(pid, self.history_size)
+
+    def remove(self, name: str) -> None:
+        """Stop sampling an app and forget its history."""
+        self.__apps.pop(name, None)
+
+    @property
+    def apps(self) -> Dict[str, Optional[int]]:
+        """The pid of every app, by name, None once it exited."""
+        return {name: app.pid for name, app in self.__apps.items()}
+
+    def history(self, name: str) -> List[ResourceSample]:
+        """Return the samples of an app, oldest first."""
+        app = self.__apps.get(name)
+        return list(app.history) if app is not None else []
+
+    def sample(self) -> None:
+        """Sample every app once."""
+        now = time.time()
+        monotonic = time.monotonic()
+        for app in self.__apps.values():
+            if app.pid is None:
+                continue
+            read = _read_proc(self.proc_dir, app.pid)
+            if read is None:
+                # the process exited, keep its history
+                app.pid = None
+                continue
+            cpu_ticks, rss_bytes, io = read
+            cpu_percent = 0.0
+            if app.cpu_ticks is not None and monotonic > app.sampled_at:
+                cpu_seconds = (cpu_ticks - app.cpu_ticks) / _CLOCK_TICKS
+                cpu_percent = 100.0 * cpu_seconds / (monotonic - app.sampled_at)
+            app.cpu_ticks = cpu_ticks
+            app.sampled_at = monotonic
+            app.history.append(
+                ResourceSample(now, cpu_percent, rss_bytes, io[0], io[1])
+            )
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Sample every ``interval`` seconds until stopped."""
+        self.__task = loop.create_task(self.__run())
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+
+    async def __run(self) -> None:
+        while True:
+            self.sample()
+            if self.on_sample is not None:
+                self.on_sample()
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the history of every app as a JSON serialisable dictionary."""
+        return {
+            name: {
+                "pid": app.pid,
+                "samples": [sample.to_dict() for sample in app.history],
+            }
+            for name, app in self.__apps.items()
+        }
+
+    def prometheus_text(self) -> str:
+        """Return the latest sample of every app in the Prometheus text format."""
+        latest = [
+            (name, app.history[-1]) for name, app in self.__apps.items() if app.history
+        ]
+        lines = []
+        for metric, kind, help_text, attribute in _METRICS:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, sample in latest:
+                value = getattr(sample, attribute)
+                if value is not None:
+                    lines.append(f'{metric}{{app="{_escape(name)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Union[str, Path]) -> None:
+        """Write :meth:`prometheus_text` to a file, for the node exporter."""
+        _replace(Path(path), self.prometheus_text())
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        """Write :meth:`snapshot` to a JSON file."""
+        _replace(Path(path), json.dumps(self.snapshot()))
+
+
+_METRICS = (
+    ("launch_moos_app_cpu_percent", "gauge", "CPU use, 100 is one core", "cpu_percent"),
+    ("launch_moos_app_rss_bytes", "gauge", "Resident memory", "rss_bytes"),
+    ("launch_moos_app_read_bytes_total", "counter", "Bytes read", "read_bytes"),
+    ("launch_moos_app_write_bytes_total", "counter", "Bytes written", "write_bytes"),
+)
+
+
+def _read_proc(
+    proc_dir: str, pid: int
+) -> Optional[Tuple[int, int, Tuple[Optional[int], Optional[int]]]]:
+    """Read the CPU ticks, resident memory and IO of a process."""
+    base = f"{proc_dir}/{pid}/"
+    try:
+        stat = _read(base + "stat")
+        status = _read(base + "status")
+    except OSError:
+        return None
+
+    # the command name may hold spaces and parentheses, fields follow the last
+    fields = stat[stat.rindex(b")") + 2 :].split()
+    # utime and stime, the 14th and 15th fields counting from the pid
+    cpu_ticks = int(fields[11]) + int(fields[12])
+
+    rss_bytes = 0
+    start = status.find(b"VmRSS:")
+    if start >= 0:
+        rss_bytes = int(status[start + 6 : status.index(b"kB", start)]) * 1024
+
+    try:
+        io = _read(base + "io")
+    except OSError:
+        # only readable by the owner of the process
+        return cpu_ticks, rss_bytes, (None, None)
+    return (
+        cpu_ticks,
+        rss_bytes,
+        (_field(io, b"read_bytes:"), _field(io, b"write_bytes:")),
+    )
+
+
+def _read(path: str) -> bytes:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 8192)
+    finally:
+        os.close(fd)
+
+
+def _field(text: bytes, name: bytes) -> Optional[int]:
+    start = text.find(b"\n" + name)
+    if start < 0 and not text.startswith(name):
+        return None
+    start = start + 1 if start >= 0 else 0
+    end = text.find(b"\n", start)
+    return int(text[start + len(name) : end if end >= 0 else None])
+
+
+def _escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _replace(path: Path, text: str) -> None:
+    # write then rename, so scrapers never read a partial file
+    partial = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    partial.write_text(text)
+    os.replace(partial, path)
@@ -0,0 +1,358 @@
+"""Compact, typed model of a parsed MOOS mission file."""
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from . import tracing
+from .parser import parse_mission
+from .tokenizer import parse_records
+
+
+if TYPE_CHECKING:
+    import pyparsing as pp
+
+
+class Assignment:
+    """A ``name = value`` line, unpackable as a ``(name, value)`` pair."""
+
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str, value: str) -> None:
+        """
+        Create an Assignment.
+
+        :param name: the variable name
+        :param value: the assigned value, as written in the mission file
+        """
+        self.name = name
+        self.value = value
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield the name then the value."""
+        yield self.name
+        yield self.value
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by value."""
+        if not isinstance(other, Assignment):
+            return NotImplemented
+        return self.name == other.name and self.value == other.value
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"Assignment({self.name!r}, {self.value!r})"
+
+
+class AntlerRun:
+    """A ``Run = executable @ params ~moosname`` line of the ANTLER block."""
+
+    __slots__ = ("executable", "params", "moosname")
+
+    def __init__(
+        self,
+        executable: str,
+        params: Tuple[Assignment, ...] = (),
+        moosname: Optional[str] = None,
+    ) -> None:
+        """
+        Create an AntlerRun.
+
+        :param executable: the app to run
+        :param params: the ``name=value`` launch parameters following ``@``
+        :param moosname: the MOOS name given after ``~``, if any
+        """
+        self.executable = executable
+        self.params = params
+        self.moosname = moosname
+
+    @property
+    def name(self) -> str:
+        """Name the app registers with, which is also its ProcessConfig block."""
+        return self.moosname or self.executable
+
+    def param(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Look up a launch parameter, ignoring case as Antler does.
+
+        Args:
+            name: the parameter name.
+            default: returned if the parameter is not given.
+
+        Returns:
+            The parameter value.
+        """
+        return _lookup(self.params, name, default)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by value."""
+        if not isinstance(other, AntlerRun):
+            return NotImplemented
+        return (
+            self.executable == other.executable
+            and self.params == other.params
+            and self.moosname == other.moosname
+        )
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"AntlerRun({self.executable!r}, {self.params!r}, {self.moosname!r})"
+
+
+class ProcessConfig:
+    """A ``ProcessConfig = name { ... }`` block."""
+
+    __slots__ = ("name", "config", "runs")
+
+    def __init__(
+        self,
+        name: str,
+        config: Tuple[Assignment, ...] = (),
+        runs: Tuple[AntlerRun, ...] = (),
+    ) -> None:
+        """
+        Create a ProcessConfig.
+
+        :param name: the process the block configures
+        :param config: the configuration lines, in file order
+        :param runs: the ``Run =`` lines, only expected in the ANTLER block
+        """
+        self.name = name
+        self.config = config
+        self.runs = runs
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Look up the first value of a configuration key, ignoring case.
+
+        Args:
+            name: the configuration key.
+            default: returned if the key is not in the block.
+
+        Returns:
+            The configuration value.
+        """
+        return _lookup(self.config, name, default)
+
+    def get_all(self, name: str) -> List[str]:
+        """Look up every value of a repeated configuration key, ignoring case.
+
+        Args:
+            name: the configuration key.
+
+        Returns:
+            The configuration values, in file order.
+        """
+        name = name.lower()
+        return [a.value for a in self.config if a.name.lower() == name]
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by value."""
+        if not isinstance(other, ProcessConfig):
+            return NotImplemented
+        return (
+            self.name == other.name
+            and self.config == other.config
+            and self.runs == other.runs
+        )
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"ProcessConfig({self.name!r}, {self.config!r}, {self.runs!r})"
+
+
+class Mission:
+    """A parsed MOOS mission file.
+
+    Holds the global configuration and the ``ProcessConfig`` blocks, indexed by
+    process name.
+    """
+
+    __slots__ = ("global_config", "process_configs", "_index")
+
+    def __init__(
+        self,
+        global_config: Tuple[Assignment, ...] = (),
+        process_configs: Tuple[ProcessConfig, ...] = (),
+    ) -> None:
+        """
+        Create a Mission.
+
+        :param global_config: the global configuration lines, in file order
+        :param process_configs: the ProcessConfig blocks, in file order
+        """
+        self.global_config = global_config
+        self.process_configs = process_configs
+        self._index: Dict[str, ProcessConfig] = {}
+        for block in process_configs:
+            # like the MOOS apps themselves, the first block with a name wins
+            self._index.setdefault(block.name, block)
+
+    def process_config(self, name: str) -> Optional[ProcessConfig]:
+        """Return the ProcessConfig block of a process.
+
+        Args:
+            name: the process name.
+
+        Returns:
+            The block, or None if the mission does not configure the process.
+        """
+        return self._index.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        """Return whether the mission has a ProcessConfig block for ``name``."""
+        return name in self._index
+
+    def get_global(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Look up a global configuration value, ignoring case.
+
+        Args:
+            name: the configuration key.
+            default: returned if the key is not set.
+
+        Returns:
+            The configuration value.
+        """
+        return _lookup(self.global_config, name, default)
+
+    @property
+    def antler(self) -> Optional[ProcessConfig]:
+        """The ANTLER block, listing the apps of the community."""
+        return self._index.get("ANTLER")
+
+    @property
+    def runs(self) -> Tuple[AntlerRun, ...]:
+        """The ``Run =`` lines of the ANTLER block."""
+        antler = self.antler
+        return antler.runs if antler is not None else ()
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by value."""
+        if not isinstance(other, Mission):
+            return NotImplemented
+        return (
+            self.global_config == other.global_config
+            and self.process_configs == other.process_configs
+        )
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"Mission({self.global_config!r}, {self.process_configs!r})"
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[Any, ...]]) -> "Mission":
+        """Build a mission from its record form.
+
+        See :mod:`launch_moos.tokenizer` for a description of the records.
+        Trailing whitespace is stripped from values.
+
+        Args:
+            records: the flattened mission.
+
+        Returns:
+            The mission.
+        """
+        global_config = []
+        process_configs = []
+        for name, value in records:
+            if isinstance(value, str):
+                global_config.append(Assignment(name, value.rstrip()))
+                continue
+
+            assignments = []
+            runs = []
+            for entry in value:
+                if len(entry) == 2:
+                    assignments.append(Assignment(entry[0], entry[1].rstrip()))
+                else:
+                    executable, params, moosname = entry
+                    params = tuple(Assignment(*param) for param in params)
+                    runs.append(AntlerRun(executable, params, moosname))
+            process_configs.append(ProcessConfig(name, tuple(assignments), tuple(runs)))
+        return cls(tuple(global_config), tuple(process_configs))
+
+    def to_records(self) -> Tuple[Any, ...]:
+        """Flatten the mission into nested tuples of strings.
+
+        Returns:
+            The mission in record form, suitable for :mod:`marshal`.
+        """
+        records: List[Tuple[Any, ...]] = [tuple(a) for a in self.global_config]
+        for block in self.process_configs:
+            entries: List[Tuple[Any, ...]] = [tuple(a) for a in block.config]
+            entries.extend(
+                (run.executable, tuple(tuple(p) for p in run.params), run.moosname)
+                for run in block.runs
+            )
+            records.append((block.name, tuple(entries)))
+        return tuple(records)
+
+    @classmethod
+    def from_parse_results(cls, results: "pp.ParseResults") -> "Mission":
+        """Convert the output of the pyparsing grammar.
+
+        Args:
+            results: the output of :func:`launch_moos.parser.parse_mission`.
+
+        Returns:
+            The mission.
+        """
+        records = []
+        for item in results:
+            if "processconfig_name" not in item:
+                records.append((item["name"], item["value"]))
+                continue
+
+            entries = []
+            for entry in item["config"]:
+                if "executable" in entry:
+                    params = tuple((p["name"], p["value"]) for p in entry["params"])
+                    entries.append((entry["executable"], params, entry.get("moosname")))
+                else:
+                    entries.append((entry["name"], entry["value"]))
+            records.append((item["processconfig_name"], tuple(entries)))
+        return cls.from_records(records)
+
+    @classmethod
+    def from_string(cls, text: str, backend: str = "tokenizer") -> "Mission":
+        """Parse the contents of a mission file.
+
+        Args:
+            text: the mission file contents.
+            backend: the parser backend, see :func:`launch_moos.parser.parse_mission`.
+
+        Returns:
+            The mission.
+        """
+        with tracing.span("parse", backend=backend, size=len(text)):
+            if backend == "tokenizer":
+                # skip building pyparsing results entirely
+                return cls.from_records(parse_records(text))
+            return cls.from_parse_results(parse_mission(text, backend=backend))
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], backend: str = "tokenizer") -> "Mission":
+        """Parse a mission file.
+
+        Args:
+            path: the mission file.
+            backend: the parser backend, see :func:`launch_moos.parser.parse_mission`.
+
+        Returns:
+            The mission.
+        """
+        return cls.from_string(Path(path).read_text(), backend=backend)
+
+
+def _lookup(
+    assignments: Iterable[Assignment], name: str, default: Optional[str]
+) -> Optional[str]:
+    name = name.lower()
+    for assignment in assignments:
+        if assignment.name.lower() == name:
+            return assignment.value
+    return default
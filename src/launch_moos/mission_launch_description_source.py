@@ -1,25 +1,60 @@
-"""Module for the PythonLaunchDescriptionSource class."""
+"""Module for the MOOSMissionFileDescriptionSource class."""
 
-from importlib.machinery import SourceFileLoader
-from importlib.util import module_from_spec
-from importlib.util import spec_from_loader
-from types import ModuleType
-from typing import Text
+from pathlib import Path
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
 
+import launch.logging
+from launch.action import Action
+from launch.actions import RegisterEventHandler
+from launch.event_handlers import OnShutdown
 from launch.launch_description import LaunchDescription
 from launch.launch_description_source import LaunchDescriptionSource
 from launch.some_substitutions_type import SomeSubstitutionsType
 
+from .actions import HotReloadMission
+from .actions import MOOSApp
+from .actions import StaggeredLaunch
+from .cache import ParseCache
+from .community import MOOSCommunity
+from .generated_files import DISK
+from .generated_files import GeneratedFileStore
+from .mission import Mission
+from .nsplug import Preprocessor
+from .preflight import check_mission
+from .stream import BlockEnd
+from .stream import GlobalAssignment
+from .stream import MissionEvent
+from .stream import iter_mission
+from .stream import mission_from_events
+from .transform import iter_mission_actions
+from .transform import mission_to_actions
+from .transform import mission_to_staggered_launch
+
 
 class MOOSMissionFileDescriptionSource(LaunchDescriptionSource):
-    """Encapsulation of a Python launch file, which can be loaded during launch."""
+    """Encapsulation of a MOOS mission file, which can be loaded during launch."""
 
     def __init__(
         self,
         mission_file_path: SomeSubstitutionsType,
+        *,
+        parse_cache: Optional[ParseCache] = None,
+        hot_reload: bool = False,
+        staggered: bool = True,
+        macros: Optional[Mapping[str, str]] = None,
+        preprocessor: Optional[Preprocessor] = None,
+        streaming: bool = False,
+        file_backend: str = DISK,
+        file_store: Optional[GeneratedFileStore] = None,
+        preflight: bool = True,
     ) -> None:
         """
-        Create a PythonLaunchDescriptionSource.
+        Create a MOOSMissionFileDescriptionSource.
 
         The given file path should be to a ``.moos`` mission file.
         The path should probably be absolute, since the current working
@@ -28,50 +63,136 @@ class MOOSMissionFileDescriptionSource(LaunchDescriptionSource):
         The path can be made up of Substitution instances which are expanded
         when :py:meth:`get_launch_description()` is called.
 
+        The mission is parsed once, through ``parse_cache``, and every app run
+        by the ANTLER block gets its configuration from that single parse.
+
         :param mission_file_path: the path to the moos mission file
+        :param parse_cache: cache of parsed missions, defaults to a
+            :class:`launch_moos.cache.ParseCache` in the default cache directory
+        :param hot_reload: watch the mission file and restart the apps whose
+            ProcessConfig block changes, see
+            :class:`launch_moos.actions.HotReloadMission`
+        :param staggered: start MOOSDB first and the other apps one after the
+            other, honouring ``MSBetweenLaunches``, see
+            :class:`launch_moos.actions.StaggeredLaunch`; otherwise every app
+            is started at once
+        :param macros: the nsplug macros defined before the mission file is
+            read, like the ``VAR=value`` arguments of nsplug
+        :param preprocessor: the nsplug-compatible preprocessor the mission file
+            goes through first, share one between the missions of a launch so
+            that files they all include are only read once
+        :param streaming: create the apps while the mission file is read, see
+            :func:`launch_moos.stream.iter_mission`, for very large machine
+            generated missions; the file then bypasses the parse cache and the
+            preprocessor
+        :param file_backend: where the community mission file is generated,
+            ``memory`` keeps it off the disk, see
+            :func:`launch_moos.generated_files.write_generated_file`
+        :param file_store: content addressed store of the generated files on
+            disk, defaults to a :class:`launch_moos.generated_files.GeneratedFileStore`
+            in the default directory, which is cleaned up on shutdown
+        :param preflight: check the mission before any app is spawned, see
+            :func:`launch_moos.preflight.preflight`, the launch fails with a
+            :class:`launch_moos.preflight.PreflightError` listing every error
         """
         super().__init__(None, mission_file_path, "interpreted MOOS mission file")
+        self.__parse_cache = parse_cache or ParseCache()
+        self.__hot_reload = hot_reload
+        self.__staggered = staggered
+        self.__macros = dict(macros or {})
+        self.__preprocessor = preprocessor or Preprocessor()
+        self.__streaming = streaming
+        self.__file_backend = file_backend
+        self.__file_store = file_store
+        self.__preflight = preflight
+        if file_store is None and file_backend == DISK:
+            self.__file_store = GeneratedFileStore()
 
     def _get_launch_description(self, location) -> LaunchDescription:
         """Get the LaunchDescription from location."""
-        return get_launch_description_from_python_launch_file(location)
-
-
-class InvalidPythonLaunchFileError(Exception):
-    """Exception raised when the given Python launch file is not valid."""
-
-    ...
-
-
-def load_python_launch_file_as_module(python_launch_file_path: str) -> ModuleType:
-    """Load a given Python launch file (by path) as a Python module."""
-    loader = SourceFileLoader("python_launch_file", python_launch_file_path)
-    spec = spec_from_loader(loader.name, loader)
-    mod = module_from_spec(spec)
-    loader.exec_module(mod)
-    return mod
-
-
-def get_launch_description_from_python_launch_file(python_launch_file_path: str):
-    """
-    Load a given Python launch file (by path), and return the launch description from it.
-    Python launch files are expected to have a `.py` extension and must provide
-    a function within the module called `generate_launch_description()`.
-    This function is called after loading the module to get the single
-    :class:`launch.LaunchDescription` class from it.
-    The signature of the function should be as follows:
-    .. code-block:: python
-        def generate_launch_description() -> launch.LaunchDescription:
-            ...
-    The Python launch file, as much as possible, should avoid side-effects.
-    Keep in mind that the reason it is being loaded may be just to introspect
-    the launch description and not necessarily to execute the launch itself.
-    """
-    launch_file_module = load_python_launch_file_as_module(python_launch_file_path)
-    if not hasattr(launch_file_module, "generate_launch_description"):
-        raise InvalidPythonLaunchFileError(
-            "launch file at '{}' does not contain the required function '{}'".format(
-                python_launch_file_path, "generate_launch_description()"
+        if self.__streaming:
+            mission, community, apps = self.__stream(location)
+            self.__check(mission)
+        else:
+            text = self.__preprocessor.preprocess_file(location, self.__macros)
+            mission = self.__parse_cache.parse(text.encode())
+            self.__check(mission)
+            community = MOOSCommunity(
+                mission.global_config, self.__file_backend, self.__file_store
+            )
+            apps = mission_to_actions(mission, community)
+
+        entities: List[Action] = list(apps)
+        launcher = None
+        if self.__staggered:
+            launcher = mission_to_staggered_launch(mission, apps)
+            entities = [launcher]
+        if self.__hot_reload:
+            entities.append(
+                self.__hot_reload_mission(location, mission, apps, community, launcher)
             )
+        if self.__file_store is not None:
+            store = self.__file_store
+            entities.insert(
+                0,
+                RegisterEventHandler(
+                    OnShutdown(on_shutdown=lambda event, context: store.close())
+                ),
+            )
+        return LaunchDescription(entities)
+
+    def __hot_reload_mission(
+        self,
+        location: str,
+        mission: Mission,
+        apps: List[MOOSApp],
+        community: MOOSCommunity,
+        launcher: Optional[StaggeredLaunch],
+    ) -> HotReloadMission:
+        """Watch the mission file and the files the preprocessor read for it."""
+        preprocessor = self.__preprocessor
+        mission_file = Path(location).resolve()
+
+        def preprocess(text: str) -> str:
+            # a fresh preprocessor, which reads the included files again
+            fresh = Preprocessor(preprocessor.include_paths, preprocessor.strict)
+            return fresh.preprocess(text, self.__macros, location)
+
+        return HotReloadMission(
+            mission_file=location,
+            apps={run.name: app for run, app in zip(mission.runs, apps)},
+            community=community,
+            preprocess=preprocess,
+            dependencies=[path for path in preprocessor.files if path != mission_file],
+            launcher=launcher,
+        )
+
+    def __check(self, mission: Mission) -> None:
+        """Run the pre-flight checks, before any app is created."""
+        if not self.__preflight:
+            return
+        logger = launch.logging.get_logger(__name__)
+        for problem in check_mission(mission):
+            logger.warning(problem.message)
+
+    def __stream(self, location) -> Tuple[Mission, MOOSCommunity, List[MOOSApp]]:
+        """Create the apps while parsing, keeping only what the launch needs."""
+        skeleton: List[MissionEvent] = []
+
+        def record(events: Iterable[MissionEvent]) -> Iterator[MissionEvent]:
+            for event in events:
+                if isinstance(event, GlobalAssignment) or (
+                    isinstance(event, BlockEnd) and event.block.name == "ANTLER"
+                ):
+                    skeleton.append(event)
+                yield event
+
+        community = MOOSCommunity(
+            file_backend=self.__file_backend, file_store=self.__file_store
         )
-    return getattr(launch_file_module, "generate_launch_description")()
+        events = record(iter_mission(location))
+        apps = {id(run): app for run, app in iter_mission_actions(events, community)}
+        mission = mission_from_events(skeleton)
+        # start the apps in the order of the ANTLER block, as Antler does, the
+        # runs of the recorded block being the ones the apps were created for
+        return mission, community, [apps[id(run)] for run in mission.runs]
@@ -15,8 +15,9 @@
 import os
 import sys
 from io import StringIO
+from pathlib import Path
 
-import em
+from . import tracing
 
 
 MISSION_FILE_TEMPLATE = """@[for (variable_name, variable_value) in global_variables]@
@@ -31,42 +32,126 @@ ProcessConfig = @(process_name)
 }
 """
 
+COMMUNITY_FILE_TEMPLATE = """@[for (variable_name, variable_value) in global_variables]@
+@(variable_name) = @(variable_value)
+@[end for]@
+@[for (process_name, process_variables) in processes]@
+
+ProcessConfig = @(process_name)
+{
+@[for (variable_name, variable_value) in process_variables]@
+  @(variable_name) = @(variable_value)
+@[end for]@
+}
+@[end for]@
+"""
+
 
 def expand_template(template_name, data, output_file, encoding="utf-8"):
-    content = evaluate_template(template_name, data)
+    """Render the template ``template_name`` to ``output_file``.
+
+    The file is left untouched if it already has the rendered contents.
+    Returns whether the file was written.
+    """
+    content = evaluate_template(data, template=template_name)
+    return write_if_changed(output_file, content, encoding=encoding)
+
 
+def write_if_changed(output_file, content, encoding="utf-8"):
+    """Write ``content`` to ``output_file`` unless it already holds it.
+
+    Returns whether the file was written.
+    """
+    output_file = Path(output_file)
     if output_file.exists():
         existing_content = output_file.read_text(encoding=encoding)
         if existing_content == content:
-            return
-    elif output_file.parent:
+            return False
+    else:
         os.makedirs(str(output_file.parent), exist_ok=True)
 
     output_file.write_text(content, encoding=encoding)
+    return True
+
+
+def render_mission_file(global_variables, processes):
+    """Render a mission file without going through a template engine.
+
+    The output is byte for byte what :data:`COMMUNITY_FILE_TEMPLATE` produces,
+    ``processes`` being a list of ``(process_name, process_variables)`` pairs.
+    """
+    parts = [render_global_config(global_variables)]
+    for process_name, process_variables in processes:
+        parts.append(render_process_config(process_name, process_variables))
+    return "".join(parts)
+
+
+def render_global_config(global_variables):
+    """Render the global configuration lines of a mission file."""
+    return "".join(f"{name} = {_str(value)}\n" for name, value in global_variables)
+
 
+def render_process_config(process_name, process_variables):
+    """Render one ProcessConfig block, preceded by an empty line."""
+    lines = "".join(f"  {name} = {_str(value)}\n" for name, value in process_variables)
+    return f"\nProcessConfig = {_str(process_name)}\n{{\n{lines}}}\n"
 
-_interpreter = None
 
+def _str(value):
+    # empy writes nothing for expressions evaluating to None
+    return "" if value is None else str(value)
+
+
+def evaluate_template(data, template=MISSION_FILE_TEMPLATE, use_empy=False):
+    """Render a mission file template.
+
+    The built in templates are rendered directly by :func:`render_mission_file`,
+    empy is only needed for other templates or when ``use_empy`` is set.
+    """
+    with tracing.span("evaluate_template", use_empy=use_empy):
+        return _evaluate_template(data, template, use_empy)
+
+
+def _evaluate_template(data, template, use_empy):
+    if not use_empy:
+        if template is MISSION_FILE_TEMPLATE:
+            return render_mission_file(
+                data["global_variables"],
+                [(data["process_name"], data["process_variables"])],
+            )
+        if template is COMMUNITY_FILE_TEMPLATE:
+            return render_mission_file(data["global_variables"], data["processes"])
+
+    return _evaluate_empy_template(data, template)
+
+
+def evaluate_community_template(data, use_empy=False):
+    """Render the globals once followed by the ProcessConfig block of every app.
+
+    ``data`` holds ``global_variables`` and ``processes``, a list of
+    ``(process_name, process_variables)`` pairs.
+    """
+    return evaluate_template(data, template=COMMUNITY_FILE_TEMPLATE, use_empy=use_empy)
+
+
+def _evaluate_empy_template(data, template):
+    import em
 
-def evaluate_template(data):
-    global _interpreter
     # create copy before manipulating
     data = dict(data)
-    # data['TEMPLATE'] = _evaluate_template
 
     output = StringIO()
+    interpreter = em.Interpreter(
+        output=output,
+        options={
+            em.BUFFERED_OPT: True,
+            em.RAW_OPT: True,
+        },
+    )
     try:
-        _interpreter = em.Interpreter(
-            output=output,
-            options={
-                em.BUFFERED_OPT: True,
-                em.RAW_OPT: True,
-            },
-        )
-
-        _interpreter.invoke("beforeFile", name="moos_mission_file", locals=data)
-        _interpreter.string(MISSION_FILE_TEMPLATE, "moos_mission_file", locals=data)
-        _interpreter.invoke("afterFile")
+        interpreter.invoke("beforeFile", name="moos_mission_file", locals=data)
+        interpreter.string(template, "moos_mission_file", locals=data)
+        interpreter.invoke("afterFile")
 
         return output.getvalue()
     except Exception as e:  # noqa: F841
@@ -76,22 +161,4 @@ def evaluate_template(data):
         )
         raise
     finally:
-        _interpreter.shutdown()
-        _interpreter = None
-
-
-def _evaluate_template(template_name, **kwargs):
-    global _interpreter
-    template_path = os.path.join(os.path.dirname(__file__), template_name)
-    with open(template_path) as h:
-        _interpreter.invoke("beforeInclude", name=template_path, file=h, locals=kwargs)
-        content = h.read()
-    try:
-        _interpreter.string(content, template_path, kwargs)
-    except Exception as e:  # noqa: F841
-        print(
-            f"{e.__class__.__name__} processing template '{template_name}': " f"{e}",
-            file=sys.stderr,
-        )
-        sys.exit(1)
-    _interpreter.invoke("afterInclude")
+        interpreter.shutdown()
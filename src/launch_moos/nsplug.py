@@ -0,0 +1,283 @@
+"""Preprocessing of mission files, compatible with the nsplug tool of MOOS-IvP.
+
+Supported are the ``#include``, ``#define``, ``#ifdef``, ``#ifndef``,
+``#elseifdef``, ``#else`` and ``#endif`` directives, and the ``$(VAR)`` and
+``%(VAR)`` macros, the latter expanding to the upper case value.
+"""
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from . import tracing
+
+
+_directive = re.compile(
+    r"^[ \t]*#(include|define|ifdef|ifndef|elseifdef|else|endif)\b[ \t]*(.*?)[ \t]*$"
+)
+_macro = re.compile(r"([$%])\(([A-Za-z0-9_]+)\)")
+_include_tag = re.compile(r"^(.*?)[ \t]+<([^<>]+)>$")
+_tag_line = re.compile(r"^[ \t]*<([^<>]+)>[ \t]*$")
+
+_CONDITIONALS = ("ifdef", "ifndef", "elseifdef", "else", "endif")
+
+# a tokenized line, the directive name is None for text lines
+_Line = Tuple[Optional[str], str]
+
+_MacroSet = FrozenSet[Tuple[str, str]]
+
+
+class PreprocessError(Exception):
+    """Exception raised when a mission file cannot be preprocessed."""
+
+    ...
+
+
+class Preprocessor:
+    """nsplug-compatible preprocessor, memoizing its work.
+
+    Every file is read and tokenized once for the lifetime of the
+    preprocessor, so keep one for a whole launch, or a whole fleet. The
+    expansion of a file is memoized by the hash of its contents together with
+    the macros defined when it is reached, which includes the macros given on
+    the command line with nsplug.
+    """
+
+    def __init__(
+        self, include_paths: Sequence[Union[str, Path]] = (), strict: bool = False
+    ) -> None:
+        """
+        Create a Preprocessor.
+
+        :param include_paths: directories searched for included files after
+            the directory of the including file
+        :param strict: raise on undefined macros instead of leaving them as is
+        """
+        self.include_paths = [Path(path) for path in include_paths]
+        self.strict = strict
+        self.__files: Dict[Path, Tuple[str, Tuple[_Line, ...]]] = {}
+        self.__expansions: Dict[
+            Tuple[str, Path, Optional[str], _MacroSet], Tuple[str, _MacroSet]
+        ] = {}
+
+    @property
+    def files(self) -> List[Path]:
+        """The files read so far, mission files and the files they include."""
+        return list(self.__files)
+
+    def preprocess_file(
+        self, path: Union[str, Path], macros: Optional[Mapping[str, str]] = None
+    ) -> str:
+        """Expand a mission file.
+
+        Args:
+            path: the mission file.
+            macros: the macros defined before the file is read.
+
+        Returns:
+            The expanded mission file.
+        """
+        with tracing.span("preprocess"):
+            text, _ = self.__expand_file(Path(path).resolve(), None, macros or {}, ())
+        return text
+
+    def preprocess(
+        self,
+        text: str,
+        macros: Optional[Mapping[str, str]] = None,
+        path: Optional[Union[str, Path]] = None,
+    ) -> str:
+        """Expand the contents of a mission file.
+
+        Args:
+            text: the mission file contents.
+            macros: the macros defined before the file is read.
+            path: where the contents come from, relative includes are found
+                next to it, otherwise in the current directory.
+
+        Returns:
+            The expanded mission file.
+        """
+        path = Path(path if path is not None else "<string>").resolve()
+        lines = _tokenize(text)
+        key = (_hash(text), path.parent, None, _freeze(macros or {}))
+        with tracing.span("preprocess"):
+            return self.__expand(key, lines, path, macros or {}, ())[0]
+
+    def __read(self, path: Path) -> Tuple[str, Tuple[_Line, ...]]:
+        entry = self.__files.get(path)
+        if entry is None:
+            try:
+                text = path.read_text()
+            except (OSError, UnicodeDecodeError) as e:
+                raise PreprocessError(f"cannot read '{path}': {e}") from e
+            entry = self.__files[path] = (_hash(text), _tokenize(text))
+        return entry
+
+    def __expand_file(
+        self,
+        path: Path,
+        tag: Optional[str],
+        macros: Mapping[str, str],
+        stack: Tuple[Path, ...],
+    ) -> Tuple[str, _MacroSet]:
+        if path in stack:
+            raise PreprocessError(f"'{path}' includes itself")
+        digest, lines = self.__read(path)
+        if tag is not None:
+            lines = _tagged_section(lines, tag)
+        key = (digest, path.parent, tag, _freeze(macros))
+        return self.__expand(key, lines, path, macros, (*stack, path))
+
+    def __expand(
+        self,
+        key: Tuple[str, Path, Optional[str], _MacroSet],
+        lines: Sequence[_Line],
+        path: Path,
+        macros: Mapping[str, str],
+        stack: Tuple[Path, ...],
+    ) -> Tuple[str, _MacroSet]:
+        expansion = self.__expansions.get(key)
+        if expansion is None:
+            defined = dict(macros)
+            text = self.__expand_lines(lines, path, defined, stack)
+            expansion = self.__expansions[key] = (text, _freeze(defined))
+        return expansion
+
+    def __expand_lines(
+        self,
+        lines: Sequence[_Line],
+        path: Path,
+        macros: Dict[str, str],
+        stack: Tuple[Path, ...],
+    ) -> str:
+        out: List[str] = []
+        # one (active, taken) pair per open #ifdef
+        conditions: List[Tuple[bool, bool]] = []
+        for directive, arg in lines:
+            if directive in _CONDITIONALS:
+                _branch(conditions, directive, arg, macros, path)
+            elif not all(active for active, _ in conditions):
+                continue
+            elif directive is None:
+                out.append(self.__substitute(arg, macros, path))
+            elif directive == "define":
+                name, _, value = arg.partition(" ")
+                macros[name] = self.__substitute(value.strip(), macros, path)
+            else:
+                out.append(self.__include(arg, path, macros, stack))
+        if conditions:
+            raise PreprocessError(f"#ifdef without #endif in '{path}'")
+        return "".join(out)
+
+    def __include(
+        self, arg: str, path: Path, macros: Dict[str, str], stack: Tuple[Path, ...]
+    ) -> str:
+        arg = self.__substitute(arg, macros, path)
+        tag = None
+        tagged = _include_tag.match(arg)
+        if tagged:
+            arg, tag = tagged.groups()
+        name = arg.strip().strip('"')
+
+        for directory in (path.parent, *self.include_paths):
+            candidate = (directory / name).resolve()
+            if candidate.is_file():
+                break
+        else:
+            raise PreprocessError(f"cannot find '{name}' included from '{path}'")
+
+        text, defined = self.__expand_file(candidate, tag, macros, stack)
+        # defines of the included file are visible after the #include
+        macros.clear()
+        macros.update(defined)
+        return text
+
+    def __substitute(self, text: str, macros: Mapping[str, str], path: Path) -> str:
+        if "(" not in text:
+            return text
+
+        def replace(match: "re.Match[str]") -> str:
+            kind, name = match.groups()
+            value = macros.get(name)
+            if value is None:
+                if self.strict:
+                    raise PreprocessError(f"undefined macro '{name}' in '{path}'")
+                return match.group(0)
+            return value.upper() if kind == "%" else value
+
+        return _macro.sub(replace, text)
+
+
+def _tokenize(text: str) -> Tuple[_Line, ...]:
+    lines: List[_Line] = []
+    for line in text.splitlines(keepends=True):
+        match = _directive.match(line.rstrip("\r\n"))
+        if match:
+            lines.append((match.group(1), match.group(2)))
+        else:
+            lines.append((None, line))
+    return tuple(lines)
+
+
+def _tagged_section(lines: Sequence[_Line], tag: str) -> Tuple[_Line, ...]:
+    section: List[_Line] = []
+    inside = False
+    for directive, arg in lines:
+        tag_line = _tag_line.match(arg) if directive is None else None
+        if tag_line:
+            inside = tag_line.group(1) == tag
+        elif inside:
+            section.append((directive, arg))
+    return tuple(section)
+
+
+def _branch(
+    conditions: List[Tuple[bool, bool]],
+    directive: str,
+    arg: str,
+    macros: Mapping[str, str],
+    path: Path,
+) -> None:
+    """Update the stack of open conditions for a conditional directive."""
+    if directive in ("ifdef", "ifndef"):
+        active = all(active for active, _ in conditions)
+        met = _condition(arg, macros) == (directive == "ifdef")
+        conditions.append((active and met, met))
+        return
+
+    if not conditions:
+        raise PreprocessError(f"#{directive} without #ifdef in '{path}'")
+    _, taken = conditions.pop()
+    if directive == "endif":
+        return
+    active = all(active for active, _ in conditions)
+    met = not taken and (directive == "else" or _condition(arg, macros))
+    conditions.append((active and met, taken or met))
+
+
+def _condition(arg: str, macros: Mapping[str, str]) -> bool:
+    """Evaluate ``VAR``, ``VAR value`` and their ``||`` or ``&&`` combinations."""
+    if "||" in arg:
+        return any(_condition(part, macros) for part in arg.split("||"))
+    if "&&" in arg:
+        return all(_condition(part, macros) for part in arg.split("&&"))
+    name, _, value = arg.strip().partition(" ")
+    if not value.strip():
+        return name in macros
+    return macros.get(name) == value.strip()
+
+
+def _freeze(macros: Mapping[str, str]) -> _MacroSet:
+    return frozenset(macros.items())
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
@@ -0,0 +1,233 @@
+"""Batched handling of the output of chatty apps.
+
+An :class:`OutputPipeline` splits the raw output of an app into lines, keeps
+them in a ring buffer per stream and hands them to the logger of the stream in
+one call per batch, instead of decoding and logging every chunk as it arrives.
+Lines beyond the rate limit of the app, or pushed out of a full ring buffer
+before being flushed, are dropped and counted.
+"""
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+from typing import Pattern
+from typing import Sequence
+from typing import Union
+
+
+STDOUT = "stdout"
+STDERR = "stderr"
+STREAMS = (STDOUT, STDERR)
+
+DEFAULT_RING_SIZE = 10000
+
+# seconds between two flushes to the logger
+DEFAULT_FLUSH_INTERVAL = 0.1
+
+# bytes after which output without a newline is buffered as a line anyway
+MAX_LINE_LENGTH = 64 * 1024
+
+
+class OutputMatcher:
+    """A regular expression run on the output lines of an app.
+
+    The callback is called with the stream and the match of every line the
+    pattern matches. With ``contains``, the pattern only runs on the lines
+    holding that text, and not at all on batches without it.
+    """
+
+    __slots__ = ("pattern", "callback", "streams", "contains")
+
+    def __init__(
+        self,
+        pattern: Union[str, Pattern[str]],
+        callback: Callable[[str, "re.Match[str]"], None],
+        *,
+        streams: Sequence[str] = STREAMS,
+        contains: Optional[str] = None,
+    ) -> None:
+        """
+        Create an OutputMatcher.
+
+        :param pattern: the regular expression, searched in every line
+        :param callback: called with the stream and the match
+        :param streams: the streams the pattern runs on
+        :param contains: text a line must hold for the pattern to run on it
+        """
+        self.pattern = re.compile(pattern)
+        self.callback = callback
+        self.streams = tuple(streams)
+        self.contains = contains
+
+    def run(self, stream: str, text: str) -> None:
+        """Run the pattern on the lines of a batch of output."""
+        if stream not in self.streams:
+            return
+        if self.contains is not None and self.contains not in text:
+            return
+        for line in text.split("\n"):
+            if self.contains is not None and self.contains not in line:
+                continue
+            match = self.pattern.search(line)
+            if match is not None:
+                self.callback(stream, match)
+
+
+class OutputBatching:
+    """Settings of the batched output of an app, see :class:`OutputPipeline`."""
+
+    __slots__ = ("ring_size", "flush_interval", "max_lines_per_second", "matchers")
+
+    def __init__(
+        self,
+        *,
+        ring_size: int = DEFAULT_RING_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_lines_per_second: Optional[float] = None,
+        matchers: Sequence[OutputMatcher] = (),
+    ) -> None:
+        """
+        Create OutputBatching settings.
+
+        :param ring_size: lines kept per stream between two flushes
+        :param flush_interval: seconds between two flushes to the logger
+        :param max_lines_per_second: lines accepted per second, with bursts of
+            up to a second worth of lines, unlimited if None
+        :param matchers: the regular expressions run on the lines
+        """
+        if ring_size < 1:
+            raise ValueError("ring_size must be at least 1")
+        self.ring_size = ring_size
+        self.flush_interval = flush_interval
+        self.max_lines_per_second = max_lines_per_second
+        self.matchers = tuple(matchers)
+
+
+class OutputPipeline:
+    """Line buffered, rate limited and batched output of one app."""
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        batching: Optional[OutputBatching] = None,
+        clock: Callable[[], float] = time.monotonic,
+        *,
+        stream_loggers: Optional[Mapping[str, logging.Logger]] = None,
+        prefix: str = "",
+    ) -> None:
+        """
+        Create an OutputPipeline.
+
+        :param logger: the logger dropped lines are reported to, and the output
+            lines are flushed to unless ``stream_loggers`` are given
+        :param batching: the settings, defaults to :class:`OutputBatching`
+        :param clock: the time source of the rate limit
+        :param stream_loggers: the logger of each stream, like the loggers of
+            :func:`launch.logging.get_output_loggers`, which honour the
+            ``output`` setting of the process
+        :param prefix: text every line starts with once flushed
+        """
+        self.logger = logger
+        self.stream_loggers = {
+            stream: (stream_loggers or {}).get(stream, logger) for stream in STREAMS
+        }
+        self.prefix = prefix
+        self.batching = batching or OutputBatching()
+        self.dropped: Dict[str, int] = {stream: 0 for stream in STREAMS}
+        self.__clock = clock
+        self.__lines: Dict[str, Deque[bytes]] = {
+            stream: deque(maxlen=self.batching.ring_size) for stream in STREAMS
+        }
+        self.__partial: Dict[str, bytes] = {stream: b"" for stream in STREAMS}
+        self.__reported: Dict[str, int] = dict(self.dropped)
+        self.__tokens = self.batching.max_lines_per_second or 0.0
+        self.__refilled_at = clock()
+        self.__timer: Optional[asyncio.TimerHandle] = None
+
+    def feed(self, stream: str, data: bytes) -> None:
+        """Add raw output of the app, complete lines are buffered."""
+        lines = (self.__partial[stream] + data).split(b"\n")
+        partial = lines.pop()
+        if len(partial) > MAX_LINE_LENGTH:
+            lines.append(partial)
+            partial = b""
+        self.__partial[stream] = partial
+        if lines:
+            self.__buffer(stream, lines)
+
+    def __buffer(self, stream: str, lines: Sequence[bytes]) -> None:
+        accepted = self.__admit(len(lines))
+        if accepted < len(lines):
+            self.dropped[stream] += len(lines) - accepted
+            lines = lines[:accepted]
+
+        ring = self.__lines[stream]
+        overflow = len(ring) + len(lines) - self.batching.ring_size
+        if overflow > 0:
+            self.dropped[stream] += overflow
+        ring.extend(lines)
+
+    def __admit(self, count: int) -> int:
+        rate = self.batching.max_lines_per_second
+        if rate is None:
+            return count
+        now = self.__clock()
+        self.__tokens = min(rate, self.__tokens + (now - self.__refilled_at) * rate)
+        self.__refilled_at = now
+        accepted = min(count, int(self.__tokens))
+        self.__tokens -= accepted
+        return accepted
+
+    def flush(self) -> int:
+        """Hand the buffered lines to the loggers, one call per stream.
+
+        Returns:
+            The number of lines flushed.
+        """
+        flushed = 0
+        for stream in STREAMS:
+            ring = self.__lines[stream]
+            if ring:
+                text = b"\n".join(ring).decode(errors="replace")
+                flushed += len(ring)
+                ring.clear()
+                for matcher in self.batching.matchers:
+                    matcher.run(stream, text)
+                if self.prefix:
+                    text = self.prefix + text.replace("\n", "\n" + self.prefix)
+                self.stream_loggers[stream].info(text)
+
+            dropped = self.dropped[stream] - self.__reported[stream]
+            if dropped:
+                self.__reported[stream] = self.dropped[stream]
+                self.logger.warning(f"dropped {dropped} lines of {stream}")
+        return flushed
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Flush every ``flush_interval`` seconds until stopped, if not already."""
+        if self.__timer is not None:
+            return
+
+        def flush() -> None:
+            self.flush()
+            self.__timer = loop.call_later(self.batching.flush_interval, flush)
+
+        self.__timer = loop.call_later(self.batching.flush_interval, flush)
+
+    def stop(self) -> None:
+        """Stop flushing periodically, flushing everything left, once the app exits."""
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        for stream in STREAMS:
+            partial = self.__partial[stream]
+            if partial:
+                self.__partial[stream] = b""
+                self.__buffer(stream, [partial])
+        self.flush()
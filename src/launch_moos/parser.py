@@ -1,56 +1,163 @@
-import pyparsing as pp
+"""pyparsing grammar of MOOS mission files.
 
+The grammar is built the first time it is used, not when this module is
+imported, and pyparsing is only imported then. Its elements, like
+``moos_file`` or ``processconfig``, are attributes of this module all the
+same.
 
-pp.ParserElement.set_default_whitespace_chars(" \t")
-new_line = pp.Suppress("\n")
-comment = pp.Suppress("//" + pp.CharsNotIn("\n"))
-comment_line = comment + new_line
-whitespace = pp.ZeroOrMore(pp.Literal(" ")).suppress()
+Newlines are significant in mission files, so the elements only skip spaces
+and tabs. The default whitespace of pyparsing is left as it is for every
+other user of pyparsing: it is only swapped while the elements are created.
+"""
+import threading
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Optional
 
-variable = pp.Word(pp.alphas + "_")("name")
-identifier_name = pp.Word(pp.alphanums + ".-_")
-# TODO - this is a mess, define all permitted values properly
-value_anything = whitespace + (
-    pp.SkipTo(comment, include=True, failOn=new_line)("value")
-    | pp.SkipTo(pp.Literal("\n"))("value")
-)
+from . import tokenizer
 
-assign_statement = variable("name") + pp.Suppress("=") + identifier_name("value")
-assign_statement_line = pp.Group(
-    variable + pp.Suppress("=") + value_anything + new_line
-)
 
-global_section = pp.ZeroOrMore(comment_line | assign_statement_line | new_line)
+if TYPE_CHECKING:
+    import pyparsing as pp
 
-params = pp.ZeroOrMore(
-    pp.Group((assign_statement + pp.Suppress(",")) ^ assign_statement)
-)
-moosname = "~" + identifier_name("moosname")
-process_config_run_line = (
-    pp.CaselessKeyword("Run")
-    + pp.Suppress("=")
-    + identifier_name("executable")
-    + pp.Suppress("@")
-    + params("params")
-    + pp.Opt(moosname)
-    + new_line
-)
 
-process_config_section = pp.ZeroOrMore(
-    comment_line | pp.Group(process_config_run_line) | assign_statement_line | new_line
-)
-processconfig = (
-    pp.CaselessKeyword("processconfig")
-    + pp.Suppress("=")
-    + identifier_name("processconfig_name")
-    + new_line
-    + pp.Suppress("{")
-    + new_line
-    + process_config_section("config")
-    + pp.Suppress("}")
-    + new_line
-)
+# bump whenever the structure of the parse results changes, invalidates caches
+PARSER_VERSION = 1
+PARSER_BACKENDS = ("pyparsing", "tokenizer")
 
-moos_file = pp.ZeroOrMore(
-    pp.Group(processconfig) | comment_line | assign_statement_line | new_line
+# the elements of the grammar, see grammar()
+GRAMMAR_ELEMENTS = (
+    "new_line",
+    "comment",
+    "comment_line",
+    "whitespace",
+    "variable",
+    "identifier_name",
+    "value_anything",
+    "assign_statement",
+    "assign_statement_line",
+    "global_section",
+    "params",
+    "moosname",
+    "process_config_run_line",
+    "process_config_section",
+    "processconfig",
+    "moos_file",
 )
+
+_grammar: Optional[Dict[str, Any]] = None
+_grammar_lock = threading.Lock()
+
+
+def grammar() -> Dict[str, "pp.ParserElement"]:
+    """Return the elements of the grammar by name, built on first use.
+
+    Returns:
+        The elements listed in :data:`GRAMMAR_ELEMENTS`.
+    """
+    global _grammar
+    if _grammar is None:
+        with _grammar_lock:
+            if _grammar is None:
+                _grammar = _build_grammar()
+    return _grammar
+
+
+def _build_grammar() -> Dict[str, Any]:
+    import pyparsing as pp
+
+    default_whitespace = pp.ParserElement.DEFAULT_WHITE_CHARS
+    pp.ParserElement.set_default_whitespace_chars(" \t")
+    try:
+        new_line = pp.Suppress("\n")
+        comment = pp.Suppress("//" + pp.CharsNotIn("\n"))
+        comment_line = comment + new_line
+        whitespace = pp.ZeroOrMore(pp.Literal(" ")).suppress()
+
+        variable = pp.Word(pp.alphas + "_", pp.alphanums + "_[]+")("name")
+        identifier_name = pp.Word(pp.alphanums + ".-_")
+        # TODO - this is a mess, define all permitted values properly
+        value_anything = whitespace + (
+            pp.SkipTo(comment, include=True, fail_on=new_line)("value")
+            | pp.SkipTo(pp.Literal("\n"))("value")
+        )
+
+        assign_statement = (
+            variable("name") + pp.Suppress("=") + identifier_name("value")
+        )
+        assign_statement_line = pp.Group(
+            variable + pp.Suppress("=") + value_anything + new_line
+        )
+
+        global_section = pp.ZeroOrMore(comment_line | assign_statement_line | new_line)
+
+        params = pp.ZeroOrMore(
+            pp.Group((assign_statement + pp.Suppress(",")) ^ assign_statement)
+        )
+        moosname = "~" + identifier_name("moosname")
+        process_config_run_line = (
+            pp.CaselessKeyword("Run")
+            + pp.Suppress("=")
+            + identifier_name("executable")
+            + pp.Suppress("@")
+            + params("params")
+            + pp.Opt(moosname)
+            + new_line
+        )
+
+        process_config_section = pp.ZeroOrMore(
+            comment_line
+            | pp.Group(process_config_run_line)
+            | assign_statement_line
+            | new_line
+        )
+        processconfig = (
+            pp.CaselessKeyword("processconfig")
+            + pp.Suppress("=")
+            + identifier_name("processconfig_name")
+            + new_line
+            + pp.Suppress("{")
+            + new_line
+            + process_config_section("config")
+            + pp.Suppress("}")
+            + new_line
+        )
+
+        moos_file = pp.ZeroOrMore(
+            pp.Group(processconfig) | comment_line | assign_statement_line | new_line
+        )
+    finally:
+        pp.ParserElement.set_default_whitespace_chars(default_whitespace)
+
+    elements = locals()
+    return {name: elements[name] for name in GRAMMAR_ELEMENTS}
+
+
+def __getattr__(name: str) -> Any:
+    """Return the elements of the grammar, see grammar()."""
+    if name in GRAMMAR_ELEMENTS:
+        return grammar()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def parse_mission(text: str, backend: str = "pyparsing") -> "pp.ParseResults":
+    """Parse the contents of a MOOS mission file.
+
+    Args:
+        text: the mission file contents.
+        backend: ``"pyparsing"`` to use the grammar in this module or
+            ``"tokenizer"`` to use the much faster, line oriented tokenizer in
+            :mod:`launch_moos.tokenizer`. Both produce the same results.
+
+    Returns:
+        The parsed mission.
+
+    Raises:
+        ValueError: if ``backend`` is not one of :data:`PARSER_BACKENDS`.
+    """
+    if backend == "pyparsing":
+        return grammar()["moos_file"].parse_string(text, parse_all=True)
+    if backend == "tokenizer":
+        return tokenizer.parse_string(text)
+    raise ValueError(f"unknown parser backend '{backend}'")
@@ -0,0 +1,203 @@
+"""What launching a mission runs, worked out without the launch machinery.
+
+The command line of every app and the community mission file they share are
+resolved from the parsed mission alone, the way
+:func:`launch_moos.transform.mission_to_actions` builds the actions, so that
+``launch_moos run --dry-run`` can show them without importing ``launch``.
+"""
+import shlex
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .mission import AntlerRun
+from .mission import Assignment
+from .mission import Mission
+from .mission import ProcessConfig
+from .moosfile_generator import render_mission_file
+from .scheduling import Scheduling
+from .scheduling import without_scheduling_keys
+
+
+# command prefix used for apps Antler would start in a new console window
+NEW_CONSOLE_PREFIX = "xterm -e"
+
+# stands for the path of the generated mission file, unknown until it is written
+MISSION_FILE_PLACEHOLDER = "<mission file>"
+
+
+class InvalidMissionFileError(Exception):
+    """Exception raised when a mission file cannot be translated to launch actions."""
+
+    ...
+
+
+class AppPlan:
+    """An app of a launch plan, see :func:`plan_mission`."""
+
+    __slots__ = ("name", "cmd", "config")
+
+    def __init__(
+        self, name: str, cmd: Sequence[str], config: Sequence[Assignment]
+    ) -> None:
+        """
+        Create an AppPlan.
+
+        :param name: the name the app registers with
+        :param cmd: the command line the app is spawned with, prefixes included
+        :param config: the ProcessConfig block generated for the app
+        """
+        self.name = name
+        self.cmd = list(cmd)
+        self.config = list(config)
+
+    @property
+    def command_line(self) -> str:
+        """The command line, quoted for a shell."""
+        return " ".join(shlex.quote(arg) for arg in self.cmd)
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"AppPlan({self.name!r}, {self.cmd!r}, {self.config!r})"
+
+
+class LaunchPlan:
+    """The apps a mission launches and the mission file they share."""
+
+    __slots__ = ("apps", "mission_file")
+
+    def __init__(self, apps: Sequence[AppPlan], mission_file: str) -> None:
+        """
+        Create a LaunchPlan.
+
+        :param apps: the apps, in the order they are started
+        :param mission_file: the contents of the generated community file
+        """
+        self.apps = list(apps)
+        self.mission_file = mission_file
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"LaunchPlan({self.apps!r}, {self.mission_file!r})"
+
+
+def extra_process_params(statement: AntlerRun, mission: Mission) -> List[str]:
+    """Resolve the ``ExtraProcessParams`` of a ``Run =`` line.
+
+    As with Antler, the parameter names another key of the ANTLER block whose
+    value is a comma separated list of extra command line arguments.
+    """
+    params_name = statement.param("ExtraProcessParams")
+    if params_name is None:
+        return []
+
+    antler = mission.antler
+    params = antler.get(params_name) if antler is not None else None
+    if params is None:
+        raise InvalidMissionFileError(
+            "ExtraProcessParams '{}' of '{}' is not set in the ANTLER block".format(
+                params_name, statement.name
+            )
+        )
+    return [param.strip() for param in params.split(",") if param.strip()]
+
+
+def app_prefix(statement: AntlerRun) -> Optional[str]:
+    """Return the command prefix of a ``Run =`` line, for ``NewConsole``."""
+    if (statement.param("NewConsole") or "false").lower() == "true":
+        return NEW_CONSOLE_PREFIX
+    return None
+
+
+def app_scheduling(
+    statement: AntlerRun, block: Optional[ProcessConfig]
+) -> Optional[Scheduling]:
+    """Read the scheduling of an app from its ProcessConfig block.
+
+    Args:
+        statement: the ``Run =`` line of the app.
+        block: the ProcessConfig block of the app, None if it has none.
+
+    Returns:
+        The scheduling, None if the block sets none.
+
+    Raises:
+        InvalidMissionFileError: if a scheduling key is invalid.
+    """
+    try:
+        return Scheduling.from_config(block.config if block is not None else ())
+    except ValueError as e:
+        raise InvalidMissionFileError(
+            "invalid scheduling of '{}': {}".format(statement.name, e)
+        ) from e
+
+
+def antler_staggering(mission: Mission) -> Tuple[int, str, int]:
+    """Read how Antler staggers the launch of the apps of a mission.
+
+    ``MSBetweenLaunches`` of the ANTLER block sets the delay between launches,
+    and the global ``ServerHost`` and ``ServerPort`` are where MOOSDB is waited
+    for.
+
+    Args:
+        mission: the parsed mission.
+
+    Returns:
+        The delay in milliseconds, the MOOSDB host and port.
+
+    Raises:
+        InvalidMissionFileError: if the delay or port is not a number.
+    """
+    antler = mission.antler
+    ms_between_launches = antler.get("MSBetweenLaunches") if antler else None
+    server_port = mission.get_global("ServerPort") or "9000"
+    try:
+        delay = int(ms_between_launches or 0)
+        port = int(server_port)
+    except ValueError as e:
+        raise InvalidMissionFileError(
+            "invalid MSBetweenLaunches or ServerPort: {}".format(e)
+        ) from e
+    return delay, mission.get_global("ServerHost") or "localhost", port
+
+
+def plan_mission(
+    mission: Mission, mission_file: str = MISSION_FILE_PLACEHOLDER
+) -> LaunchPlan:
+    """Resolve what launching a mission runs, without running anything.
+
+    Args:
+        mission: the parsed mission.
+        mission_file: the path shown for the generated mission file.
+
+    Returns:
+        The launch plan.
+
+    Raises:
+        InvalidMissionFileError: if the mission cannot be launched.
+    """
+    if mission.antler is None:
+        raise InvalidMissionFileError("mission file has no ANTLER block")
+
+    apps = []
+    for run in mission.runs:
+        block = mission.process_config(run.name)
+        scheduling = app_scheduling(run, block)
+        cmd: List[str] = []
+        if scheduling is not None:
+            cmd += shlex.split(scheduling.prefix())
+        prefix = app_prefix(run)
+        if prefix is not None:
+            cmd += shlex.split(prefix)
+        cmd += [run.executable, mission_file]
+        if run.moosname:
+            cmd.append(run.moosname)
+        cmd += extra_process_params(run, mission)
+        config = without_scheduling_keys(block.config if block is not None else ())
+        apps.append(AppPlan(run.moosname or run.executable, cmd, config))
+
+    content = render_mission_file(
+        mission.global_config, [(app.name, app.config) for app in apps]
+    )
+    return LaunchPlan(apps, content)
@@ -0,0 +1,200 @@
+"""Checks of a parsed mission run before any of its apps is spawned.
+
+A single pass over the mission finds every problem that would otherwise
+only show once the community started and an app exited: a ``ServerPort``
+already in use, an executable that is not on ``PATH``, two ``Run =`` lines
+registering the same name, an invalid ANTLER parameter or scheduling key,
+and ``ProcessConfig`` blocks no ``Run =`` line uses. All the problems are
+reported together.
+"""
+import errno
+import os
+import shutil
+import socket
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from .mission import Mission
+from .plan import InvalidMissionFileError
+from .plan import app_scheduling
+from .plan import extra_process_params
+
+
+ERROR = "error"
+WARNING = "warning"
+
+# blocks read by the launch itself rather than by an app
+_LAUNCH_BLOCKS = frozenset(["ANTLER"])
+
+_executables: Dict[Tuple[str, Optional[str]], Optional[str]] = {}
+
+
+class Problem:
+    """A problem found in a mission, errors prevent it from being launched."""
+
+    __slots__ = ("severity", "message")
+
+    def __init__(self, severity: str, message: str) -> None:
+        """
+        Create a Problem.
+
+        :param severity: ``error`` or ``warning``
+        :param message: what is wrong
+        """
+        self.severity = severity
+        self.message = message
+
+    def __str__(self) -> str:
+        """Return the severity and the message."""
+        return f"{self.severity}: {self.message}"
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by value."""
+        if not isinstance(other, Problem):
+            return NotImplemented
+        return self.severity == other.severity and self.message == other.message
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        return f"Problem({self.severity!r}, {self.message!r})"
+
+
+class PreflightError(InvalidMissionFileError):
+    """Exception raised when the pre-flight checks of a mission find errors."""
+
+    def __init__(self, problems: Sequence[Problem]) -> None:
+        """
+        Create a PreflightError.
+
+        :param problems: every problem found, warnings included
+        """
+        self.problems = list(problems)
+        super().__init__(
+            "mission cannot be launched:\n"
+            + "\n".join(f"  {problem}" for problem in self.problems)
+        )
+
+
+def find_executable(name: str) -> Optional[str]:
+    """Look an executable up on ``PATH``, remembering the result.
+
+    The lookup is cached by name and ``PATH``, so missions sharing apps,
+    like those of a fleet, look every app up once.
+
+    Args:
+        name: the executable.
+
+    Returns:
+        The path of the executable, None if it is not found.
+    """
+    path = os.environ.get("PATH")
+    key = (name, path)
+    if key not in _executables:
+        _executables[key] = shutil.which(name, path=path)
+    return _executables[key]
+
+
+def clear_executable_cache() -> None:
+    """Forget the executables looked up, after installing apps."""
+    _executables.clear()
+
+
+def preflight(
+    mission: Mission, check_port: bool = True, check_executables: bool = True
+) -> List[Problem]:
+    """Find the problems that would break the launch of a mission.
+
+    Args:
+        mission: the parsed mission.
+        check_port: check that ``ServerPort`` is free on ``ServerHost``.
+        check_executables: check that every app is found on ``PATH``.
+
+    Returns:
+        The problems, errors first.
+    """
+    problems: List[Problem] = []
+    if mission.antler is None:
+        problems.append(Problem(ERROR, "mission file has no ANTLER block"))
+
+    names: Dict[str, int] = {}
+    for index, run in enumerate(mission.runs):
+        if run.name in names:
+            problems.append(
+                Problem(
+                    ERROR,
+                    "'{}' is run twice, by Run lines {} and {}, give one a "
+                    "different ~ alias".format(
+                        run.name, names[run.name] + 1, index + 1
+                    ),
+                )
+            )
+        names.setdefault(run.name, index)
+
+        if check_executables and find_executable(run.executable) is None:
+            problems.append(Problem(ERROR, f"'{run.executable}' is not on PATH"))
+
+        try:
+            extra_process_params(run, mission)
+            app_scheduling(run, mission.process_config(run.name))
+        except InvalidMissionFileError as e:
+            problems.append(Problem(ERROR, str(e)))
+
+    if check_port:
+        problems += _check_port(mission)
+
+    for block in mission.process_configs:
+        if block.name not in names and block.name not in _LAUNCH_BLOCKS:
+            problems.append(
+                Problem(WARNING, f"ProcessConfig '{block.name}' is not run")
+            )
+
+    return sorted(problems, key=lambda problem: problem.severity != ERROR)
+
+
+def check_mission(
+    mission: Mission, check_port: bool = True, check_executables: bool = True
+) -> List[Problem]:
+    """Run the pre-flight checks of a mission, see :func:`preflight`.
+
+    Args:
+        mission: the parsed mission.
+        check_port: check that ``ServerPort`` is free on ``ServerHost``.
+        check_executables: check that every app is found on ``PATH``.
+
+    Returns:
+        The warnings.
+
+    Raises:
+        PreflightError: if an error is found, with every problem found.
+    """
+    problems = preflight(mission, check_port, check_executables)
+    if any(problem.severity == ERROR for problem in problems):
+        raise PreflightError(problems)
+    return problems
+
+
+def _check_port(mission: Mission) -> List[Problem]:
+    host = mission.get_global("ServerHost") or "localhost"
+    server_port = mission.get_global("ServerPort") or "9000"
+    try:
+        port = int(server_port)
+    except ValueError:
+        return [Problem(ERROR, f"ServerPort '{server_port}' is not a number")]
+    if not 0 <= port <= 65535:
+        return [Problem(ERROR, f"ServerPort {port} is not in 0-65535")]
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        # as MOOSDB does, so that connections in TIME_WAIT do not count
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            s.bind((host, port))
+        except OSError as e:
+            if e.errno == errno.EADDRINUSE:
+                return [Problem(ERROR, f"ServerPort {port} is in use on {host}")]
+            if e.errno in (errno.EACCES, errno.EPERM):
+                return [Problem(ERROR, f"ServerPort {port} needs privileges")]
+            # not an address of this machine, MOOSDB runs elsewhere
+    return []
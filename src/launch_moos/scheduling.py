@@ -0,0 +1,355 @@
+"""CPU affinity, priority and cgroup placement of apps.
+
+The settings are applied at spawn time by prefixing the command of the app
+with this module run as a script, which applies them to itself and then
+executes the app. The module only uses the standard library, so that the
+script starts quickly without importing the package.
+"""
+import argparse
+import ctypes
+import os
+import platform
+import shlex
+import sys
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import FrozenSet
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# ProcessConfig keys holding the scheduling of an app, by Scheduling argument
+PROCESS_CONFIG_KEYS = {
+    "cpus": "CPUAffinity",
+    "nice": "Nice",
+    "ionice": "IONice",
+    "fifo_priority": "SchedFIFO",
+    "cgroup": "CGroup",
+    "cpu_max": "CGroupCPUMax",
+    "memory_max": "CGroupMemoryMax",
+}
+
+# launch file attributes of the moosapp action, by Scheduling argument
+LAUNCH_ATTRIBUTES = {
+    "cpus": "cpu_affinity",
+    "nice": "nice",
+    "ionice": "ionice",
+    "fifo_priority": "sched_fifo",
+    "cgroup": "cgroup",
+    "cpu_max": "cgroup_cpu_max",
+    "memory_max": "cgroup_memory_max",
+}
+
+IONICE_CLASSES = {"none": 0, "realtime": 1, "best-effort": 2, "idle": 3}
+
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+_SYS_IOPRIO_SET = {
+    "x86_64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "armv7l": 314,
+    "armv6l": 314,
+}
+
+# a (name, value) pair or an Assignment
+_Line = Any
+
+_MEMORY_UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+class Scheduling:
+    """Where and at which priority an app runs.
+
+    Every setting is optional, unset ones are inherited from the launch.
+    """
+
+    __slots__ = (
+        "cpus",
+        "nice",
+        "ionice",
+        "fifo_priority",
+        "cgroup",
+        "cpu_max",
+        "memory_max",
+    )
+
+    def __init__(
+        self,
+        *,
+        cpus: Optional[Union[str, Iterable[int]]] = None,
+        nice: Optional[Union[str, int]] = None,
+        ionice: Optional[str] = None,
+        fifo_priority: Optional[Union[str, int]] = None,
+        cgroup: Optional[str] = None,
+        cpu_max: Optional[str] = None,
+        memory_max: Optional[Union[str, int]] = None,
+    ) -> None:
+        """
+        Create a Scheduling.
+
+        :param cpus: the CPUs the app may run on, as a set or a list like
+            ``0,2-3``
+        :param nice: the nice level, from -20 to 19
+        :param ionice: the IO scheduling class, ``realtime``, ``best-effort``
+            or ``idle``, with an optional level from 0 to 7 like
+            ``best-effort:2``
+        :param fifo_priority: run with the SCHED_FIFO policy at this
+            priority, from 1 to 99
+        :param cgroup: the cgroup v2 to run in, relative to the cgroup root,
+            created if needed, like ``launch_moos.slice/pMarinePID``
+        :param cpu_max: the CPU limit of the cgroup, a percentage of one CPU
+            like ``50%`` or a ``cpu.max`` value like ``50000 100000``
+        :param memory_max: the memory limit of the cgroup in bytes, with an
+            optional K, M or G suffix
+
+        :raises ValueError: if a setting is invalid
+        """
+        self.cpus = parse_cpu_list(cpus) if isinstance(cpus, str) else _set(cpus)
+        self.nice = _int(nice, "nice", -20, 19)
+        self.ionice = _parse_ionice(ionice) if ionice is not None else None
+        self.fifo_priority = _int(fifo_priority, "SCHED_FIFO priority", 1, 99)
+        self.cgroup = cgroup.strip("/") if cgroup else None
+        self.cpu_max = _parse_cpu_max(cpu_max) if cpu_max is not None else None
+        self.memory_max = _parse_memory(memory_max) if memory_max is not None else None
+        if self.cgroup is None and (self.cpu_max or self.memory_max):
+            raise ValueError("cgroup limits need a cgroup")
+
+    @classmethod
+    def from_config(cls, config: Iterable[_Line]) -> Optional["Scheduling"]:
+        """Read the scheduling keys of a ProcessConfig block, see PROCESS_CONFIG_KEYS.
+
+        Args:
+            config: the lines of the block.
+
+        Returns:
+            The scheduling, None if the block sets none of the keys.
+        """
+        arguments = {
+            name.lower(): argument for argument, name in PROCESS_CONFIG_KEYS.items()
+        }
+        kwargs = {}
+        for name, value in config:
+            argument = arguments.get(str(name).lower())
+            if argument is not None and argument not in kwargs:
+                kwargs[argument] = str(value).strip()
+        return cls(**kwargs) if kwargs else None
+
+    def arguments(self) -> List[str]:
+        """Return the command line arguments of the script applying the settings."""
+        args = []
+        if self.cgroup is not None:
+            args += ["--cgroup", self.cgroup]
+        if self.cpus is not None:
+            args += ["--cpus", ",".join(str(cpu) for cpu in sorted(self.cpus))]
+        if self.nice is not None:
+            args += ["--nice", str(self.nice)]
+        if self.ionice is not None:
+            args += ["--ionice", "{}:{}".format(*self.ionice)]
+        if self.fifo_priority is not None:
+            args += ["--fifo", str(self.fifo_priority)]
+        return args
+
+    def prefix(self) -> str:
+        """Return the command prefix applying the settings to the app."""
+        # isolated, so the modules next to this one do not shadow the stdlib
+        script = os.path.abspath(__file__)
+        command = [sys.executable, "-I", "-S", script, *self.arguments()]
+        return " ".join(shlex.quote(arg) for arg in command) + " --"
+
+    def prepare_cgroup(self) -> None:
+        """Create the cgroup of the app and set its limits, before spawning it.
+
+        Raises:
+            OSError: if the cgroup cannot be created or configured, which
+                needs the cgroup tree to be delegated to the user.
+        """
+        if self.cgroup is None:
+            return
+        path = CGROUP_ROOT / self.cgroup
+        path.mkdir(parents=True, exist_ok=True)
+        if self.cpu_max is not None:
+            (path / "cpu.max").write_text(self.cpu_max)
+        if self.memory_max is not None:
+            (path / "memory.max").write_text(str(self.memory_max))
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by value."""
+        if not isinstance(other, Scheduling):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        values = ", ".join(
+            f"{slot}={getattr(self, slot)!r}"
+            for slot in self.__slots__
+            if getattr(self, slot) is not None
+        )
+        return f"Scheduling({values})"
+
+
+def without_scheduling_keys(config: Iterable[_Line]) -> List[_Line]:
+    """Return the lines of a ProcessConfig block without the scheduling keys."""
+    names = {name.lower() for name in PROCESS_CONFIG_KEYS.values()}
+    lines = []
+    for line in config:
+        name, _ = line
+        if str(name).lower() not in names:
+            lines.append(line)
+    return lines
+
+
+def parse_cpu_list(cpus: str) -> FrozenSet[int]:
+    """Parse a CPU list like ``0,2-3``.
+
+    Args:
+        cpus: the CPU list.
+
+    Returns:
+        The CPU numbers.
+
+    Raises:
+        ValueError: if the list is invalid.
+    """
+    result = set()
+    for part in cpus.split(","):
+        first, _, last = part.strip().partition("-")
+        try:
+            result.update(range(int(first), int(last or first) + 1))
+        except ValueError:
+            raise ValueError(f"invalid CPU list '{cpus}'") from None
+    if not result:
+        raise ValueError(f"invalid CPU list '{cpus}'")
+    return frozenset(result)
+
+
+def _set(cpus: Optional[Iterable[int]]) -> Optional[FrozenSet[int]]:
+    return frozenset(cpus) if cpus is not None else None
+
+
+def _int(
+    value: Optional[Union[str, int]], name: str, low: int, high: int
+) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"invalid {name} '{value}'") from None
+    if not low <= number <= high:
+        raise ValueError(f"{name} must be from {low} to {high}, not {number}")
+    return number
+
+
+def _parse_ionice(ionice: str) -> Tuple[str, int]:
+    name, _, level = ionice.strip().lower().partition(":")
+    if name not in IONICE_CLASSES:
+        raise ValueError(
+            "invalid ionice class '{}', expected one of {}".format(
+                name, ", ".join(IONICE_CLASSES)
+            )
+        )
+    return name, _int(level or 4, "ionice level", 0, 7) or 0
+
+
+def _parse_cpu_max(cpu_max: str) -> str:
+    cpu_max = cpu_max.strip()
+    if cpu_max.endswith("%"):
+        try:
+            percent = float(cpu_max[:-1])
+        except ValueError:
+            raise ValueError(f"invalid CPU limit '{cpu_max}'") from None
+        return f"{int(percent * 1000)} 100000"
+    quota, _, period = cpu_max.partition(" ")
+    if not (quota == "max" or quota.isdigit()) or not (period or "1").isdigit():
+        raise ValueError(f"invalid CPU limit '{cpu_max}'")
+    return cpu_max
+
+
+def _parse_memory(memory: Union[str, int]) -> int:
+    text = str(memory).strip().upper()
+    factor = _MEMORY_UNITS.get(text[-1:], 1)
+    if factor != 1:
+        text = text[:-1]
+    try:
+        return int(text) * factor
+    except ValueError:
+        raise ValueError(f"invalid memory limit '{memory}'") from None
+
+
+def _set_ionice(ionice: str) -> None:
+    name, _, level = ionice.partition(":")
+    number = _SYS_IOPRIO_SET.get(platform.machine())
+    if number is None:
+        raise OSError(f"ioprio_set is unknown on {platform.machine()}")
+    libc = ctypes.CDLL(None, use_errno=True)
+    priority = IONICE_CLASSES[name] << _IOPRIO_CLASS_SHIFT | int(level)
+    if libc.syscall(number, _IOPRIO_WHO_PROCESS, 0, priority) < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def _steps(args: argparse.Namespace) -> List[Tuple[str, object, Callable[[], object]]]:
+    def join_cgroup() -> None:
+        (CGROUP_ROOT / args.cgroup / "cgroup.procs").write_text(str(os.getpid()))
+
+    return [
+        # first, so the cgroup limits cover the rest of the startup
+        ("cgroup", args.cgroup, join_cgroup),
+        (
+            "CPU affinity",
+            args.cpus,
+            lambda: os.sched_setaffinity(0, parse_cpu_list(args.cpus)),
+        ),
+        ("nice", args.nice, lambda: os.setpriority(os.PRIO_PROCESS, 0, args.nice)),
+        ("ionice", args.ionice, lambda: _set_ionice(args.ionice)),
+        (
+            "SCHED_FIFO",
+            args.fifo,
+            lambda: os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(args.fifo)),
+        ),
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Apply the settings to this process, then execute the app in its place.
+
+    A setting that cannot be applied is reported and the app is started
+    anyway.
+    """
+    parser = argparse.ArgumentParser(prog="launch_moos.scheduling")
+    parser.add_argument("--cgroup")
+    parser.add_argument("--cpus")
+    parser.add_argument("--nice", type=int)
+    parser.add_argument("--ionice")
+    parser.add_argument("--fifo", type=int)
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("no command to execute")
+
+    for name, value, apply in _steps(args):
+        if value is None:
+            continue
+        try:
+            apply()
+        except OSError as e:
+            print(
+                f"launch_moos: cannot set {name} of {command[0]}: {e}", file=sys.stderr
+            )
+
+    os.execvp(command[0], command)
+
+
+if __name__ == "__main__":
+    main()
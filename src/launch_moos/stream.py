@@ -0,0 +1,308 @@
+"""Streaming, event based parsing of MOOS mission files.
+
+:func:`iter_mission` reads a mission file in chunks and yields an event for
+every construct as soon as it is complete, holding at most one chunk and one
+line in memory. Malformed files raise :class:`pyparsing.ParseException`, like
+the other parsers, when the offending line is reached.
+"""
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .mission import AntlerRun
+from .mission import Assignment
+from .mission import Mission
+from .mission import ProcessConfig
+from .tokenizer import block_entry
+from .tokenizer import global_entry
+from .tokenizer import header_name
+from .tokenizer import is_close_brace
+from .tokenizer import is_open_brace
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class MissionEvent:
+    """Base class of the events of a mission file."""
+
+    __slots__ = ("lineno",)
+
+    def __init__(self, lineno: int) -> None:
+        """
+        Create a MissionEvent.
+
+        :param lineno: the line the event comes from, starting at 1
+        """
+        self.lineno = lineno
+
+    def __eq__(self, other: object) -> bool:
+        """Compare by value."""
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, slot) == getattr(other, slot)
+            for cls in type(self).__mro__
+            for slot in getattr(cls, "__slots__", ())
+        )
+
+    def __repr__(self) -> str:
+        """Return a constructor-like representation."""
+        values = ", ".join(
+            repr(getattr(self, slot))
+            for cls in reversed(type(self).__mro__)
+            for slot in getattr(cls, "__slots__", ())
+        )
+        return f"{type(self).__name__}({values})"
+
+
+class GlobalAssignment(MissionEvent):
+    """A ``name = value`` line outside of the blocks."""
+
+    __slots__ = ("assignment",)
+
+    def __init__(self, lineno: int, assignment: Assignment) -> None:
+        """
+        Create a GlobalAssignment.
+
+        :param lineno: the line the event comes from, starting at 1
+        :param assignment: the global configuration line
+        """
+        super().__init__(lineno)
+        self.assignment = assignment
+
+
+class BlockStart(MissionEvent):
+    """The ``ProcessConfig = name`` line starting a block."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, lineno: int, name: str) -> None:
+        """
+        Create a BlockStart.
+
+        :param lineno: the line the event comes from, starting at 1
+        :param name: the process the block configures
+        """
+        super().__init__(lineno)
+        self.name = name
+
+
+class BlockAssignment(MissionEvent):
+    """A ``name = value`` line within a block."""
+
+    __slots__ = ("assignment",)
+
+    def __init__(self, lineno: int, assignment: Assignment) -> None:
+        """
+        Create a BlockAssignment.
+
+        :param lineno: the line the event comes from, starting at 1
+        :param assignment: the configuration line
+        """
+        super().__init__(lineno)
+        self.assignment = assignment
+
+
+class RunLine(MissionEvent):
+    """A ``Run =`` line within a block."""
+
+    __slots__ = ("run",)
+
+    def __init__(self, lineno: int, run: AntlerRun) -> None:
+        """
+        Create a RunLine.
+
+        :param lineno: the line the event comes from, starting at 1
+        :param run: the Antler run line
+        """
+        super().__init__(lineno)
+        self.run = run
+
+
+class BlockEnd(MissionEvent):
+    """The closing brace of a block, carrying the complete block."""
+
+    __slots__ = ("block",)
+
+    def __init__(self, lineno: int, block: ProcessConfig) -> None:
+        """
+        Create a BlockEnd.
+
+        :param lineno: the line the event comes from, starting at 1
+        :param block: the block that ends
+        """
+        super().__init__(lineno)
+        self.block = block
+
+
+def iter_lines(
+    path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Read a file in chunks and yield its lines, without their newline.
+
+    As when splitting the whole file on newlines, the text after the last
+    newline is yielded too, even when empty.
+
+    Args:
+        path: the file to read.
+        chunk_size: the number of characters read at once.
+
+    Yields:
+        The lines of the file.
+    """
+    with open(path) as h:
+        partial = ""
+        while True:
+            chunk = h.read(chunk_size)
+            if not chunk:
+                break
+            lines = (partial + chunk).split("\n")
+            partial = lines.pop()
+            yield from lines
+        yield partial
+
+
+def iter_events(lines: Iterable[str]) -> Iterator[MissionEvent]:
+    """Parse the lines of a mission file into events.
+
+    Accepts the same language as :func:`launch_moos.tokenizer.parse_records`.
+
+    Args:
+        lines: the lines of the mission file without their newline, the last
+            one being the text after the last newline.
+
+    Yields:
+        The events of the mission file, in order.
+
+    Raises:
+        ParseException: if the lines are not a valid mission file.
+    """
+    # a ProcessConfig line only starts a block if a brace line follows it
+    pending: Optional[Tuple[int, str, str]] = None
+    block: Optional[BlockStart] = None
+    body: List[MissionEvent] = []
+
+    for lineno, line, is_last in _mark_last(lines):
+        line = line.expandtabs()
+        if block is not None and not is_last:
+            if is_close_brace(line):
+                yield BlockEnd(lineno, _process_config(block.name, body))
+                block = None
+                continue
+            event = _block_event(line, lineno)
+            if event is not None:
+                body.append(event)
+                yield event
+            continue
+
+        if pending is not None:
+            header_lineno, name, header = pending
+            pending = None
+            if not is_last and is_open_brace(line):
+                block = BlockStart(header_lineno, name)
+                body = []
+                yield block
+                continue
+            # not a block after all, but a global assignment
+            yield from _global_event(header, header_lineno)
+
+        if is_last:
+            if block is not None or line.strip(" "):
+                import pyparsing as pp
+
+                raise pp.ParseException(line, 0, f"Expected end of text, line {lineno}")
+            break
+
+        name = header_name(line)
+        if name is not None:
+            pending = (lineno, name, line)
+            continue
+        yield from _global_event(line, lineno)
+
+
+def _global_event(line: str, lineno: int) -> Iterator[GlobalAssignment]:
+    entry = _entry(global_entry, line, lineno)
+    if entry is not None:
+        yield GlobalAssignment(lineno, Assignment(entry[0], entry[1].rstrip()))
+
+
+def _block_event(line: str, lineno: int) -> Optional[MissionEvent]:
+    entry = _entry(block_entry, line, lineno)
+    if entry is None:
+        return None
+    if len(entry) == 2:
+        return BlockAssignment(lineno, Assignment(entry[0], entry[1].rstrip()))
+    executable, params, moosname = entry
+    params = tuple(Assignment(*param) for param in params)
+    return RunLine(lineno, AntlerRun(executable, params, moosname))
+
+
+def _process_config(name: str, body: List[MissionEvent]) -> ProcessConfig:
+    return ProcessConfig(
+        name,
+        tuple(e.assignment for e in body if isinstance(e, BlockAssignment)),
+        tuple(e.run for e in body if isinstance(e, RunLine)),
+    )
+
+
+def _mark_last(lines: Iterable[str]) -> Iterator[Tuple[int, str, bool]]:
+    iterator = iter(lines)
+    previous = next(iterator, "")
+    lineno = 1
+    for line in iterator:
+        yield lineno, previous, False
+        previous = line
+        lineno += 1
+    yield lineno, previous, True
+
+
+def _entry(
+    parse: Callable[[str], Optional[Tuple[Any, ...]]], line: str, lineno: int
+) -> Optional[Tuple[Any, ...]]:
+    try:
+        return parse(line)
+    except ValueError:
+        import pyparsing as pp
+
+        raise pp.ParseException(line, 0, f"Invalid line {lineno}") from None
+
+
+def iter_mission(
+    path: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[MissionEvent]:
+    """Parse a mission file into events while reading it.
+
+    Args:
+        path: the mission file.
+        chunk_size: the number of characters read at once.
+
+    Returns:
+        The events of the mission file, in order.
+    """
+    return iter_events(iter_lines(path, chunk_size))
+
+
+def mission_from_events(events: Iterable[MissionEvent]) -> Mission:
+    """Build a mission from its events.
+
+    Args:
+        events: the events of a mission file.
+
+    Returns:
+        The mission.
+    """
+    global_config = []
+    process_configs = []
+    for event in events:
+        if isinstance(event, GlobalAssignment):
+            global_config.append(event.assignment)
+        elif isinstance(event, BlockEnd):
+            process_configs.append(event.block)
+    return Mission(tuple(global_config), tuple(process_configs))
@@ -0,0 +1,370 @@
+"""Line oriented tokenizer backend for MOOS mission files.
+
+This is a single pass alternative to the pyparsing grammar in
+:mod:`launch_moos.parser`. It accepts the same language but classifies each
+line with a handful of anchored regular expressions instead of backtracking
+through the grammar.
+
+:func:`parse_records` returns the mission as nested tuples of strings, the
+form :class:`launch_moos.mission.Mission` is built from. Global assignments
+are ``(name, value)`` and ``ProcessConfig`` blocks ``(name, entries)``, where
+each entry is either an assignment or an ``(executable, params, moosname)``
+Antler run line. :func:`parse_string` turns those records into the same
+:class:`pyparsing.ParseResults` structure the grammar produces.
+"""
+import re
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+if TYPE_CHECKING:
+    # pyparsing is imported on demand, most callers only need the records
+    import pyparsing as pp
+
+
+# Character classes mirror `variable` and `identifier_name` in the grammar. The
+# negative lookaheads stop the regex engine from backtracking into a shorter
+# token than the greedy pyparsing `Word` would have matched.
+_VARIABLE = r"[A-Za-z_][A-Za-z0-9_\[\]+]*"
+_IDENTIFIER = r"[A-Za-z0-9.\-_]+(?![A-Za-z0-9.\-_])"
+_KEYWORD_END = r"(?![A-Za-z0-9_$])"
+
+_processconfig_line = re.compile(
+    r" *(?i:processconfig)" + _KEYWORD_END + r" *= *(" + _IDENTIFIER + r") *$"
+)
+_open_brace_line = re.compile(r" *\{ *$")
+_close_brace_line = re.compile(r" *\} *$")
+_assign_line = re.compile(r" *(" + _VARIABLE + r") *=(.*)$")
+_run_line = re.compile(
+    r" *(?i:run)"
+    + _KEYWORD_END
+    + r" *= *("
+    + _IDENTIFIER
+    + r") *@((?: *"
+    + _VARIABLE
+    + r"(?![A-Za-z0-9_\[\]+]) *= *"
+    + _IDENTIFIER
+    + r"(?: *,)?)*) *(?:~ *("
+    + _IDENTIFIER
+    + r"))? *$"
+)
+_run_param = re.compile(r" *(" + _VARIABLE + r") *= *(" + _IDENTIFIER + r")(?: *,)?")
+_comment = re.compile(r"//.")
+
+
+def assignment(name: str, value: str) -> "pp.ParseResults":
+    """Build the results of a ``name = value`` line.
+
+    Args:
+        name: the variable name.
+        value: the assigned value.
+
+    Returns:
+        The assignment, shaped like the ``assign_statement_line`` output.
+    """
+    import pyparsing as pp
+
+    group = pp.ParseResults([name, value])
+    group["name"] = name
+    group["value"] = value
+    return group
+
+
+def _assignment_value(rest: str) -> str:
+    rest = rest.lstrip(" ")
+    comment = _comment.search(rest)
+    if comment is not None:
+        return rest[: comment.start()]
+    return rest
+
+
+def run(
+    executable: str, params: Iterable[Tuple[str, str]], moosname: Optional[str]
+) -> "pp.ParseResults":
+    """Build the results of an Antler ``Run =`` line.
+
+    Args:
+        executable: the app to run.
+        params: the ``name=value`` pairs following ``@``.
+        moosname: the alias following ``~``, if any.
+
+    Returns:
+        The run line, shaped like the ``process_config_run_line`` output.
+    """
+    import pyparsing as pp
+
+    param_groups = pp.ParseResults([assignment(*param) for param in params])
+
+    tokens = ["Run", executable]
+    tokens.extend(param_groups)
+    if moosname is not None:
+        tokens.extend(("~", moosname))
+
+    group = pp.ParseResults(tokens)
+    group["executable"] = executable
+    group["params"] = param_groups
+    if moosname is not None:
+        group["moosname"] = moosname
+    return group
+
+
+def process_config(name: str, config: List["pp.ParseResults"]) -> "pp.ParseResults":
+    """Build the results of a ``ProcessConfig`` block.
+
+    Args:
+        name: the process name.
+        config: the assignments and run lines within the block.
+
+    Returns:
+        The block, shaped like the ``processconfig`` output.
+    """
+    import pyparsing as pp
+
+    group = pp.ParseResults(["processconfig", name, *config])
+    group["processconfig_name"] = name
+    group["config"] = pp.ParseResults(config)
+    return group
+
+
+def _is_comment(line: str) -> bool:
+    stripped = line.lstrip(" ")
+    return len(stripped) > 2 and stripped.startswith("//")
+
+
+def _parse_block(lines: List[str], start: int) -> Tuple[Tuple[Any, ...], int]:
+    """Parse the body of a ProcessConfig block.
+
+    Returns the config entries and the index of the closing brace line, or
+    raises :class:`IndexError`/:class:`ValueError` if the block is malformed.
+    """
+    config = []
+    index = start
+    while True:
+        line = lines[index]
+        if _close_brace_line.match(line):
+            return tuple(config), index
+        entry = block_entry(line)
+        if entry is not None:
+            config.append(entry)
+        index += 1
+
+
+def header_name(line: str) -> Optional[str]:
+    """Return the process name of a ``ProcessConfig = name`` line.
+
+    The line only starts a block if the next one is an opening brace, see
+    :func:`is_open_brace`.
+
+    Args:
+        line: the tab expanded line, without its newline.
+
+    Returns:
+        The process name, or None if the line is not a block header.
+    """
+    header = _processconfig_line.match(line)
+    return header.group(1) if header is not None else None
+
+
+def is_open_brace(line: str) -> bool:
+    """Return whether a tab expanded line opens a block."""
+    return _open_brace_line.match(line) is not None
+
+
+def is_close_brace(line: str) -> bool:
+    """Return whether a tab expanded line closes a block."""
+    return _close_brace_line.match(line) is not None
+
+
+def global_entry(line: str) -> Optional[Tuple[str, str]]:
+    """Parse a line outside of the blocks.
+
+    Args:
+        line: the tab expanded line, without its newline.
+
+    Returns:
+        The ``(name, value)`` record, or None for empty and comment lines.
+
+    Raises:
+        ValueError: if the line is invalid.
+    """
+    if not line.strip(" ") or _is_comment(line):
+        return None
+    assign = _assign_line.match(line)
+    if assign is None:
+        raise ValueError(line)
+    return assign.group(1), _assignment_value(assign.group(2))
+
+
+def block_entry(line: str) -> Optional[Tuple[Any, ...]]:
+    """Parse a line within a block, other than the closing brace.
+
+    Args:
+        line: the tab expanded line, without its newline.
+
+    Returns:
+        The ``(name, value)`` or ``(executable, params, moosname)`` record, or
+        None for empty and comment lines.
+
+    Raises:
+        ValueError: if the line is invalid.
+    """
+    if not line.strip(" ") or _is_comment(line):
+        return None
+    run_line = _run_line.match(line)
+    if run_line is not None:
+        executable, params, moosname = run_line.groups()
+        return executable, tuple(_run_param.findall(params)), moosname
+    assign = _assign_line.match(line)
+    if assign is None:
+        raise ValueError(line)
+    return assign.group(1), _assignment_value(assign.group(2))
+
+
+def to_parse_results(records: Tuple[Any, ...]) -> "pp.ParseResults":
+    """Build the pyparsing results for a mission in record form.
+
+    Args:
+        records: the mission, as returned by :func:`parse_records`.
+
+    Returns:
+        The parsed mission, shaped like the pyparsing grammar output.
+    """
+    import pyparsing as pp
+
+    results = []
+    for name, value in records:
+        if isinstance(value, str):
+            results.append(assignment(name, value))
+            continue
+
+        config = [
+            assignment(*entry) if len(entry) == 2 else run(*entry) for entry in value
+        ]
+        results.append(process_config(name, config))
+    return pp.ParseResults(results)
+
+
+def parse_string(text: str) -> "pp.ParseResults":
+    """Parse the contents of a MOOS mission file.
+
+    Equivalent to ``moos_file.parse_string(text, parse_all=True)``.
+
+    Args:
+        text: the mission file contents.
+
+    Returns:
+        The parsed mission, shaped like the pyparsing grammar output.
+    """
+    return to_parse_results(parse_records(text))
+
+
+def parse_records(text: str) -> Tuple[Any, ...]:
+    """Parse the contents of a MOOS mission file into records.
+
+    Args:
+        text: the mission file contents.
+
+    Returns:
+        The parsed mission as nested tuples of strings.
+
+    Raises:
+        ParseException: if ``text`` is not a valid mission file.
+    """
+    # pyparsing expands tabs before matching, do the same so values are equal
+    lines = text.expandtabs().split("\n")
+    results: List[Tuple[Any, ...]] = []
+    invalid = _parse_lines(lines, results)
+    if invalid is not None:
+        import pyparsing as pp
+
+        loc = sum(len(line) + 1 for line in lines[:invalid])
+        raise pp.ParseException(text, loc, "Expected end of text")
+    return tuple(results)
+
+
+def _parse_lines(lines: List[str], results: List[Tuple[Any, ...]]) -> Optional[int]:
+    """Append the records of ``lines`` to ``results``.
+
+    Returns the index of the first invalid line, None if every line is valid.
+    """
+    # the grammar requires every line to be newline terminated
+    last_line = len(lines) - 1
+
+    index = 0
+    while index < last_line:
+        line = lines[index]
+        if not line.strip(" ") or _is_comment(line):
+            index += 1
+            continue
+
+        header = _processconfig_line.match(line)
+        if (
+            header is not None
+            and index + 1 < last_line
+            and _open_brace_line.match(lines[index + 1])
+        ):
+            try:
+                config, end = _parse_block(lines, index + 2)
+            except (IndexError, ValueError):
+                return index
+            if end >= last_line:
+                return index
+            results.append((header.group(1), config))
+            index = end + 1
+            continue
+
+        assign = _assign_line.match(line)
+        if assign is None:
+            return index
+        results.append((assign.group(1), _assignment_value(assign.group(2))))
+        index += 1
+
+    if lines[last_line].strip(" "):
+        return last_line
+    return None
+
+
+def split_regions(text: str) -> List[Tuple[bool, str]]:
+    """Split a mission file into ProcessConfig blocks and the text between them.
+
+    Every region can be parsed on its own with :func:`parse_records`, and
+    parsing them one after the other is equivalent to parsing ``text``.
+
+    Args:
+        text: the mission file contents.
+
+    Returns:
+        ``(is_block, region_text)`` pairs covering ``text`` in order.
+    """
+    lines = text.split("\n")
+    regions = []
+    start = 0
+    index = 0
+    while index < len(lines) - 1:
+        if _processconfig_line.match(lines[index].expandtabs()) and (
+            _open_brace_line.match(lines[index + 1].expandtabs())
+        ):
+            end = index + 2
+            while end < len(lines) - 1 and not _close_brace_line.match(
+                lines[end].expandtabs()
+            ):
+                end += 1
+            if start < index:
+                regions.append((False, "\n".join(lines[start:index]) + "\n"))
+            if end >= len(lines) - 1:
+                # unterminated block, which fails to parse just like the file
+                regions.append((True, "\n".join(lines[index:])))
+                return regions
+            regions.append((True, "\n".join(lines[index : end + 1]) + "\n"))
+            index = start = end + 1
+            continue
+        index += 1
+
+    remainder = "\n".join(lines[start:])
+    if remainder:
+        regions.append((False, remainder))
+    return regions
@@ -0,0 +1,219 @@
+"""Timeline tracing of the launch, exported as Chrome trace-event JSON.
+
+Tracing is off unless ``$LAUNCH_MOOS_TRACE`` names the file to write the
+trace to when the launch exits, or :func:`enable` is called. While it is off
+:func:`span` returns a shared no-op context manager, so instrumented code
+costs a function call.
+
+The trace opens in ``chrome://tracing`` or https://ui.perfetto.dev, and
+:meth:`Tracer.summary` gives the total time spent in every stage.
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+
+ENV_VAR = "LAUNCH_MOOS_TRACE"
+
+
+class Tracer:
+    """Recorder of the spans of a launch."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Create a Tracer.
+
+        :param path: the file the trace is written to by :meth:`close`
+        """
+        self.path = Path(path) if path is not None else None
+        self.events: List[Dict[str, Any]] = []
+        self.__lanes: Dict[str, int] = {}
+        self.__lock = threading.Lock()
+        self.__pid = os.getpid()
+
+    @staticmethod
+    def now() -> float:
+        """Return the current time in microseconds, the unit of the trace."""
+        return time.perf_counter() * 1e6
+
+    def span(self, name: str, lane: Optional[str] = None, **args: Any) -> "_Span":
+        """Return a context manager recording the time spent in its block.
+
+        Args:
+            name: the stage, like ``parse`` or ``spawn``.
+            lane: the row of the trace the span is drawn on, for example the
+                app name, the current thread by default.
+            args: details shown with the span.
+
+        Returns:
+            The span context manager.
+        """
+        return _Span(self, name, lane, args)
+
+    def add_span(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        lane: Optional[str] = None,
+        **args: Any,
+    ) -> None:
+        """Record a span that started and ended at the given :meth:`now` times."""
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": start,
+            "dur": max(0.0, end - start),
+            "pid": self.__pid,
+            "tid": self.__lane(lane),
+        }
+        if args:
+            event["args"] = {key: str(value) for key, value in args.items()}
+        with self.__lock:
+            self.events.append(event)
+
+    def __lane(self, lane: Optional[str]) -> int:
+        if lane is None:
+            return threading.get_ident()
+        tid = self.__lanes.get(lane)
+        if tid is None:
+            with self.__lock:
+                tid = self.__lanes[lane] = len(self.__lanes) + 1
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self.__pid,
+                        "tid": tid,
+                        "args": {"name": lane},
+                    }
+                )
+        return tid
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Return the trace in the Chrome trace-event format."""
+        with self.__lock:
+            return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def write(self, path: Union[str, Path]) -> None:
+        """Write the trace to a Chrome trace-event JSON file."""
+        Path(path).write_text(json.dumps(self.to_chrome_trace()))
+
+    def summary(self) -> str:
+        """Return the count, total and longest duration of every stage."""
+        stages: Dict[str, List[float]] = {}
+        with self.__lock:
+            for event in self.events:
+                if event["ph"] == "X":
+                    stages.setdefault(event["name"], []).append(event["dur"])
+
+        lines = [f"{'stage':<24} {'count':>6} {'total ms':>10} {'max ms':>10}"]
+        for name, durations in sorted(
+            stages.items(), key=lambda item: sum(item[1]), reverse=True
+        ):
+            lines.append(
+                "{:<24} {:>6} {:>10.3f} {:>10.3f}".format(
+                    name, len(durations), sum(durations) / 1e3, max(durations) / 1e3
+                )
+            )
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        """Write the trace to :attr:`path`, if set."""
+        if self.path is not None:
+            self.write(self.path)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "lane", "args", "start")
+
+    def __init__(
+        self, tracer: Tracer, name: str, lane: Optional[str], args: Dict[str, Any]
+    ) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.lane = lane
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = self.tracer.now()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.tracer.add_span(
+            self.name, self.start, self.tracer.now(), self.lane, **self.args
+        )
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the active tracer, None while tracing is off."""
+    return _tracer
+
+
+def enable(path: Optional[Union[str, Path]] = None) -> Tracer:
+    """Turn tracing on, writing the trace to ``path`` when the launch exits.
+
+    Args:
+        path: the Chrome trace-event JSON file to write.
+
+    Returns:
+        The active tracer, the existing one if tracing was already on.
+    """
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(path)
+        atexit.register(_close)
+    elif path is not None:
+        _tracer.path = Path(path)
+    return _tracer
+
+
+def disable() -> None:
+    """Turn tracing off, the recorded spans are discarded."""
+    global _tracer
+    _tracer = None
+
+
+def span(name: str, lane: Optional[str] = None, **args: Any) -> Any:
+    """Return a context manager tracing its block, see :meth:`Tracer.span`."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, lane, **args)
+
+
+def _close() -> None:
+    if _tracer is not None and _tracer.path is not None:
+        _tracer.close()
+        print(
+            f"launch_moos trace written to {_tracer.path}\n{_tracer.summary()}",
+            file=sys.stderr,
+        )
+
+
+if os.environ.get(ENV_VAR):
+    enable(os.environ[ENV_VAR])
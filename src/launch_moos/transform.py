@@ -1,13 +1,186 @@
-from launch.actions import ExecuteProcess
+"""Translation of parsed MOOS missions into launch actions."""
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
 
+from launch.action import Action
+from launch.actions import RegisterEventHandler
+from launch.event_handlers import OnShutdown
+from launch.launch_description import LaunchDescription
 
-def antler_run_statement_to_action(statement):
-    assert statement["executable"] == "pHelmIvP"
+from .actions.moosapp import MOOSApp
+from .actions.staggered_launch import StaggeredLaunch
+from .community import MOOSCommunity
+from .fleet import Vehicle
+from .generated_files import DISK
+from .generated_files import write_generated_file
+from .mission import AntlerRun
+from .mission import Assignment
+from .mission import Mission
+from .mission import ProcessConfig
+from .plan import InvalidMissionFileError
+from .plan import antler_staggering
+from .plan import app_prefix
+from .plan import app_scheduling
+from .plan import extra_process_params
+from .scheduling import without_scheduling_keys
+from .stream import BlockEnd
+from .stream import GlobalAssignment
+from .stream import MissionEvent
 
-    for param in statement["params"]:
-        param["name"] == "NewConsole"
-        param["value"] == "true"
 
-    assert r["params"][1]["name"] == "ExtraProcessParams"
-    assert r["params"][1]["value"] == "HParams"
-    assert statement["moosname"] == "uTimerScript_SensorConfig"
+def antler_run_statement_to_action(
+    statement: AntlerRun,
+    mission: Mission,
+    community: Optional[MOOSCommunity] = None,
+    mission_file: Optional[str] = None,
+) -> MOOSApp:
+    """Create the MOOSApp action for a ``Run =`` line of the ANTLER block.
+
+    If ``community`` is given the app shares its generated mission file,
+    otherwise the app gets a mission file of its own. An app restarted after
+    the community file was written is given that file as ``mission_file``.
+
+    The scheduling keys of the app's block, see
+    :data:`launch_moos.scheduling.PROCESS_CONFIG_KEYS`, set its
+    :class:`launch_moos.scheduling.Scheduling` and are left out of its
+    generated configuration.
+    """
+    block = mission.process_config(statement.name)
+
+    kwargs = {}
+    prefix = app_prefix(statement)
+    if prefix is not None:
+        kwargs["prefix"] = prefix
+
+    if community is None:
+        kwargs["global_config"] = mission.global_config
+
+    config = block.config if block is not None else ()
+    return MOOSApp(
+        executable=statement.executable,
+        name=statement.name,
+        alias=statement.moosname,
+        arguments=extra_process_params(statement, mission),
+        config=without_scheduling_keys(config),
+        mission_file=mission_file,
+        community=community,
+        scheduling=app_scheduling(statement, block),
+        **kwargs,
+    )
+
+
+def mission_to_actions(
+    mission: Mission, community: Optional[MOOSCommunity] = None
+) -> List[MOOSApp]:
+    """Create a MOOSApp action for every app the ANTLER block runs.
+
+    The apps share a single generated mission file, the one of ``community``
+    if given.
+    """
+    if mission.antler is None:
+        raise InvalidMissionFileError("mission file has no ANTLER block")
+
+    if community is None:
+        community = MOOSCommunity(mission.global_config)
+    return [
+        antler_run_statement_to_action(run, mission, community) for run in mission.runs
+    ]
+
+
+def iter_mission_actions(
+    events: Iterable[MissionEvent], community: Optional[MOOSCommunity] = None
+) -> Iterator[Tuple[AntlerRun, MOOSApp]]:
+    """Create the MOOSApp actions of a mission while it is being parsed.
+
+    An app is created as soon as both the ANTLER block and the app's own
+    block have been read, so with the ANTLER block at the top of the file
+    apps are created block after block. Apps without a block of their own are
+    created at the end. The global configuration is added to ``community`` as
+    it is read.
+
+    The apps come in the order their blocks appear in the mission file, each
+    with the ``Run =`` line it is created for.
+    """
+    if community is None:
+        community = MOOSCommunity()
+
+    global_config: List[Assignment] = []
+    blocks: Dict[str, ProcessConfig] = {}
+    waiting: List[AntlerRun] = []
+    for event in events:
+        if isinstance(event, GlobalAssignment):
+            global_config.append(event.assignment)
+            community.global_config.append(event.assignment)
+        elif isinstance(event, BlockEnd) and event.block.name not in blocks:
+            blocks[event.block.name] = event.block
+            if event.block.name == "ANTLER":
+                waiting = list(event.block.runs)
+            ready = [run for run in waiting if run.name in blocks]
+            waiting = [run for run in waiting if run.name not in blocks]
+            for run in ready:
+                yield run, _streamed_action(run, global_config, blocks, community)
+
+    if "ANTLER" not in blocks:
+        raise InvalidMissionFileError("mission file has no ANTLER block")
+    for run in waiting:
+        yield run, _streamed_action(run, global_config, blocks, community)
+
+
+def _streamed_action(
+    run: AntlerRun,
+    global_config: List[Assignment],
+    blocks: Dict[str, ProcessConfig],
+    community: MOOSCommunity,
+) -> MOOSApp:
+    # only the blocks the app depends on, the rest may not be read yet
+    process_configs = [blocks["ANTLER"]]
+    if run.name in blocks:
+        process_configs.append(blocks[run.name])
+    mission = Mission(tuple(global_config), tuple(process_configs))
+    return antler_run_statement_to_action(run, mission, community)
+
+
+def mission_to_staggered_launch(
+    mission: Mission, apps: Sequence[MOOSApp]
+) -> StaggeredLaunch:
+    """Start the apps of a mission the way Antler would.
+
+    The delay between launches and the address MOOSDB is waited on are read
+    by :func:`launch_moos.plan.antler_staggering`.
+    """
+    delay, host, port = antler_staggering(mission)
+    return StaggeredLaunch(
+        apps=apps, ms_between_launches=delay, moosdb_host=host, moosdb_port=port
+    )
+
+
+def vehicle_to_launch_description(
+    vehicle: Vehicle, staggered: bool = True, file_backend: str = DISK
+) -> LaunchDescription:
+    """Create the launch description of one community of a fleet.
+
+    The mission file generated by :func:`launch_moos.fleet.expand_fleet` is
+    written as is, with ``file_backend``, shared by every app of the
+    community and removed once the launch shuts down.
+    """
+    mission = vehicle.mission
+    if mission.antler is None:
+        raise InvalidMissionFileError("mission file has no ANTLER block")
+
+    mission_file = write_generated_file(vehicle.mission_text, file_backend)
+    apps = [
+        antler_run_statement_to_action(run, mission, mission_file=mission_file.path)
+        for run in mission.runs
+    ]
+    entities: List[Action] = list(apps)
+    if staggered:
+        entities = [mission_to_staggered_launch(mission, apps)]
+    close_file = RegisterEventHandler(
+        OnShutdown(on_shutdown=lambda event, context: mission_file.close())
+    )
+    return LaunchDescription([close_file, *entities])
@@ -0,0 +1,151 @@
+"""Watching mission files for changes, with inotify or by polling."""
+import asyncio
+import ctypes
+import ctypes.util
+import os
+from pathlib import Path
+from typing import AsyncIterator
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+# editors often write a file in several steps, wait for them to settle
+DEFAULT_DEBOUNCE = 0.05
+
+_IN_CLOEXEC = 0o2000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+
+
+def _inotify_fd(directories: Iterable[Path]) -> Optional[int]:
+    """Watch directories with inotify, return None if inotify is unavailable."""
+    libc_name = ctypes.util.find_library("c")
+    if libc_name is None:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        init = libc.inotify_init1
+        add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+
+    fd = int(init(_IN_NONBLOCK | _IN_CLOEXEC))
+    if fd < 0:
+        return None
+    # watch the directory, editors replace files by renaming over them
+    mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+    for directory in directories:
+        if add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+    return fd
+
+
+class MissionFileWatcher:
+    """Watcher yielding the contents of a file every time they change.
+
+    inotify is used where available, otherwise the file is polled every
+    ``poll_interval`` seconds. Either way the contents are compared with the
+    previous ones, so touching the file or rewriting it unchanged is ignored.
+
+    The files the watched file includes can be given as ``dependencies``, the
+    contents of the watched file are then also yielded when one of them
+    changes.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: bool = True,
+        dependencies: Iterable[Union[str, Path]] = (),
+    ) -> None:
+        """
+        Create a MissionFileWatcher.
+
+        :param path: the file to watch
+        :param poll_interval: seconds between checks when polling
+        :param use_inotify: set to False to always poll
+        :param dependencies: the files included by the watched file
+        """
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.dependencies = [Path(dependency) for dependency in dependencies]
+        self.__contents = self.__read()
+
+    def __paths(self) -> Tuple[Path, ...]:
+        return (self.path, *self.dependencies)
+
+    def __read(self) -> Tuple[Optional[bytes], ...]:
+        return tuple(_read(path) for path in self.__paths())
+
+    def __changed(self) -> Optional[bytes]:
+        contents = self.__read()
+        # a file that is being replaced shows up again shortly
+        if None in contents or contents == self.__contents:
+            return None
+        self.__contents = contents
+        return contents[0]
+
+    async def changes(self) -> AsyncIterator[bytes]:
+        """Yield the new contents of the file whenever they change."""
+        directories = {path.parent for path in self.__paths()}
+        fd = _inotify_fd(sorted(directories)) if self.use_inotify else None
+        if fd is None:
+            async for contents in self.__poll():
+                yield contents
+            return
+
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        loop.add_reader(fd, wakeup.set)
+        try:
+            while True:
+                await wakeup.wait()
+                await asyncio.sleep(DEFAULT_DEBOUNCE)
+                wakeup.clear()
+                _drain(fd)
+                contents = self.__changed()
+                if contents is not None:
+                    yield contents
+        finally:
+            loop.remove_reader(fd)
+            os.close(fd)
+
+    async def __poll(self) -> AsyncIterator[bytes]:
+        last_stats = None
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                stats = [path.stat() for path in self.__paths()]
+            except OSError:
+                continue
+            keys = [(stat.st_mtime_ns, stat.st_size, stat.st_ino) for stat in stats]
+            if keys == last_stats:
+                continue
+            last_stats = keys
+            contents = self.__changed()
+            if contents is not None:
+                yield contents
+
+
+def _read(path: Path) -> Optional[bytes]:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _drain(fd: int) -> None:
+    try:
+        while os.read(fd, 4096):
+            pass
+    except BlockingIOError:
+        pass
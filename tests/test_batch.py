@@ -0,0 +1,48 @@
+"""Tests for checking many mission files at once."""
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from launch_moos.batch import check_missions
+from launch_moos.mission import Mission
+
+
+MISSION_FILE = Path(__file__).parent / "moos_files" / "s15_pedi_alpha.moos"
+
+
+def write_missions(tmp_path: Path) -> List[Path]:
+    invalid = tmp_path / "invalid.moos"
+    invalid.write_text("ProcessConfig = ANTLER\n{\n  Run = MOOSDB\n")
+    no_antler = tmp_path / "no_antler.moos"
+    no_antler.write_text("ServerPort = $(PORT)\n")
+    latin1 = tmp_path / "latin1.moos"
+    latin1.write_bytes("Community = caf\xe9\n".encode("latin-1"))
+    return [MISSION_FILE, invalid, no_antler, latin1, MISSION_FILE]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_check_missions(tmp_path: Path, jobs: int) -> None:
+    paths = write_missions(tmp_path)
+
+    results = check_missions(paths, jobs=jobs)
+
+    assert [result.path for result in results] == paths
+    assert [result.ok for result in results] == [True, False, False, False, True]
+    assert results[0].mission == Mission.from_file(MISSION_FILE)
+    assert results[1].mission is None
+    assert "Expected end of text" in str(results[1].error)
+    assert results[2].error == "mission file has no ANTLER block"
+    assert "latin1.moos" in str(results[3].error)
+    assert "can't decode" in str(results[3].error)
+
+
+def test_check_missions_defines_macros(tmp_path: Path) -> None:
+    mission_file = tmp_path / "mission.moos"
+    mission_file.write_text(
+        "ServerPort = $(PORT)\n\nProcessConfig = ANTLER\n{\n  Run = MOOSDB\n}\n"
+    )
+
+    (result,) = check_missions([mission_file], macros={"PORT": "9100"})
+    assert result.mission is not None
+    assert result.mission.get_global("ServerPort") == "9100"
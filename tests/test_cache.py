@@ -0,0 +1,81 @@
+"""Tests for the mission file parse cache."""
+import os
+from pathlib import Path
+
+import pytest
+
+from launch_moos import cache
+from launch_moos.cache import ParseCache
+from launch_moos.mission import Mission
+from launch_moos.plan import InvalidMissionFileError
+
+
+MISSION_FILE = Path(__file__).parent / "moos_files" / "s15_pedi_alpha.moos"
+
+
+def test_cache_hit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    parse_cache = ParseCache(tmp_path)
+    expected = parse_cache.parse_file(MISSION_FILE)
+    assert expected == Mission.from_file(MISSION_FILE)
+    assert len(list(tmp_path.glob("*.bin"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("mission was parsed again")
+
+    monkeypatch.setattr(cache.Mission, "from_string", fail)
+    r = parse_cache.parse_file(MISSION_FILE)
+
+    assert r == expected
+
+
+def test_cache_miss_on_change(tmp_path: Path) -> None:
+    parse_cache = ParseCache(tmp_path / "cache")
+    mission = tmp_path / "alpha.moos"
+
+    mission.write_text("Community = alpha\n")
+    assert parse_cache.parse_file(mission).get_global("Community") == "alpha"
+
+    mission.write_text("Community = bravo\n")
+    assert parse_cache.parse_file(mission).get_global("Community") == "bravo"
+    assert len(list((tmp_path / "cache").glob("*.bin"))) == 2
+
+
+def test_cache_not_utf8(tmp_path: Path) -> None:
+    parse_cache = ParseCache(tmp_path)
+
+    with pytest.raises(InvalidMissionFileError, match="not UTF-8"):
+        parse_cache.parse("Community = caf\xe9\n".encode("latin-1"))
+    assert not list(tmp_path.glob("*.bin"))
+
+
+def test_cache_eviction(tmp_path: Path) -> None:
+    parse_cache = ParseCache(tmp_path, max_size=200)
+
+    for i in range(10):
+        parse_cache.parse(
+            f"Community = vehicle_{i}\nServerPort = {9000 + i}\n".encode()
+        )
+        # make the LRU order deterministic regardless of timestamp resolution
+        for entry in tmp_path.glob("*.bin"):
+            os.utime(entry, (0, entry.stat().st_mtime - 1))
+
+    entries = list(tmp_path.glob("*.bin"))
+    assert 0 < len(entries) < 10
+    assert sum(e.stat().st_size for e in entries) <= 200
+
+    # the most recently stored entry is always kept
+    newest = parse_cache._entry_path(b"Community = vehicle_9\nServerPort = 9009\n")
+    assert newest in entries
+
+
+def test_cache_entries_removed_concurrently(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    parse_cache = ParseCache(tmp_path, max_size=0)
+    # an entry another launch removes while this one evicts
+    (tmp_path / "gone.bin").symlink_to(tmp_path / "missing.bin")
+    assert parse_cache.parse(b"Community = alpha\n").get_global("Community") == "alpha"
+
+    monkeypatch.setattr(Path, "glob", lambda self, pattern: iter([self / "gone.bin"]))
+    (tmp_path / "gone.bin").unlink()
+    parse_cache.clear()
@@ -0,0 +1,89 @@
+"""Tests for the command-line interface."""
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from launch_moos import __main__
+
+
+MISSION_FILE = Path(__file__).parent / "moos_files" / "s15_pedi_alpha.moos"
+
+
+@pytest.fixture
+def runner(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> CliRunner:
+    monkeypatch.setenv("LAUNCH_MOOS_CACHE_DIR", str(tmp_path / "cache"))
+    return CliRunner()
+
+
+def test_main_succeeds(runner: CliRunner) -> None:
+    result = runner.invoke(__main__.main, ["--help"])
+    assert result.exit_code == 0
+    assert "run" in result.output
+
+
+def test_run_dry_run(runner: CliRunner) -> None:
+    result = runner.invoke(
+        __main__.main, ["run", "--dry-run", "--no-preflight", str(MISSION_FILE)]
+    )
+    assert result.exit_code == 0, result.output
+
+    lines = result.output.splitlines()
+    assert lines[0] == "MOOSDB: MOOSDB '<mission file>'"
+    assert "pHelmIvP: pHelmIvP '<mission file>'" in lines
+    assert "ServerPort = 9000" in result.output
+    assert "ProcessConfig = pHelmIvP" in result.output
+
+
+def test_run_dry_run_defines_macros(tmp_path: Path, runner: CliRunner) -> None:
+    mission_file = tmp_path / "mission.moos"
+    mission_file.write_text(
+        "ServerPort = $(PORT)\n\nProcessConfig = ANTLER\n{\n  Run = MOOSDB\n}\n"
+    )
+
+    result = runner.invoke(
+        __main__.main,
+        ["run", "--dry-run", "--no-preflight", "-D", "PORT=9100", str(mission_file)],
+    )
+    assert result.exit_code == 0, result.output
+    assert "ServerPort = 9100" in result.output
+
+
+def test_run_rejects_invalid_define(runner: CliRunner) -> None:
+    result = runner.invoke(
+        __main__.main, ["run", "--dry-run", "-D", "PORT", str(MISSION_FILE)]
+    )
+    assert result.exit_code == 2
+    assert "'PORT' is not VAR=VALUE" in result.output
+
+
+def test_run_dry_run_reports_invalid_mission(tmp_path: Path, runner: CliRunner) -> None:
+    mission_file = tmp_path / "mission.moos"
+    mission_file.write_text("ServerPort = 9000\n")
+
+    result = runner.invoke(__main__.main, ["run", "--dry-run", str(mission_file)])
+    assert result.exit_code == 1
+    assert "mission file has no ANTLER block" in result.output
+
+
+def test_check(tmp_path: Path, runner: CliRunner) -> None:
+    invalid = tmp_path / "invalid.moos"
+    invalid.write_text("ServerPort = 9000\n")
+
+    result = runner.invoke(__main__.main, ["check", "-j", "2", str(MISSION_FILE)])
+    assert result.exit_code == 0, result.output
+    assert result.output == f"ok: {MISSION_FILE} (9 apps)\n"
+
+    result = runner.invoke(__main__.main, ["check", str(MISSION_FILE), str(invalid)])
+    assert result.exit_code == 1
+    assert f"error: {invalid}: mission file has no ANTLER block" in result.output
+    assert "1 of 2 missions are invalid" in result.output
+
+
+def test_run_dry_run_preflight(runner: CliRunner) -> None:
+    # the plan is shown on machines without the apps
+    result = runner.invoke(__main__.main, ["run", "--dry-run", str(MISSION_FILE)])
+    assert result.exit_code == 0, result.output
+    assert "MOOSDB: MOOSDB" in result.output
+    assert "error: 'MOOSDB' is not on PATH" in result.output
+    assert "error: 'pHelmIvP' is not on PATH" in result.output
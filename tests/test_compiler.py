@@ -0,0 +1,131 @@
+"""Tests for compiling mission files into launch files."""
+import ast
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
+from launch.actions import RegisterEventHandler
+
+from launch_moos.actions import StaggeredLaunch
+from launch_moos.compiler import compile_mission
+from launch_moos.compiler import default_output
+from launch_moos.compiler import is_up_to_date
+from launch_moos.compiler import read_header
+
+
+MISSION = """\
+ServerPort = 9100
+
+ProcessConfig = ANTLER
+{
+  MSBetweenLaunches = 50
+  Run = MOOSDB
+  Run = pHelmIvP @ NewConsole = true ~ pHelmIvP_2
+}
+
+#include helm.plug
+"""
+
+HELM = """\
+ProcessConfig = pHelmIvP_2
+{
+  AppTick = 4
+  Nice = 5
+}
+"""
+
+
+def write_mission(tmp_path: Path) -> Path:
+    (tmp_path / "helm.plug").write_text(HELM)
+    mission_file = tmp_path / "alpha.moos"
+    mission_file.write_text(MISSION)
+    return mission_file
+
+
+def test_compile_mission(tmp_path: Path) -> None:
+    mission_file = write_mission(tmp_path)
+
+    assert compile_mission(mission_file)
+    output = tmp_path / "alpha.launch.py"
+    assert default_output(mission_file) == output
+    assert Path(importlib.util.cache_from_source(str(output))).exists()
+
+    source = output.read_text()
+    ast.parse(source)
+    assert '("ServerPort", "9100"),' in source
+    assert 'alias="pHelmIvP_2",' in source
+    assert 'prefix="xterm -e",' in source
+    assert '("AppTick", "4"),' in source
+    assert 'Scheduling.from_config([\n                ("Nice", "5"),' in source
+    assert "ms_between_launches=50," in source
+
+    header = read_header(output)
+    assert header is not None
+    assert set(header["depends"]) == {
+        str(mission_file.resolve()),
+        str((tmp_path / "helm.plug").resolve()),
+    }
+
+
+def test_compile_mission_only_when_changed(tmp_path: Path) -> None:
+    mission_file = write_mission(tmp_path)
+    output = tmp_path / "out" / "mission.launch.py"
+
+    assert compile_mission(mission_file, output)
+    assert is_up_to_date(output)
+    assert not compile_mission(mission_file, output)
+    assert compile_mission(mission_file, output, force=True)
+
+    # included files are tracked too
+    (tmp_path / "helm.plug").write_text(HELM.replace("4", "8"))
+    assert not is_up_to_date(output)
+    assert compile_mission(mission_file, output)
+    assert '("AppTick", "8"),' in output.read_text()
+
+    # as are the compile settings
+    assert not is_up_to_date(output, macros={"VAR": "1"})
+    assert not is_up_to_date(output, staggered=False)
+    assert compile_mission(mission_file, output, staggered=False)
+    assert "StaggeredLaunch" not in output.read_text().split("def ")[-1]
+
+
+def load_launch_file(path: Path) -> ModuleType:
+    spec = importlib.util.spec_from_file_location("alpha_launch", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compiled_launch_file(tmp_path: Path) -> None:
+    mission_file = write_mission(tmp_path)
+    output = tmp_path / "alpha.launch.py"
+    compile_mission(mission_file, output)
+
+    module = load_launch_file(output)
+
+    close_store, staggered = module.generate_launch_description().entities
+    assert isinstance(close_store, RegisterEventHandler)
+    assert isinstance(staggered, StaggeredLaunch)
+    assert [app.alias for app in staggered.apps] == [None, "pHelmIvP_2"]
+    assert staggered.apps[1].scheduling.nice == 5
+
+    # a changed mission is recompiled when launched
+    mission_file.write_text(MISSION.replace("9100", "9200"))
+    _, staggered = module.generate_launch_description().entities
+    assert staggered.moosdb_port == 9200
+    assert is_up_to_date(output)
+
+
+def test_compiled_launch_file_without_mission(tmp_path: Path) -> None:
+    mission_file = write_mission(tmp_path)
+    output = tmp_path / "deployed" / "alpha.launch.py"
+    compile_mission(mission_file, output)
+
+    # deployed without the mission it was compiled from
+    mission_file.unlink()
+    (tmp_path / "helm.plug").unlink()
+
+    _, staggered = load_launch_file(output).generate_launch_description().entities
+    assert isinstance(staggered, StaggeredLaunch)
+    assert staggered.moosdb_port == 9100
@@ -0,0 +1,87 @@
+"""Tests for expanding a mission into a fleet of vehicles."""
+
+from pathlib import Path
+
+import pytest
+
+from launch_moos.fleet import expand_fleet
+from launch_moos.mission import Mission
+
+
+MISSION_FILE = Path(__file__).parent / "moos_files" / "s15_pedi_alpha.moos"
+
+
+def test_expand_fleet() -> None:
+    mission = Mission.from_file(MISSION_FILE)
+
+    alpha, bravo = expand_fleet(
+        mission,
+        {
+            "alpha": {},
+            "bravo": {
+                "LatOrigin": 43.8,
+                "pHelmIvP": {"behaviors": "bravo.bhv", "domain": ["a", "b"]},
+            },
+        },
+    )
+
+    assert alpha.mission.get_global("Community") == "alpha"
+    assert bravo.mission.get_global("Community") == "bravo"
+    assert [alpha.server_port, bravo.server_port] == [9000, 9001]
+    assert bravo.mission.get_global("LatOrigin") == "43.8"
+
+    helm = bravo.mission.process_config("pHelmIvP")
+    assert helm is not None
+    assert helm.get("behaviors") == "bravo.bhv"
+    assert helm.get_all("domain") == ["a", "b"]
+    assert helm.get("AppTick") == "4"
+
+    # blocks without overrides are shared, not copied
+    assert bravo.mission.process_config("pLogger") is mission.process_config("pLogger")
+    assert alpha.mission.process_config("pHelmIvP") is mission.process_config(
+        "pHelmIvP"
+    )
+
+    generated = Mission.from_string(bravo.mission_text)
+    assert generated.get_global("Community") == "bravo"
+    assert generated.process_config("pHelmIvP") == helm
+    assert "pLogger" in generated
+
+
+def test_scheduling_keys_not_generated() -> None:
+    mission = Mission.from_string(
+        "ProcessConfig = ANTLER\n{\n  Run = pHelmIvP @ NewConsole = false\n}\n"
+        "ProcessConfig = pHelmIvP\n{\n  AppTick = 4\n  CPUAffinity = 1\n"
+        "  Nice = 5\n  CGroupMemoryMax = 64M\n}\n"
+    )
+
+    (alpha,) = expand_fleet(mission, {"alpha": {}})
+
+    helm = Mission.from_string(alpha.mission_text).process_config("pHelmIvP")
+    assert helm is not None
+    assert [name for name, _ in helm.config] == ["AppTick"]
+    # still applied by the launch
+    assert alpha.mission.process_config("pHelmIvP").get("CPUAffinity") == "1"
+
+
+def test_ports_do_not_conflict() -> None:
+    mission = Mission.from_file(MISSION_FILE)
+
+    fleet = expand_fleet(
+        mission, {"alpha": {}, "bravo": {"ServerPort": 9001}, "charlie": {}}
+    )
+
+    assert [vehicle.server_port for vehicle in fleet] == [9000, 9001, 9002]
+
+
+@pytest.mark.parametrize(
+    "vehicles",
+    [
+        {"alpha": {"ServerPort": 9005}, "bravo": {"ServerPort": 9005}},
+        {"alpha": {}, "bravo": {"Community": "alpha"}},
+        {"alpha": {"pMissing": {"AppTick": 4}}},
+    ],
+)
+def test_invalid_fleet(vehicles) -> None:
+    with pytest.raises(ValueError):
+        expand_fleet(Mission.from_file(MISSION_FILE), vehicles)
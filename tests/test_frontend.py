@@ -0,0 +1,158 @@
+"""Tests for the XML frontend of the actions and the entity tree cache."""
+
+import asyncio
+from pathlib import Path
+from typing import Iterator
+from typing import List
+
+import pytest
+from launch import LaunchContext
+from launch.frontend import Parser
+
+from launch_moos import MOOSMissionFileDescriptionSource
+from launch_moos.actions import IncludeCachedLaunchDescription
+from launch_moos.actions import IncludeMOOSMission
+from launch_moos.actions import MOOSApp
+from launch_moos.frontend import CachedFrontendLaunchDescriptionSource
+from launch_moos.frontend import clear_frontend_cache
+from launch_moos.frontend import load_launch_file
+
+
+pytest.importorskip("launch_xml")
+
+ALPHA_LAUNCH = """<launch>
+  <let name="vname" value="alpha"/>
+  <moosapp exec="pHelmIvP" alias="pHelmIvP_$(var vname)">
+    <global_config name="Community" value="$(var vname)"/>
+    <config name="AppTick" value="4"/>
+    <config name="behaviors" value="$(var vname).bhv"/>
+  </moosapp>
+  <include_moos_mission file="alpha.moos" staggered="false" preflight="false">
+    <define name="VNAME" value="alpha"/>
+  </include_moos_mission>
+</launch>
+"""
+
+
+@pytest.fixture(autouse=True)
+def empty_cache() -> Iterator[None]:
+    clear_frontend_cache()
+    yield
+    clear_frontend_cache()
+
+
+@pytest.fixture
+def launch_file(tmp_path: Path) -> Path:
+    path = tmp_path / "alpha.launch.xml"
+    path.write_text(ALPHA_LAUNCH)
+    return path
+
+
+def test_moosapp_nested_config(launch_file: Path) -> None:
+    root, parser = load_launch_file(launch_file)
+    description = parser.parse_description(root)
+    app = description.entities[1]
+    assert isinstance(app, MOOSApp)
+
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+    lc.launch_configurations["vname"] = "alpha"
+    app.execute(lc)
+
+    cmd = app.process_details["cmd"]
+    assert cmd[0] == "pHelmIvP"
+    assert cmd[2] == "pHelmIvP_alpha"
+    assert (
+        Path(cmd[1]).read_text()
+        == """Community = alpha
+
+ProcessConfig = pHelmIvP_alpha
+{
+  AppTick = 4
+  behaviors = alpha.bhv
+}
+"""
+    )
+
+
+def test_include_moos_mission(launch_file: Path) -> None:
+    root, parser = load_launch_file(launch_file)
+    include = parser.parse_description(root).entities[2]
+
+    assert isinstance(include, IncludeMOOSMission)
+    assert isinstance(
+        include.launch_description_source, MOOSMissionFileDescriptionSource
+    )
+
+
+def test_tree_cached_by_content(launch_file: Path) -> None:
+    tree = load_launch_file(launch_file)
+    assert load_launch_file(launch_file) is tree
+
+    duplicate = launch_file.with_name("duplicate.launch.xml")
+    duplicate.write_text(ALPHA_LAUNCH)
+    assert load_launch_file(duplicate) is tree
+
+    launch_file.write_text(ALPHA_LAUNCH.replace("alpha", "bravo"))
+    assert load_launch_file(launch_file) is not tree
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"{index}.launch.xml"
+        path.write_text(f'<launch><let name="index" value="{index}"/></launch>')
+        paths.append(path)
+
+    first = load_launch_file(paths[0], max_entries=2)
+    second = load_launch_file(paths[1], max_entries=2)
+    assert load_launch_file(paths[0], max_entries=2) is first
+    load_launch_file(paths[2], max_entries=2)
+
+    assert load_launch_file(paths[0], max_entries=2) is first
+    assert load_launch_file(paths[1], max_entries=2) is not second
+
+
+def test_cached_source(launch_file: Path) -> None:
+    source = CachedFrontendLaunchDescriptionSource(str(launch_file))
+    description = source.get_launch_description(LaunchContext())
+
+    assert [type(entity) for entity in description.entities][1:] == [
+        MOOSApp,
+        IncludeMOOSMission,
+    ]
+
+
+def test_include_cached(
+    tmp_path: Path, launch_file: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    fleet_file = tmp_path / "fleet.launch.xml"
+    fleet_file.write_text(
+        "<launch>\n"
+        + "".join(
+            f'  <include_cached file="{launch_file}">'
+            f'<arg name="vname" value="{vname}"/></include_cached>\n'
+            for vname in ("alpha", "bravo")
+        )
+        + "</launch>\n"
+    )
+
+    root, parser = load_launch_file(fleet_file)
+    includes = parser.parse_description(root).entities
+    assert [type(include) for include in includes] == [
+        IncludeCachedLaunchDescription,
+        IncludeCachedLaunchDescription,
+    ]
+    assert isinstance(
+        includes[0].launch_description_source, CachedFrontendLaunchDescriptionSource
+    )
+
+    # the vehicle file is parsed once for both vehicles
+    loads: List[str] = []
+    load = Parser.load
+    monkeypatch.setattr(
+        Parser, "load", lambda file: loads.append(file.name) or load(file)
+    )
+    for include in includes:
+        include.launch_description_source.get_launch_description(LaunchContext())
+    assert loads == [str(launch_file)]
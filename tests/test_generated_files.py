@@ -0,0 +1,139 @@
+"""Tests for the storage of generated mission files."""
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from launch_moos import generated_files
+from launch_moos.generated_files import DISK
+from launch_moos.generated_files import MEMORY
+from launch_moos.generated_files import GeneratedFileStore
+from launch_moos.generated_files import write_generated_file
+
+
+CONTENT = "ServerPort = 9000\n\nProcessConfig = MOOSDB\n{\n}\n"
+
+
+def test_disk_backend() -> None:
+    generated = write_generated_file(CONTENT, DISK)
+
+    assert not generated.in_memory
+    assert Path(generated.path).read_text() == CONTENT
+
+    generated.close()
+    assert not Path(generated.path).exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "memfd_create"), reason="needs memfd_create")
+def test_memory_backend_readable_by_apps() -> None:
+    generated = write_generated_file(CONTENT, MEMORY)
+
+    assert generated.in_memory
+    assert generated.path.startswith(f"/proc/{os.getpid()}/fd/")
+    # apps do not inherit the descriptor but open it through /proc
+    result = subprocess.run(
+        ["cat", generated.path], capture_output=True, text=True, close_fds=True
+    )
+    assert result.stdout == CONTENT
+
+    generated.write("ServerPort = 9001\n")
+    assert Path(generated.path).read_text() == "ServerPort = 9001\n"
+    generated.close()
+
+
+def test_memory_backend_falls_back_to_tmpfs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delattr(os, "memfd_create", raising=False)
+    monkeypatch.setattr(generated_files, "TMPFS_DIR", tmp_path)
+
+    generated = write_generated_file(CONTENT, MEMORY)
+
+    assert not generated.in_memory
+    assert Path(generated.path).parent == tmp_path
+    assert Path(generated.path).read_text() == CONTENT
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError):
+        write_generated_file(CONTENT, "floppy")
+
+
+def test_store_reuses_identical_contents(tmp_path: Path) -> None:
+    store = GeneratedFileStore(tmp_path)
+
+    first = store.acquire(CONTENT)
+    second = store.acquire(CONTENT)
+    other = store.acquire("ServerPort = 9001\n")
+
+    assert first.path == second.path != other.path
+    assert Path(first.path).read_text() == CONTENT
+    # written under a temporary name then renamed
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        Path(generated.path).name for generated in (first, other)
+    )
+    assert store.references(first.path) == 2
+    with pytest.raises(ValueError):
+        first.write("ServerPort = 9002\n")
+
+
+def test_store_references(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(generated_files, "STORE_GRACE_PERIOD", 0.0)
+    store = GeneratedFileStore(tmp_path, max_size=0)
+
+    generated = store.acquire(CONTENT)
+    assert store.retain(generated.path)
+    assert not store.retain(str(tmp_path / "elsewhere.moos"))
+
+    generated.close()
+    assert Path(generated.path).exists()
+    store.release(generated.path)
+    assert not Path(generated.path).exists()
+
+
+def test_store_size_cap(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(generated_files, "STORE_GRACE_PERIOD", 0.0)
+    store = GeneratedFileStore(tmp_path, max_size=len(CONTENT))
+
+    old = store.acquire("ServerPort = 9001\n")
+    os.utime(old.path, (0, 0))
+    recent = store.acquire(CONTENT)
+    running = store.acquire("ServerPort = 9002\n")
+    old.close()
+    recent.close()
+
+    # the least recently used file goes first, referenced files stay
+    assert not Path(old.path).exists()
+    assert Path(recent.path).exists()
+    assert Path(running.path).exists()
+
+    store.close()
+    store.clear()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_store_grace_period(tmp_path: Path) -> None:
+    store = GeneratedFileStore(tmp_path, max_size=0)
+
+    store.acquire(CONTENT).close()
+
+    # another launch may be starting apps with it
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_store_files_removed_concurrently(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(generated_files, "STORE_GRACE_PERIOD", 0.0)
+    store = GeneratedFileStore(tmp_path, max_size=0)
+    # a file another launch removes while this one evicts
+    (tmp_path / "gone.moos").symlink_to(tmp_path / "missing.moos")
+
+    generated = store.acquire(CONTENT)
+    generated.close()
+    assert not Path(generated.path).exists()
+
+    monkeypatch.setattr(Path, "glob", lambda self, pattern: iter([self / "gone.moos"]))
+    (tmp_path / "gone.moos").unlink()
+    store.clear()
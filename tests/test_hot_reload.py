@@ -0,0 +1,145 @@
+"""Tests for hot-reloading changed ProcessConfig blocks."""
+
+import asyncio
+import shutil
+from pathlib import Path
+
+from launch import LaunchContext
+from launch.actions import EmitEvent
+from launch.actions import RegisterEventHandler
+
+from launch_moos import MOOSMissionFileDescriptionSource
+from launch_moos.actions import HotReloadMission
+from launch_moos.actions import MOOSApp
+from launch_moos.cache import ParseCache
+from launch_moos.community import MOOSCommunity
+from launch_moos.mission import Mission
+from launch_moos.transform import mission_to_actions
+from launch_moos.transform import mission_to_staggered_launch
+
+
+MISSION_FILE = Path(__file__).parent / "moos_files" / "s15_pedi_alpha.moos"
+NSPLUG_DIR = MISSION_FILE.parent / "nsplug"
+
+
+def test_reload_restarts_changed_apps(tmp_path: Path) -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    mission_file = tmp_path / "alpha.moos"
+    text = MISSION_FILE.read_text()
+    mission_file.write_text(text)
+    mission = Mission.from_string(text)
+    community = MOOSCommunity(mission.global_config)
+    apps = mission_to_actions(mission, community)
+    for app in apps:
+        app.execute(lc)
+    action = HotReloadMission(
+        mission_file=mission_file,
+        apps={run.name: app for run, app in zip(mission.runs, apps)},
+        community=community,
+    )
+
+    assert action.reload(lc, text.replace("= 9000", "= 9001")) is None
+    actions = action.reload(lc, text.replace("= alpha.bhv", "= bravo.bhv"))
+
+    helm = action.apps["pHelmIvP"]
+    assert helm is not apps[4]
+    assert isinstance(helm, MOOSApp)
+    # the running app is shut down, the new one starts when it exits
+    assert [type(a) for a in actions] == [RegisterEventHandler, EmitEvent]
+    assert action.apps["MOOSDB"] is apps[0]
+
+    shared_file = Path(community.get_mission_file(lc))
+    assert "bravo.bhv" in shared_file.read_text()
+    helm.execute(lc)
+    assert helm.process_details["cmd"][1] == str(shared_file)
+
+
+def test_reload_invalid_mission(tmp_path: Path) -> None:
+    mission_file = tmp_path / "alpha.moos"
+    mission_file.write_text(MISSION_FILE.read_text())
+    mission = Mission.from_file(mission_file)
+    community = MOOSCommunity(mission.global_config)
+    apps = mission_to_actions(mission, community)
+    action = HotReloadMission(
+        mission_file=mission_file,
+        apps={run.name: app for run, app in zip(mission.runs, apps)},
+        community=community,
+    )
+
+    assert action.reload(LaunchContext(), "ProcessConfig = pHelmIvP\n{\n") is None
+    assert action.apps["pHelmIvP"] is apps[4]
+
+
+def test_description_source_hot_reload(tmp_path: Path) -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    source = MOOSMissionFileDescriptionSource(
+        str(MISSION_FILE),
+        parse_cache=ParseCache(tmp_path),
+        hot_reload=True,
+        preflight=False,
+    )
+    entities = source.get_launch_description(lc).entities
+
+    assert isinstance(entities[-1], HotReloadMission)
+    assert list(entities[-1].apps) == [
+        run.name for run in Mission.from_file(MISSION_FILE).runs
+    ]
+
+
+def test_description_source_reloads_included_files(tmp_path: Path) -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    nsplug = tmp_path / "nsplug"
+    shutil.copytree(NSPLUG_DIR, nsplug)
+    mission_file = nsplug / "meta_vehicle.moos"
+    plug = nsplug / "plug_pLogger.moos"
+    source = MOOSMissionFileDescriptionSource(
+        str(mission_file),
+        parse_cache=ParseCache(tmp_path / "cache"),
+        hot_reload=True,
+        staggered=False,
+        preflight=False,
+        macros={"VNAME": "alpha", "VPORT": "9000"},
+    )
+    action = source.get_launch_description(lc).entities[-1]
+    assert isinstance(action, HotReloadMission)
+    moosdb, logger_app = action.apps["MOOSDB"], action.apps["pLogger"]
+
+    # the block of pLogger lives in an included file
+    plug.write_text(plug.read_text().replace("AppTick   = 8", "AppTick   = 2"))
+    action.reload(lc, mission_file.read_text())
+
+    assert action.apps["pLogger"] is not logger_app
+    assert action.apps["MOOSDB"] is moosdb
+
+
+def test_reload_app_not_started(tmp_path: Path) -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    mission_file = tmp_path / "alpha.moos"
+    text = MISSION_FILE.read_text()
+    mission_file.write_text(text)
+    mission = Mission.from_string(text)
+    community = MOOSCommunity(mission.global_config)
+    apps = mission_to_actions(mission, community)
+    launcher = mission_to_staggered_launch(mission, apps)
+    action = HotReloadMission(
+        mission_file=mission_file,
+        apps={run.name: app for run, app in zip(mission.runs, apps)},
+        community=community,
+        launcher=launcher,
+    )
+
+    actions = action.reload(lc, text.replace("= alpha.bhv", "= bravo.bhv"))
+
+    # started by the launcher in place of the old app, which never runs
+    assert actions == []
+    helm = action.apps["pHelmIvP"]
+    assert helm is not apps[4]
+    assert launcher.apps == [*apps[:4], helm, *apps[5:]]
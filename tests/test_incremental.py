@@ -0,0 +1,93 @@
+"""Tests for incremental re-parsing of mission files."""
+
+from pathlib import Path
+
+import pyparsing as pp
+import pytest
+
+from launch_moos.incremental import IncrementalParser
+from launch_moos.incremental import MissionDiff
+from launch_moos.mission import Mission
+
+
+MISSION_FILE = Path(__file__).parent / "moos_files" / "s15_pedi_alpha.moos"
+
+
+def test_first_update_adds_everything() -> None:
+    text = MISSION_FILE.read_text()
+    parser = IncrementalParser()
+
+    diff = parser.update(text)
+
+    assert parser.mission == Mission.from_string(text)
+    assert "pHelmIvP" in diff.added
+    assert not diff.removed
+    assert not diff.modified
+    assert "serverport" in diff.globals_changed
+
+
+def test_unchanged_blocks_are_reused() -> None:
+    text = MISSION_FILE.read_text()
+    parser = IncrementalParser()
+    parser.update(text)
+    logger = parser.mission.process_config("pLogger")
+
+    edited = text.replace("behaviors  = alpha.bhv", "behaviors = b.bhv")
+    diff = parser.update(edited)
+
+    assert parser.mission.process_config("pLogger") is logger
+    assert diff == MissionDiff(modified={"pHelmIvP": ("behaviors",)})
+    assert diff.affected == ("pHelmIvP",)
+    assert parser.mission == Mission.from_string(edited)
+
+
+def test_added_removed_and_runs() -> None:
+    parser = IncrementalParser()
+    parser.update(
+        "ServerPort = 9000\n"
+        "ProcessConfig = ANTLER\n{\n  Run = pLogger @ NewConsole = false\n}\n"
+        "ProcessConfig = pLogger\n{\n  AppTick = 8\n}\n"
+    )
+
+    diff = parser.update(
+        "ServerPort = 9001\n"
+        "ProcessConfig = ANTLER\n{\n  Run = pHelmIvP @ NewConsole = false\n}\n"
+        "ProcessConfig = pHelmIvP\n{\n  AppTick = 4\n}\n"
+    )
+
+    assert diff == MissionDiff(
+        added=("pHelmIvP",),
+        removed=("pLogger",),
+        modified={"ANTLER": ("run",)},
+        globals_changed=("serverport",),
+    )
+
+
+def test_comment_edit_is_not_a_change() -> None:
+    parser = IncrementalParser()
+    parser.update("ProcessConfig = pLogger\n{\n  AppTick = 8 // fast\n}\n")
+
+    diff = parser.update("ProcessConfig = pLogger\n{\n  AppTick = 8 // slow\n}\n")
+
+    assert not diff
+    assert parser.mission.process_config("pLogger").get("AppTick") == "8"
+
+
+def test_repeated_keys() -> None:
+    parser = IncrementalParser()
+    parser.update("ProcessConfig = pHelmIvP\n{\n  domain = x\n  domain = y\n}\n")
+
+    diff = parser.update("ProcessConfig = pHelmIvP\n{\n  domain = x\n  DOMAIN = z\n}\n")
+
+    assert diff.modified == {"pHelmIvP": ("domain",)}
+
+
+def test_invalid_update_keeps_previous_version() -> None:
+    parser = IncrementalParser()
+    parser.update("ProcessConfig = pLogger\n{\n  AppTick = 8\n}\n")
+    mission = parser.mission
+
+    with pytest.raises(pp.ParseException):
+        parser.update("ProcessConfig = pLogger\n{\n  AppTick = 8\n")
+
+    assert parser.mission is mission
@@ -6,9 +6,30 @@ from pathlib import Path
 import pytest
 from launch import LaunchContext
 from launch.actions import IncludeLaunchDescription
+from launch.event import Event
+from launch.events import Shutdown
+from launch.events.process import ProcessExited
+from launch.events.process import ProcessIO
+from launch.substitutions import TextSubstitution
 
 from launch_moos import MOOSMissionFileDescriptionSource
 from launch_moos.actions.moosapp import MOOSApp
+from launch_moos.community import MOOSCommunity
+from launch_moos.generated_files import GeneratedFileStore
+from launch_moos.mission import Assignment
+from launch_moos.output import OutputBatching
+
+
+def handle(lc: LaunchContext, event: Event) -> None:
+    """Run the handlers registered in the context that match an event."""
+    for handler in list(lc._event_handlers):
+        if handler.matches(event):
+            handler.handle(event, lc)
+
+
+def shutdown(lc: LaunchContext) -> None:
+    """Run the shutdown handlers registered in the context."""
+    handle(lc, Shutdown())
 
 
 def test_moosapp_args() -> None:
@@ -88,5 +109,176 @@ ProcessConfig = pHelmIvP
     )
 
 
+def test_moosapp_alias_process_config() -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    timer_app = MOOSApp(
+        executable="uTimerScript",
+        alias="uTimerScript_SensorConfig",
+        config=[Assignment("AppTick", "4")],
+    )
+
+    timer_app.execute(lc)
+    moos_file = timer_app.process_details["cmd"][1]
+
+    assert timer_app.process_details["cmd"][2] == "uTimerScript_SensorConfig"
+    assert "ProcessConfig = uTimerScript_SensorConfig\n{\n  AppTick = 4\n}\n" in (
+        Path(moos_file).read_text()
+    )
+
+
 def test_include_mission_file() -> None:
     desc = MOOSMissionFileDescriptionSource("alpha.moos")
+
+
+def test_moosapp_community_mission_file() -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    community = MOOSCommunity(global_config=[("Community", "alpha")])
+    moosdb_app = MOOSApp(executable="MOOSDB", community=community)
+    helmivp_app = MOOSApp(
+        executable="pHelmIvP",
+        config=[("AppTick", 4), ("behaviors", "alpha.bhv")],
+        community=community,
+    )
+
+    moosdb_app.execute(lc)
+    helmivp_app.execute(lc)
+
+    moos_file = moosdb_app.process_details["cmd"][1]
+    assert helmivp_app.process_details["cmd"][1] == moos_file
+    assert community.mission_file == moos_file
+    assert (
+        Path(moos_file).read_text()
+        == """Community = alpha
+
+ProcessConfig = MOOSDB
+{
+}
+
+ProcessConfig = pHelmIvP
+{
+  AppTick = 4
+  behaviors = alpha.bhv
+}
+"""
+    )
+
+    with pytest.raises(ValueError):
+        MOOSApp(executable="pLogger", global_config=[], community=community)
+
+
+def test_moosapp_in_memory_mission_file() -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    community = MOOSCommunity(
+        global_config=[("Community", "alpha")], file_backend="memory"
+    )
+    moosdb_app = MOOSApp(executable="MOOSDB", community=community)
+    logger_app = MOOSApp(executable="pLogger", file_backend="memory")
+
+    moosdb_app.execute(lc)
+    logger_app.execute(lc)
+
+    moos_file = moosdb_app.process_details["cmd"][1]
+    assert moos_file.startswith("/proc/")
+    assert Path(moos_file).read_text().startswith("Community = alpha\n")
+    logger_file = logger_app.process_details["cmd"][1]
+    assert "ProcessConfig = pLogger\n" in Path(logger_file).read_text()
+
+    shutdown(lc)
+    assert community.mission_file is None
+    assert not Path(moos_file).exists()
+    assert not Path(logger_file).exists()
+
+
+def test_moosapp_mission_file_removed_on_shutdown() -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    logger_app = MOOSApp(executable="pLogger")
+    logger_app.execute(lc)
+    moos_file = Path(logger_app.process_details["cmd"][1])
+    assert moos_file.exists()
+
+    # the app was never started, the launch shuts down
+    shutdown(lc)
+    assert not moos_file.exists()
+
+
+@pytest.mark.parametrize("respawn", ["true", "false"])
+def test_moosapp_respawn_substitution(respawn: str) -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    # as given by launch files
+    logger_app = MOOSApp(executable="pLogger", respawn=[TextSubstitution(text=respawn)])
+    logger_app.execute(lc)
+    moos_file = Path(logger_app.process_details["cmd"][1])
+
+    handle(
+        lc,
+        ProcessExited(
+            action=logger_app,
+            returncode=0,
+            **{
+                key: logger_app.process_details[key]
+                for key in ("name", "cmd", "cwd", "env")
+            },
+            pid=1,
+        ),
+    )
+    # kept for the next run of a respawning app
+    assert moos_file.exists() == (respawn == "true")
+
+
+def test_moosapp_file_store(tmp_path: Path) -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    store = GeneratedFileStore(tmp_path)
+    community = MOOSCommunity(global_config=[("Community", "alpha")], file_store=store)
+    moosdb_app = MOOSApp(executable="MOOSDB", community=community)
+    logger_app = MOOSApp(executable="pLogger", community=community)
+
+    moosdb_app.execute(lc)
+    logger_app.execute(lc)
+
+    moos_file = community.mission_file
+    assert Path(moos_file).parent == tmp_path
+    # the community and both apps
+    assert store.references(moos_file) == 3
+
+    # an app restarted with the file of the community, as by HotReloadMission
+    restarted_app = MOOSApp(
+        executable="pLogger", mission_file=moos_file, community=community
+    )
+    restarted_app.execute(lc)
+    assert store.references(moos_file) == 4
+
+
+def test_batched_output() -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    app = MOOSApp(
+        executable="echo",
+        mission_file="alpha.moos",
+        output="screen",
+        output_batching=OutputBatching(),
+    )
+    app.execute(lc)
+    pipeline = app.output_pipeline
+    assert pipeline is not None
+
+    details = {key: app.process_details[key] for key in ("name", "cmd", "cwd", "env")}
+    handle(lc, ProcessIO(action=app, pid=1, text=b"one\ntwo\n", fd=1, **details))
+    handle(lc, ProcessIO(action=app, pid=1, text=b"oops\n", fd=2, **details))
+
+    # handed to the pipeline, rather than logged line by line by ExecuteLocal
+    assert app.output == {"both": set()}
+    assert pipeline.flush() == 3
+    pipeline.stop()
@@ -0,0 +1,89 @@
+"""Tests for the sampling of the resource use of apps."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from launch_moos import metrics
+from launch_moos.metrics import ResourceSampler
+
+
+STAT = b"4242 (p Helm) IvP) S 1 4242 4242 0 -1 4194560 300 0 0 0 150 50 0 0 20 0 1\n"
+STATUS = b"Name:\tpHelmIvP\nVmPeak:\t  20000 kB\nVmRSS:\t    5120 kB\nThreads:\t1\n"
+IO = (
+    b"rchar: 100\nwchar: 200\nsyscr: 1\nsyscw: 2\nread_bytes: 4096\nwrite_bytes: 8192\n"
+)
+
+
+def fake_proc(tmp_path: Path, pid: int, stat: bytes = STAT) -> None:
+    process = tmp_path / str(pid)
+    process.mkdir(exist_ok=True)
+    (process / "stat").write_bytes(stat)
+    (process / "status").write_bytes(STATUS)
+    (process / "io").write_bytes(IO)
+
+
+def test_sample(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(metrics, "_CLOCK_TICKS", 100)
+    fake_proc(tmp_path, 4242)
+    sampler = ResourceSampler(history=2, proc_dir=tmp_path)
+    sampler.add("pHelmIvP", 4242)
+
+    sampler.sample()
+    fake_proc(tmp_path, 4242, STAT.replace(b" 150 50 ", b" 250 50 "))
+    sampler.sample()
+    sampler.sample()
+
+    first, second = sampler.history("pHelmIvP")
+    assert first.cpu_percent > 0
+    assert second.cpu_percent == 0
+    assert second.rss_bytes == 5120 * 1024
+    assert (second.read_bytes, second.write_bytes) == (4096, 8192)
+
+
+def test_exited_app_keeps_its_history(tmp_path: Path) -> None:
+    fake_proc(tmp_path, 4242)
+    sampler = ResourceSampler(proc_dir=tmp_path)
+    sampler.add("pHelmIvP", 4242)
+    sampler.sample()
+
+    for path in (tmp_path / "4242").iterdir():
+        path.unlink()
+    sampler.sample()
+
+    assert sampler.apps == {"pHelmIvP": None}
+    assert len(sampler.history("pHelmIvP")) == 1
+
+
+def test_sample_running_process() -> None:
+    process = subprocess.Popen([sys.executable, "-c", "input()"], stdin=subprocess.PIPE)
+    try:
+        sampler = ResourceSampler()
+        sampler.add("child", process.pid)
+        sampler.add("launch", os.getpid())
+        sampler.sample()
+    finally:
+        process.communicate(b"\n")
+
+    (child,) = sampler.history("child")
+    (launch,) = sampler.history("launch")
+    assert 0 < child.rss_bytes < launch.rss_bytes * 10
+
+
+def test_exports(tmp_path: Path) -> None:
+    fake_proc(tmp_path, 4242)
+    sampler = ResourceSampler(proc_dir=tmp_path)
+    sampler.add('p"Helm', 4242)
+    sampler.sample()
+
+    sampler.write_prometheus(tmp_path / "metrics.prom")
+    text = (tmp_path / "metrics.prom").read_text()
+    assert "# TYPE launch_moos_app_rss_bytes gauge\n" in text
+    assert 'launch_moos_app_rss_bytes{app="p\\"Helm"} 5242880\n' in text
+    assert 'launch_moos_app_write_bytes_total{app="p\\"Helm"} 8192\n' in text
+
+    sampler.write_json(tmp_path / "metrics.json")
+    snapshot = json.loads((tmp_path / "metrics.json").read_text())
+    assert snapshot['p"Helm']["pid"] == 4242
+    assert snapshot['p"Helm']["samples"][0]["rss_bytes"] == 5242880
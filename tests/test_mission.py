@@ -0,0 +1,104 @@
+"""Tests for the mission file model."""
+
+import pickle
+from pathlib import Path
+
+import pytest
+
+from launch_moos.mission import AntlerRun
+from launch_moos.mission import Assignment
+from launch_moos.mission import Mission
+from launch_moos.mission import ProcessConfig
+from launch_moos.parser import parse_mission
+
+
+MISSION_FILE = Path(__file__).parent / "moos_files" / "s15_pedi_alpha.moos"
+
+
+def test_mission_from_file() -> None:
+    mission = Mission.from_file(MISSION_FILE)
+
+    assert mission.get_global("ServerPort") == "9000"
+    assert mission.get_global("community") == "alpha"
+    assert mission.get_global("Missing", "default") == "default"
+    assert len(mission.global_config) == 6
+
+    assert [run.executable for run in mission.runs] == [
+        "MOOSDB",
+        "pLogger",
+        "uSimMarine",
+        "pMarinePID",
+        "pHelmIvP",
+        "pMarineViewer",
+        "uProcessWatch",
+        "pNodeReporter",
+        "uMemWatch",
+    ]
+    assert mission.antler is not None
+    assert mission.antler.get("MSBetweenLaunches") == "200"
+    assert mission.runs[0].param("newconsole") == "false"
+
+    helm = mission.process_config("pHelmIvP")
+    assert helm is not None
+    assert "pHelmIvP" in mission
+    assert helm.get("behaviors") == "alpha.bhv"
+    assert helm.get_all("domain") == ["course:0:359:360", "speed:0:4:41"]
+    assert list(helm.config[0]) == ["AppTick", "4"]
+
+    # trailing whitespace before comments is dropped
+    mem_watch = mission.process_config("uMemWatch")
+    assert mem_watch is not None
+    assert mem_watch.get("absolute_time_gap") == "1"
+
+    assert mission.process_config("pMissing") is None
+
+
+@pytest.mark.parametrize("backend", ["pyparsing", "tokenizer"])
+def test_mission_backends_agree(backend: str) -> None:
+    text = MISSION_FILE.read_text()
+
+    mission = Mission.from_string(text, backend=backend)
+
+    assert mission == Mission.from_parse_results(parse_mission(text))
+
+
+def test_mission_records_round_trip() -> None:
+    mission = Mission.from_file(MISSION_FILE)
+
+    assert Mission.from_records(mission.to_records()) == mission
+    assert pickle.loads(pickle.dumps(mission)) == mission  # noqa: S301
+
+
+def test_antler_run() -> None:
+    mission = Mission.from_string(
+        "ProcessConfig = ANTLER\n{\n"
+        "  Run = pHelmIvP @ NewConsole = true, ExtraProcessParams=HParams\n"
+        "  Run = uTimerScript @ NewConsole = false ~uTimerScript_SensorConfig\n"
+        "}\n"
+    )
+
+    helm, timer = mission.runs
+    assert helm == AntlerRun(
+        "pHelmIvP",
+        (
+            Assignment("NewConsole", "true"),
+            Assignment("ExtraProcessParams", "HParams"),
+        ),
+    )
+    assert helm.name == "pHelmIvP"
+    assert helm.param("ExtraProcessParams") == "HParams"
+    assert timer.moosname == "uTimerScript_SensorConfig"
+    assert timer.name == "uTimerScript_SensorConfig"
+
+
+def test_first_block_wins() -> None:
+    mission = Mission(
+        process_configs=(
+            ProcessConfig("pLogger", (Assignment("AppTick", "8"),)),
+            ProcessConfig("pLogger", (Assignment("AppTick", "4"),)),
+        )
+    )
+
+    block = mission.process_config("pLogger")
+    assert block is not None
+    assert block.get("AppTick") == "8"
@@ -1,11 +1,16 @@
 """Tests for the MOOS Mission File Generator."""
+import os
+from pathlib import Path
 
 import pytest
 
+from launch_moos.moosfile_generator import COMMUNITY_FILE_TEMPLATE
+from launch_moos.moosfile_generator import MISSION_FILE_TEMPLATE
+from launch_moos.moosfile_generator import evaluate_community_template
 from launch_moos.moosfile_generator import evaluate_template
+from launch_moos.moosfile_generator import expand_template
 
 
-@pytest.mark.skip  # empy has troubles with this
 def test_moosapp_generate_mission_file(capsys) -> None:
     output = evaluate_template(
         {
@@ -47,3 +52,60 @@ ProcessConfig = pHelmIvP
 }
 """
     )
+
+
+GLOBAL_VARIABLES = [("ServerHost", "localhost"), ("ServerPort", 9000), ("Empty", None)]
+PROCESS_VARIABLES = [("AppTick", 4), ("LatOrigin", 43.825300), ("domain", "a:0:1")]
+
+
+@pytest.fixture
+def empy(monkeypatch: pytest.MonkeyPatch) -> None:
+    em = pytest.importorskip("em")
+    # empy installs its sys.stdout proxy once per process and refuses to run
+    # after pytest has swapped sys.stdout for the capture of another test
+    monkeypatch.setattr(em.Interpreter, "_wasProxyInstalled", False)
+
+
+@pytest.mark.parametrize("count", [0, 1, 50])
+def test_renderer_matches_empy(empy: None, count: int) -> None:
+    data = {
+        "process_name": "pHelmIvP",
+        "global_variables": GLOBAL_VARIABLES,
+        "process_variables": PROCESS_VARIABLES * count,
+    }
+
+    assert evaluate_template(data) == evaluate_template(data, use_empy=True)
+
+
+def test_community_renderer_matches_empy(empy: None) -> None:
+    data = {
+        "global_variables": GLOBAL_VARIABLES,
+        "processes": [
+            ("MOOSDB", []),
+            ("pHelmIvP", PROCESS_VARIABLES),
+            ("uTimerScript_SensorConfig", PROCESS_VARIABLES[:1]),
+        ],
+    }
+
+    output = evaluate_community_template(data)
+    assert output == evaluate_template(
+        data, template=COMMUNITY_FILE_TEMPLATE, use_empy=True
+    )
+    assert output.startswith("ServerHost = localhost\nServerPort = 9000\nEmpty = \n")
+    assert "\nProcessConfig = MOOSDB\n{\n}\n" in output
+
+
+def test_expand_template_skips_unchanged(tmp_path: Path) -> None:
+    data = {
+        "process_name": "pHelmIvP",
+        "global_variables": GLOBAL_VARIABLES,
+        "process_variables": PROCESS_VARIABLES,
+    }
+    output_file = tmp_path / "missions" / "helm.moos"
+
+    assert expand_template(MISSION_FILE_TEMPLATE, data, output_file)
+    assert output_file.read_text() == evaluate_template(data)
+    os.utime(output_file, (0, 0))
+
+    assert not expand_template(MISSION_FILE_TEMPLATE, data, output_file)
+    assert output_file.stat().st_mtime == 0
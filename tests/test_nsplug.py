@@ -0,0 +1,113 @@
+"""Tests for the nsplug-compatible preprocessor."""
+
+from pathlib import Path
+
+import pytest
+
+from launch_moos.mission import Mission
+from launch_moos.nsplug import PreprocessError
+from launch_moos.nsplug import Preprocessor
+
+
+META_VEHICLE = Path(__file__).parent / "moos_files" / "nsplug" / "meta_vehicle.moos"
+
+
+@pytest.mark.parametrize(
+    "vname,lat_origin", [("alpha", "43.825300"), ("bravo", "43.826000"), ("x", "0")]
+)
+def test_preprocess_file(vname: str, lat_origin: str) -> None:
+    text = Preprocessor().preprocess_file(META_VEHICLE, {"VNAME": vname, "VPORT": "1"})
+    mission = Mission.from_string(text)
+
+    assert mission.get_global("Community") == vname
+    assert mission.get_global("ServerPort") == "1"
+    assert mission.get_global("LatOrigin") == lat_origin
+    # defined by the included file
+    assert mission.get_global("MissingOrigin") is None
+
+    logger = mission.process_config("pLogger")
+    assert logger is not None
+    assert logger.get("File") == f"LOG_{vname.upper()}"
+    # only the <pLogger> section of the plug is included
+    assert "pUnused" not in mission
+
+
+def test_undefined_macros() -> None:
+    assert Preprocessor().preprocess("ServerPort = $(VPORT)\n") == (
+        "ServerPort = $(VPORT)\n"
+    )
+    with pytest.raises(PreprocessError):
+        Preprocessor(strict=True).preprocess("ServerPort = $(VPORT)\n")
+
+
+def test_define_and_conditions() -> None:
+    text = (
+        "#define SPEED 2\n"
+        "#ifdef SPEED 1 || SPEED 2\n"
+        "speed = $(SPEED)\n"
+        "#ifndef SLOW\n"
+        "fast = true\n"
+        "#endif\n"
+        "#else\n"
+        "speed = 0\n"
+        "#endif\n"
+        "  #ifdef SLOW\n"
+        "slow = true\n"
+        "#endif\n"
+    )
+
+    assert Preprocessor().preprocess(text) == "speed = 2\nfast = true\n"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "#ifdef A\n",
+        "#endif\n",
+        "#else\n",
+        "#include missing.moos\n",
+    ],
+)
+def test_invalid(text: str) -> None:
+    with pytest.raises(PreprocessError):
+        Preprocessor().preprocess(text)
+
+
+def test_include_cycle(tmp_path: Path) -> None:
+    (tmp_path / "a.moos").write_text("#include b.moos\n")
+    (tmp_path / "b.moos").write_text("#include a.moos\n")
+
+    with pytest.raises(PreprocessError):
+        Preprocessor().preprocess_file(tmp_path / "a.moos")
+
+
+def test_include_not_utf8(tmp_path: Path) -> None:
+    (tmp_path / "a.moos").write_text("#include b.moos\n")
+    (tmp_path / "b.moos").write_bytes("Community = caf\xe9\n".encode("latin-1"))
+
+    with pytest.raises(PreprocessError, match="b.moos"):
+        Preprocessor().preprocess_file(tmp_path / "a.moos")
+
+
+def test_include_paths(tmp_path: Path) -> None:
+    (tmp_path / "plugs").mkdir()
+    (tmp_path / "plugs" / "plug.moos").write_text("a = 1\n")
+
+    text = Preprocessor([tmp_path / "plugs"]).preprocess("#include plug.moos\n")
+
+    assert text == "a = 1\n"
+
+
+def test_included_files_read_once(tmp_path: Path) -> None:
+    plug = tmp_path / "plug.moos"
+    plug.write_text("Community = $(VNAME)\n")
+    (tmp_path / "alpha.moos").write_text("#include plug.moos\n")
+    (tmp_path / "bravo.moos").write_text("#include plug.moos\nServerPort = 9001\n")
+    preprocessor = Preprocessor()
+
+    alpha = preprocessor.preprocess_file(tmp_path / "alpha.moos", {"VNAME": "a"})
+    plug.write_text("changed\n")
+    bravo = preprocessor.preprocess_file(tmp_path / "bravo.moos", {"VNAME": "b"})
+
+    assert alpha == "Community = a\n"
+    assert bravo == "Community = b\nServerPort = 9001\n"
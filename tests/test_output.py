@@ -0,0 +1,146 @@
+"""Tests for the batched output of apps."""
+import asyncio
+import logging
+from typing import List
+from typing import Tuple
+
+import pytest
+
+from launch_moos.output import STDERR
+from launch_moos.output import STDOUT
+from launch_moos.output import OutputBatching
+from launch_moos.output import OutputMatcher
+from launch_moos.output import OutputPipeline
+
+
+class RecordingLogger(logging.Logger):
+    """Logger keeping the level and message of every record."""
+
+    def __init__(self, name: str = "app") -> None:
+        """Create a RecordingLogger."""
+        super().__init__(name)
+        self.records: List[Tuple[int, str]] = []
+
+    def _log(self, level, msg, args, **kwargs) -> None:  # type: ignore[override]
+        self.records.append((level, msg))
+
+
+def test_lines_are_flushed_in_batches() -> None:
+    logger = RecordingLogger()
+    pipeline = OutputPipeline(logger)
+
+    pipeline.feed(STDOUT, b"first\nsec")
+    pipeline.feed(STDOUT, b"ond\nthird")
+    pipeline.feed(STDERR, b"oops\n")
+
+    assert pipeline.flush() == 3
+    assert logger.records == [(logging.INFO, "first\nsecond"), (logging.INFO, "oops")]
+
+    pipeline.stop()
+    assert logger.records[-1] == (logging.INFO, "third")
+
+
+def test_full_ring_buffer_drops_oldest_lines() -> None:
+    logger = RecordingLogger()
+    pipeline = OutputPipeline(logger, OutputBatching(ring_size=2))
+
+    pipeline.feed(STDOUT, b"1\n2\n3\n")
+    pipeline.feed(STDOUT, b"4\n")
+    pipeline.flush()
+
+    assert pipeline.dropped == {STDOUT: 2, STDERR: 0}
+    assert logger.records == [
+        (logging.INFO, "3\n4"),
+        (logging.WARNING, "dropped 2 lines of stdout"),
+    ]
+
+
+def test_rate_limit() -> None:
+    now = 0.0
+    logger = RecordingLogger()
+    pipeline = OutputPipeline(
+        logger, OutputBatching(max_lines_per_second=10), clock=lambda: now
+    )
+
+    pipeline.feed(STDOUT, b"line\n" * 15)
+    assert pipeline.dropped[STDOUT] == 5
+
+    now = 0.5
+    pipeline.feed(STDOUT, b"line\n" * 15)
+    assert pipeline.dropped[STDOUT] == 15
+    assert pipeline.flush() == 15
+
+
+def test_matchers_run_on_their_lines() -> None:
+    matches = []
+    deploy = OutputMatcher(
+        r"DEPLOY=(\w+)",
+        lambda stream, match: matches.append((stream, match.group(1))),
+        streams=[STDOUT],
+        contains="DEPLOY",
+    )
+    pipeline = OutputPipeline(RecordingLogger(), OutputBatching(matchers=[deploy]))
+
+    pipeline.feed(STDOUT, b"NAV_X=1\nDEPLOY=true\n")
+    pipeline.feed(STDERR, b"DEPLOY=false\n")
+    pipeline.flush()
+
+    assert matches == [(STDOUT, "true")]
+
+
+def test_periodic_flush() -> None:
+    logger = RecordingLogger()
+    pipeline = OutputPipeline(logger, OutputBatching(flush_interval=0.01))
+
+    async def run() -> None:
+        pipeline.start(asyncio.get_running_loop())
+        pipeline.feed(STDOUT, b"hello\n")
+        await asyncio.sleep(0.05)
+        pipeline.stop()
+
+    asyncio.run(run())
+    assert logger.records == [(logging.INFO, "hello")]
+
+
+def test_streams_have_their_own_logger() -> None:
+    logger = RecordingLogger()
+    stdout_logger = RecordingLogger("app-stdout")
+    stderr_logger = RecordingLogger("app-stderr")
+    pipeline = OutputPipeline(
+        logger,
+        OutputBatching(ring_size=1),
+        stream_loggers={STDOUT: stdout_logger, STDERR: stderr_logger},
+        prefix="[app] ",
+    )
+
+    pipeline.feed(STDOUT, b"hello\n")
+    pipeline.feed(STDERR, b"oops\nfailed\n")
+    pipeline.flush()
+
+    assert stdout_logger.records == [(logging.INFO, "[app] hello")]
+    assert stderr_logger.records == [(logging.INFO, "[app] failed")]
+    assert logger.records == [(logging.WARNING, "dropped 1 lines of stderr")]
+
+
+def test_restart_after_stop() -> None:
+    logger = RecordingLogger()
+    pipeline = OutputPipeline(logger, OutputBatching(flush_interval=0.01))
+
+    async def run() -> None:
+        loop = asyncio.get_running_loop()
+        pipeline.start(loop)
+        pipeline.start(loop)
+        pipeline.stop()
+        # as when the app respawns
+        pipeline.start(loop)
+        pipeline.feed(STDOUT, b"again\n")
+        await asyncio.sleep(0.05)
+        pipeline.stop()
+
+    asyncio.run(run())
+    assert logger.records == [(logging.INFO, "again")]
+
+
+def test_invalid_ring_size() -> None:
+    with pytest.raises(ValueError):
+        OutputBatching(ring_size=0)
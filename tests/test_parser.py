@@ -1,8 +1,13 @@
+import subprocess
+import sys
+
+import pyparsing as pp
 import pytest
 
 from launch_moos.parser import assign_statement_line
 from launch_moos.parser import comment_line
 from launch_moos.parser import global_section
+from launch_moos.parser import grammar
 from launch_moos.parser import moos_file
 from launch_moos.parser import process_config_run_line
 from launch_moos.parser import processconfig
@@ -135,3 +140,18 @@ def test_parse_processconfig_block() -> None:
 # def test_moos_file():
 # moos_file_ex1 = open("moos_files/s15_pedi_alpha.moos", "rt").read()
 # r = moos_file.parse_string(moos_file_ex1, parse_all=True)
+
+
+def test_grammar_keeps_default_whitespace() -> None:
+    default_whitespace = pp.ParserElement.DEFAULT_WHITE_CHARS
+    grammar()
+    assert pp.ParserElement.DEFAULT_WHITE_CHARS == default_whitespace
+    assert "\n" not in moos_file.whiteChars
+
+
+def test_import_is_lazy() -> None:
+    code = (
+        "import sys, launch_moos.mission, launch_moos.cache;"
+        "assert not {'launch', 'pyparsing', 'em'} & set(sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
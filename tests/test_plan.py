@@ -0,0 +1,52 @@
+"""Tests for resolving what a mission launches."""
+import pytest
+
+from launch_moos.mission import Mission
+from launch_moos.plan import NEW_CONSOLE_PREFIX
+from launch_moos.plan import InvalidMissionFileError
+from launch_moos.plan import plan_mission
+
+
+MISSION = """\
+ServerPort = 9000
+
+ProcessConfig = ANTLER
+{
+  ExtraProcessParams = --verbose, --log=debug
+  Run = MOOSDB @ NewConsole = true
+  Run = pHelmIvP @ ExtraProcessParams = ExtraProcessParams ~ pHelmIvP_2
+}
+
+ProcessConfig = pHelmIvP_2
+{
+  AppTick = 4
+  Nice = 5
+}
+"""
+
+
+def test_plan_mission() -> None:
+    plan = plan_mission(Mission.from_string(MISSION), "/tmp/mission.moos")
+
+    moosdb, helm = plan.apps
+    assert moosdb.name == "MOOSDB"
+    assert moosdb.cmd == [*NEW_CONSOLE_PREFIX.split(), "MOOSDB", "/tmp/mission.moos"]
+    assert helm.name == "pHelmIvP_2"
+    assert helm.cmd[-5:] == [
+        "pHelmIvP",
+        "/tmp/mission.moos",
+        "pHelmIvP_2",
+        "--verbose",
+        "--log=debug",
+    ]
+    assert "--nice" in helm.cmd[:-5]
+    assert plan.mission_file == (
+        "ServerPort = 9000\n"
+        "\nProcessConfig = MOOSDB\n{\n}\n"
+        "\nProcessConfig = pHelmIvP_2\n{\n  AppTick = 4\n}\n"
+    )
+
+
+def test_plan_mission_requires_antler_block() -> None:
+    with pytest.raises(InvalidMissionFileError):
+        plan_mission(Mission.from_string("ServerPort = 9000\n"))
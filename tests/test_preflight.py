@@ -0,0 +1,120 @@
+"""Tests for the pre-flight checks of missions."""
+import socket
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from launch_moos.mission import Mission
+from launch_moos.preflight import ERROR
+from launch_moos.preflight import WARNING
+from launch_moos.preflight import PreflightError
+from launch_moos.preflight import Problem
+from launch_moos.preflight import check_mission
+from launch_moos.preflight import clear_executable_cache
+from launch_moos.preflight import find_executable
+from launch_moos.preflight import preflight
+
+
+MISSION = """\
+ServerHost = localhost
+ServerPort = {port}
+
+ProcessConfig = ANTLER
+{{
+  Run = MOOSDB @ NewConsole = false
+  Run = pHelmIvP @ NewConsole = false
+  Run = pHelmIvP @ NewConsole = false
+  Run = pMissing @ ExtraProcessParams = HelmParams ~ pMissing_1
+}}
+
+ProcessConfig = pHelmIvP
+{{
+  AppTick = 4
+}}
+
+ProcessConfig = pShare
+{{
+  AppTick = 4
+}}
+"""
+
+
+@pytest.fixture
+def path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    for name in ("MOOSDB", "pHelmIvP"):
+        executable = tmp_path / name
+        executable.write_text("#!/bin/sh\n")
+        executable.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+    clear_executable_cache()
+    return tmp_path
+
+
+@pytest.fixture
+def busy_port() -> Iterator[int]:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("localhost", 0))
+        s.listen()
+        yield s.getsockname()[1]
+
+
+def test_preflight_reports_every_problem(path: Path, busy_port: int) -> None:
+    mission = Mission.from_string(MISSION.format(port=busy_port))
+
+    assert preflight(mission) == [
+        Problem(
+            ERROR,
+            "'pHelmIvP' is run twice, by Run lines 2 and 3, "
+            "give one a different ~ alias",
+        ),
+        Problem(ERROR, "'pMissing' is not on PATH"),
+        Problem(
+            ERROR,
+            "ExtraProcessParams 'HelmParams' of 'pMissing_1' "
+            "is not set in the ANTLER block",
+        ),
+        Problem(ERROR, f"ServerPort {busy_port} is in use on localhost"),
+        Problem(WARNING, "ProcessConfig 'pShare' is not run"),
+    ]
+
+
+def test_preflight_skips_checks(path: Path, busy_port: int) -> None:
+    mission = Mission.from_string(MISSION.format(port=busy_port))
+
+    problems = preflight(mission, check_port=False, check_executables=False)
+    assert all("PATH" not in problem.message for problem in problems)
+    assert all("ServerPort" not in problem.message for problem in problems)
+
+
+def test_check_mission(path: Path) -> None:
+    valid = (
+        "ServerPort = 0\n\nProcessConfig = ANTLER\n{\n  Run = MOOSDB @ NewConsole = false\n}\n"
+        "\nProcessConfig = pShare\n{\n}\n"
+    )
+    assert check_mission(Mission.from_string(valid)) == [
+        Problem(WARNING, "ProcessConfig 'pShare' is not run")
+    ]
+
+    with pytest.raises(PreflightError) as e:
+        check_mission(Mission.from_string(MISSION.format(port="port")))
+    assert "ServerPort 'port' is not a number" in str(e.value)
+    assert len(e.value.problems) == 5
+
+
+@pytest.mark.parametrize("port", [-1, 70000])
+def test_port_out_of_range(port: int) -> None:
+    mission = Mission.from_string(MISSION.format(port=port))
+    assert Problem(ERROR, f"ServerPort {port} is not in 0-65535") in preflight(
+        mission, check_executables=False
+    )
+
+
+def test_find_executable_is_cached(path: Path) -> None:
+    assert find_executable("MOOSDB") == str(path / "MOOSDB")
+
+    (path / "MOOSDB").unlink()
+    assert find_executable("MOOSDB") == str(path / "MOOSDB")
+
+    clear_executable_cache()
+    assert find_executable("MOOSDB") is None
@@ -0,0 +1,91 @@
+"""Tests for the scheduling of apps."""
+import os
+import shlex
+import subprocess
+
+import pytest
+
+from launch_moos.mission import Assignment
+from launch_moos.scheduling import Scheduling
+from launch_moos.scheduling import parse_cpu_list
+from launch_moos.scheduling import without_scheduling_keys
+
+
+CONFIG = [
+    Assignment("AppTick", "20"),
+    Assignment("cpuaffinity", "2-3"),
+    Assignment("Nice", "-5"),
+    Assignment("IONice", "realtime"),
+    Assignment("SchedFIFO", "50"),
+    Assignment("CGroup", "/launch_moos.slice/pMarinePID/"),
+    Assignment("CGroupCPUMax", "50%"),
+    Assignment("CGroupMemoryMax", "64M"),
+]
+
+
+def test_from_config() -> None:
+    scheduling = Scheduling.from_config(CONFIG)
+
+    assert scheduling == Scheduling(
+        cpus={2, 3},
+        nice=-5,
+        ionice="realtime:4",
+        fifo_priority=50,
+        cgroup="launch_moos.slice/pMarinePID",
+        cpu_max="50000 100000",
+        memory_max=64 * 1024 * 1024,
+    )
+    assert scheduling.arguments() == [
+        "--cgroup",
+        "launch_moos.slice/pMarinePID",
+        "--cpus",
+        "2,3",
+        "--nice",
+        "-5",
+        "--ionice",
+        "realtime:4",
+        "--fifo",
+        "50",
+    ]
+    assert Scheduling.from_config(CONFIG[:1]) is None
+    assert without_scheduling_keys(CONFIG) == CONFIG[:1]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"cpus": "2-x"},
+        {"cpus": ""},
+        {"nice": 20},
+        {"ionice": "fast"},
+        {"fifo_priority": 0},
+        {"cpu_max": "lots", "cgroup": "a"},
+        {"memory_max": "1T", "cgroup": "a"},
+        {"memory_max": "1G"},
+    ],
+)
+def test_invalid_settings(kwargs) -> None:
+    with pytest.raises(ValueError):
+        Scheduling(**kwargs)
+
+
+def test_parse_cpu_list() -> None:
+    assert parse_cpu_list("0, 2-4,7") == {0, 2, 3, 4, 7}
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs Linux")
+def test_applied_at_spawn() -> None:
+    cpu = min(os.sched_getaffinity(0))
+    scheduling = Scheduling(cpus=[cpu], nice=os.getpriority(os.PRIO_PROCESS, 0) + 1)
+    script = (
+        "import os; print(os.sched_getaffinity(0), os.getpriority(os.PRIO_PROCESS, 0))"
+    )
+
+    result = subprocess.run(
+        shlex.split(scheduling.prefix()) + ["python3", "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.split() == [f"{{{cpu}}}", str(scheduling.nice)]
@@ -0,0 +1,106 @@
+"""Tests for the StaggeredLaunch action."""
+
+import asyncio
+import socket
+import time
+from typing import List
+
+import pytest
+from launch import LaunchContext
+from launch import LaunchDescription
+from launch import LaunchService
+from launch.actions import EmitEvent
+from launch.actions import OpaqueFunction
+from launch.actions import TimerAction
+from launch.events import Shutdown
+
+from launch_moos.actions import MOOSApp
+from launch_moos.actions import StaggeredLaunch
+from launch_moos.actions.staggered_launch import startup_order
+from launch_moos.actions.staggered_launch import wait_for_port
+
+
+def echo_apps(names: List[str]) -> List[MOOSApp]:
+    return [
+        MOOSApp(executable="echo", name=name, mission_file=name, output="screen")
+        for name in names
+    ]
+
+
+def test_wait_for_port() -> None:
+    with socket.socket() as server:
+        server.bind(("localhost", 0))
+        server.listen()
+        port = server.getsockname()[1]
+
+        assert asyncio.run(wait_for_port("localhost", port, 1.0))
+
+    assert not asyncio.run(wait_for_port("localhost", port, 0.05))
+
+
+def test_staggered_launch() -> None:
+    apps = echo_apps(["pLogger", "pHelmIvP", "uMemWatch"])
+    launch = StaggeredLaunch(apps=apps, ms_between_launches=50)
+
+    ls = LaunchService()
+    ls.include_launch_description(LaunchDescription([launch]))
+    assert ls.run() == 0
+
+    assert set(launch.startup_times) == {"pLogger", "pHelmIvP", "uMemWatch"}
+    assert all(t >= 0 for t in launch.startup_times.values())
+
+
+def test_moosdb_first() -> None:
+    moosdb = MOOSApp(executable="MOOSDB", mission_file="alpha.moos")
+    apps = echo_apps(["pLogger", "pHelmIvP"])
+
+    assert startup_order([*apps, moosdb]) == [moosdb, *apps]
+
+    moosdb = MOOSApp(executable="/opt/moos/bin/MOOSDB", mission_file="alpha.moos")
+    assert startup_order([*apps, moosdb]) == [moosdb, *apps]
+
+
+def test_no_app_started_after_shutdown() -> None:
+    apps = echo_apps(["pLogger", "pHelmIvP"])
+    launch = StaggeredLaunch(apps=apps, ms_between_launches=10000)
+    shutdown = TimerAction(period=0.2, actions=[EmitEvent(event=Shutdown())])
+
+    ls = LaunchService()
+    ls.include_launch_description(LaunchDescription([launch, shutdown]))
+    started_at = time.monotonic()
+    assert ls.run() == 0
+
+    assert time.monotonic() - started_at < 5
+    assert "pHelmIvP" not in launch.startup_times
+
+
+def test_replace_app_not_started() -> None:
+    apps = echo_apps(["pLogger", "pHelmIvP"])
+    new_helm = echo_apps(["pHelmIvP_new"])[0]
+    launch = StaggeredLaunch(apps=apps, ms_between_launches=300)
+    replaced = []
+
+    def replace(context: LaunchContext) -> None:
+        replaced.append(launch.replace(apps[0], echo_apps(["pLogger_new"])[0]))
+        replaced.append(launch.replace(apps[1], new_helm))
+
+    ls = LaunchService()
+    ls.include_launch_description(
+        LaunchDescription(
+            [
+                launch,
+                TimerAction(period=0.1, actions=[OpaqueFunction(function=replace)]),
+            ]
+        )
+    )
+    assert ls.run() == 0
+
+    # pLogger was already started
+    assert replaced == [False, True]
+    assert launch.apps == [apps[0], new_helm]
+    assert set(launch.startup_times) == {"pLogger", "pHelmIvP_new"}
+
+
+def test_invalid_concurrency() -> None:
+    with pytest.raises(ValueError):
+        StaggeredLaunch(apps=[], max_concurrent_startups=0)
@@ -0,0 +1,89 @@
+"""Tests for the streaming mission parser."""
+from pathlib import Path
+
+import pyparsing as pp
+import pytest
+
+from launch_moos.mission import AntlerRun
+from launch_moos.mission import Assignment
+from launch_moos.mission import Mission
+from launch_moos.mission import ProcessConfig
+from launch_moos.stream import BlockAssignment
+from launch_moos.stream import BlockEnd
+from launch_moos.stream import BlockStart
+from launch_moos.stream import GlobalAssignment
+from launch_moos.stream import RunLine
+from launch_moos.stream import iter_events
+from launch_moos.stream import iter_lines
+from launch_moos.stream import iter_mission
+from launch_moos.stream import mission_from_events
+
+
+MOOS_FILES = sorted((Path(__file__).parent / "moos_files").glob("*.moos"))
+
+
+def test_iter_events() -> None:
+    text = (
+        "ServerPort = 9000 // comment\n"
+        "\n"
+        "ProcessConfig = ANTLER\n"
+        "{\n"
+        "  MSBetweenLaunches = 200\n"
+        "  Run = MOOSDB @ NewConsole = false\n"
+        "}\n"
+    )
+
+    events = list(iter_events(text.split("\n")))
+
+    assert events == [
+        GlobalAssignment(1, Assignment("ServerPort", "9000")),
+        BlockStart(3, "ANTLER"),
+        BlockAssignment(5, Assignment("MSBetweenLaunches", "200")),
+        RunLine(6, AntlerRun("MOOSDB", (Assignment("NewConsole", "false"),))),
+        BlockEnd(
+            7,
+            ProcessConfig(
+                "ANTLER",
+                (Assignment("MSBetweenLaunches", "200"),),
+                (AntlerRun("MOOSDB", (Assignment("NewConsole", "false"),)),),
+            ),
+        ),
+    ]
+
+
+def test_header_without_brace_is_global() -> None:
+    events = list(iter_events("ProcessConfig = A\nfoo = 1\n".split("\n")))
+
+    assert events == [
+        GlobalAssignment(1, Assignment("ProcessConfig", "A")),
+        GlobalAssignment(2, Assignment("foo", "1")),
+    ]
+
+
+@pytest.mark.parametrize("mission_file", MOOS_FILES, ids=lambda p: p.name)
+@pytest.mark.parametrize("chunk_size", [7, 64 * 1024])
+def test_matches_mission_on_corpus(mission_file: Path, chunk_size: int) -> None:
+    mission = mission_from_events(iter_mission(mission_file, chunk_size))
+
+    assert mission == Mission.from_file(mission_file)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "a = b",
+        "ProcessConfig = A\n{\n}",
+        "ProcessConfig = A\n{\n  not an assignment\n}\n",
+        "ProcessConfig = A\n{\n  a = 1\n",
+    ],
+)
+def test_rejects_invalid_files(text: str) -> None:
+    with pytest.raises(pp.ParseException):
+        list(iter_events(text.split("\n")))
+
+
+def test_iter_lines(tmp_path: Path) -> None:
+    path = tmp_path / "lines.txt"
+    path.write_bytes(b"first\r\nsecond line\nthird")
+
+    assert list(iter_lines(path, chunk_size=3)) == ["first", "second line", "third"]
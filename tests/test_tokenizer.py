@@ -0,0 +1,83 @@
+"""Tests for the tokenizer parser backend."""
+from pathlib import Path
+
+import pyparsing as pp
+import pytest
+
+from launch_moos.parser import moos_file
+from launch_moos.parser import parse_mission
+from launch_moos.tokenizer import parse_string
+
+
+MOOS_FILES = sorted((Path(__file__).parent / "moos_files").glob("*.moos"))
+
+
+@pytest.mark.parametrize("mission_file", MOOS_FILES, ids=lambda p: p.name)
+def test_matches_grammar_on_corpus(mission_file: Path) -> None:
+    text = mission_file.read_text()
+
+    expected = moos_file.parse_string(text, parse_all=True)
+    r = parse_string(text)
+
+    assert r.dump() == expected.dump()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "ServerHost   = localhost\n",
+        "  absolute_time_gap = 1   // In Seconds, Default is 4\n",
+        "a = b //\n",
+        "a = http://example.com\n",
+        "right_context[return] = DEPLOY=true\n",
+        "action+ = MENU_KEY=deploy # DEPLOY = true\n",
+        "Run = MOOSDB @ NewConsole = false\n",
+        "ProcessConfig = A\nfoo = 1\n",
+        "ProcessConfig = A\n{\n}\n",
+        "ProcessConfig=A\n{\n  Run=X@A=1\n  Run = Y\n}\n",
+        "ProcessConfig = A\n{\nRun = X @ A=1B=2\n}\n",
+        "ProcessConfig = A\n{\nRun = X @ A=1 ~ Y Z\n}\n",
+        "Processconfig = ANTLER\n{\n"
+        "  Run = pHelmIvP\t@ NewConsole = true, ExtraProcessParams=HParams\n"
+        "  Run = uTimerScript @ NewConsole = false ~uTimerScript_SensorConfig\n"
+        "}\n",
+    ],
+)
+def test_matches_grammar(text: str) -> None:
+    expected = moos_file.parse_string(text, parse_all=True)
+    r = parse_string(text)
+
+    assert r.dump() == expected.dump()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "a = b",
+        "//\n",
+        "ProcessConfig = A\n{\n}",
+        "ProcessConfig = A\n\n{\n}\n",
+        "ProcessConfig = A\n{\n  not an assignment\n}\n",
+    ],
+)
+def test_rejects_what_grammar_rejects(text: str) -> None:
+    with pytest.raises(pp.ParseException):
+        moos_file.parse_string(text, parse_all=True)
+
+    with pytest.raises(pp.ParseException):
+        parse_string(text)
+
+
+def test_parse_mission_backends() -> None:
+    text = MOOS_FILES[0].read_text()
+
+    r = parse_mission(text, backend="tokenizer")
+    assert r.dump() == parse_mission(text).dump()
+
+    antler = r[6]
+    assert antler["processconfig_name"] == "ANTLER"
+    assert antler["config"][1]["executable"] == "MOOSDB"
+    assert antler["config"][1]["params"][0]["name"] == "NewConsole"
+
+    with pytest.raises(ValueError):
+        parse_mission(text, backend="lark")
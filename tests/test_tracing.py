@@ -0,0 +1,86 @@
+"""Tests for the launch timeline tracing."""
+import importlib
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from launch_moos import tracing
+from launch_moos.mission import Mission
+from launch_moos.moosfile_generator import evaluate_template
+
+
+MISSION_FILE = Path(__file__).parent / "moos_files" / "s15_pedi_alpha.moos"
+
+
+@pytest.fixture
+def tracer(tmp_path: Path) -> Iterator[tracing.Tracer]:
+    yield tracing.enable(tmp_path / "trace.json")
+    tracing.disable()
+
+
+def test_disabled_by_default() -> None:
+    assert tracing.get_tracer() is None
+    with tracing.span("parse") as span:
+        assert span is tracing.span("spawn")
+
+
+def test_stages_are_traced(tracer: tracing.Tracer) -> None:
+    mission = Mission.from_file(MISSION_FILE)
+    evaluate_template(
+        {
+            "process_name": "pHelmIvP",
+            "global_variables": mission.global_config,
+            "process_variables": mission.process_config("pHelmIvP").config,
+        }
+    )
+
+    names = [event["name"] for event in tracer.events]
+    assert names == ["parse", "evaluate_template"]
+    assert tracer.events[0]["args"] == {
+        "backend": "tokenizer",
+        "size": str(len(MISSION_FILE.read_text())),
+    }
+
+
+def test_chrome_trace(tracer: tracing.Tracer) -> None:
+    tracer.add_span("spawn", 10.0, 1010.0, lane="pHelmIvP", pid=42)
+    tracer.add_span("spawn", 20.0, 3020.0, lane="MOOSDB")
+    with tracing.span("parse"):
+        pass
+
+    tracer.close()
+    trace = json.loads(tracer.path.read_text())
+
+    lanes = {
+        event["args"]["name"]: event["tid"]
+        for event in trace["traceEvents"]
+        if event["ph"] == "M"
+    }
+    assert lanes == {"pHelmIvP": 1, "MOOSDB": 2}
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert spans[0] == {
+        "name": "spawn",
+        "ph": "X",
+        "ts": 10.0,
+        "dur": 1000.0,
+        "pid": spans[0]["pid"],
+        "tid": 1,
+        "args": {"pid": "42"},
+    }
+
+    summary = tracer.summary().splitlines()
+    assert summary[1].split() == ["spawn", "2", "4.000", "3.000"]
+    assert summary[2].split()[:2] == ["parse", "1"]
+
+
+def test_enabled_by_environment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(tracing.ENV_VAR, str(tmp_path / "env.json"))
+    try:
+        importlib.reload(tracing)
+        assert tracing.get_tracer().path == tmp_path / "env.json"
+    finally:
+        tracing.disable()
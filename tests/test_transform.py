@@ -1 +1,250 @@
+"""Tests for translating mission files into launch actions."""
+
+import asyncio
+import shlex
+from pathlib import Path
+
 import pytest
+from launch import LaunchContext
+from launch.actions import RegisterEventHandler
+
+from launch_moos import MOOSMissionFileDescriptionSource
+from launch_moos.actions import MOOSApp
+from launch_moos.actions import StaggeredLaunch
+from launch_moos.cache import ParseCache
+from launch_moos.fleet import expand_fleet
+from launch_moos.generated_files import GeneratedFileStore
+from launch_moos.mission import Mission
+from launch_moos.scheduling import Scheduling
+from launch_moos.stream import iter_mission
+from launch_moos.transform import InvalidMissionFileError
+from launch_moos.transform import antler_run_statement_to_action
+from launch_moos.transform import iter_mission_actions
+from launch_moos.transform import mission_to_actions
+from launch_moos.transform import mission_to_staggered_launch
+from launch_moos.transform import vehicle_to_launch_description
+
+
+MISSION_FILE = Path(__file__).parent / "moos_files" / "s15_pedi_alpha.moos"
+
+
+def test_antler_run_statement_to_action() -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    mission = Mission.from_file(MISSION_FILE)
+    helm_run = mission.runs[4]
+
+    helm_app = antler_run_statement_to_action(helm_run, mission)
+    helm_app.execute(lc)
+
+    cmd = helm_app.process_details["cmd"]
+    assert cmd[0] == "pHelmIvP"
+    text = Path(cmd[1]).read_text()
+    assert text.startswith("ServerHost = localhost\n")
+    assert "ProcessConfig = pHelmIvP\n{\n  AppTick = 4\n" in text
+    assert "  domain = speed:0:4:41\n}\n" in text
+
+
+def test_antler_run_params() -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    mission = Mission.from_string(
+        "ProcessConfig = ANTLER\n{\n"
+        "  HParams = --verbose, --alpha=1\n"
+        "  Run = pHelmIvP @ NewConsole = true, ExtraProcessParams=HParams\n"
+        "  Run = uTimerScript @ NewConsole = false ~uTimerScript_SensorConfig\n"
+        "}\n"
+    )
+    helm_app, timer_app = mission_to_actions(mission)
+
+    helm_app.execute(lc)
+    assert helm_app.process_details["cmd"][0] == "xterm"
+    assert helm_app.process_details["cmd"][-2:] == ["--verbose", "--alpha=1"]
+
+    timer_app.execute(lc)
+    assert timer_app.alias == "uTimerScript_SensorConfig"
+    assert timer_app.process_details["cmd"][2] == "uTimerScript_SensorConfig"
+
+
+def test_antler_run_missing_extra_params() -> None:
+    mission = Mission.from_string(
+        "ProcessConfig = ANTLER\n{\n"
+        "  Run = pHelmIvP @ ExtraProcessParams=HParams\n"
+        "}\n"
+    )
+
+    with pytest.raises(InvalidMissionFileError):
+        mission_to_actions(mission)
+
+
+def test_mission_file_description_source(tmp_path: Path) -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    source = MOOSMissionFileDescriptionSource(
+        str(MISSION_FILE),
+        parse_cache=ParseCache(tmp_path),
+        file_store=GeneratedFileStore(tmp_path / "generated"),
+        preflight=False,
+    )
+    ld = source.get_launch_description(lc)
+
+    cleanup, launch = ld.entities
+    assert isinstance(cleanup, RegisterEventHandler)
+    assert isinstance(launch, StaggeredLaunch)
+    apps = launch.apps
+    assert all(isinstance(app, MOOSApp) for app in apps)
+
+    for app in apps:
+        app.execute(lc)
+    mission_files = {app.process_details["cmd"][1] for app in apps}
+    assert len(mission_files) == 1
+    mission_file = Path(mission_files.pop())
+    assert mission_file.parent == tmp_path / "generated"
+    text = mission_file.read_text()
+    assert text.count("ServerPort = 9000") == 1
+    assert "ProcessConfig = pMarinePID\n" in text
+    assert [app.name for app in apps] == [
+        run.name for run in Mission.from_file(MISSION_FILE).runs
+    ]
+
+
+def test_mission_to_staggered_launch() -> None:
+    mission = Mission.from_file(MISSION_FILE)
+    apps = mission_to_actions(mission)
+
+    launch = mission_to_staggered_launch(mission, apps)
+
+    assert launch.apps == apps
+
+
+def test_staggered_launch_invalid_delay() -> None:
+    mission = Mission.from_string(
+        "ProcessConfig = ANTLER\n{\n"
+        "  MSBetweenLaunches = soon\n"
+        "  Run = MOOSDB @ NewConsole = false\n"
+        "}\n"
+    )
+
+    with pytest.raises(InvalidMissionFileError):
+        mission_to_staggered_launch(mission, mission_to_actions(mission))
+
+
+def test_vehicle_to_launch_description() -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    mission = Mission.from_file(MISSION_FILE)
+    alpha, bravo = expand_fleet(mission, {"alpha": {}, "bravo": {}})
+
+    ld = vehicle_to_launch_description(bravo, staggered=False)
+
+    close_file, *apps = ld.entities
+    assert isinstance(close_file, RegisterEventHandler)
+    for app in apps:
+        app.execute(lc)
+    mission_files = {app.process_details["cmd"][1] for app in apps}
+    assert len(mission_files) == 1
+    assert Path(mission_files.pop()).read_text() == bravo.mission_text
+
+
+def test_description_source_macros(tmp_path: Path) -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    source = MOOSMissionFileDescriptionSource(
+        str(MISSION_FILE.parent / "nsplug" / "meta_vehicle.moos"),
+        parse_cache=ParseCache(tmp_path),
+        staggered=False,
+        macros={"VNAME": "bravo", "VPORT": "9001"},
+        preflight=False,
+    )
+    _, moosdb, logger = source.get_launch_description(lc).entities
+
+    logger.execute(lc)
+    text = Path(logger.process_details["cmd"][1]).read_text()
+    assert "ServerPort = 9001\n" in text
+    assert "File = LOG_BRAVO\n" in text
+
+
+def test_iter_mission_actions() -> None:
+    mission = Mission.from_file(MISSION_FILE)
+
+    streamed = list(iter_mission_actions(iter_mission(MISSION_FILE)))
+
+    assert sorted(run.name for run, _ in streamed) == sorted(
+        run.name for run in mission.runs
+    )
+    assert all(app.name == run.name for run, app in streamed)
+
+
+def test_iter_mission_actions_without_antler(tmp_path: Path) -> None:
+    mission_file = tmp_path / "mission.moos"
+    mission_file.write_text("ServerPort = 9000\n")
+
+    with pytest.raises(InvalidMissionFileError):
+        list(iter_mission_actions(iter_mission(mission_file)))
+
+
+def test_description_source_streaming(tmp_path: Path) -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    source = MOOSMissionFileDescriptionSource(
+        str(MISSION_FILE), streaming=True, preflight=False
+    )
+    _, launch = source.get_launch_description(lc).entities
+
+    apps = launch.apps
+    assert [app.name for app in apps] == [
+        run.name for run in Mission.from_file(MISSION_FILE).runs
+    ]
+    for app in apps:
+        app.execute(lc)
+    text = Path(apps[-1].process_details["cmd"][1]).read_text()
+    assert text.count("ServerPort = 9000") == 1
+    assert "ProcessConfig = pMarinePID\n" in text
+
+
+def test_antler_run_scheduling() -> None:
+    lc = LaunchContext()
+    lc._set_asyncio_loop(asyncio.get_event_loop())
+
+    mission = Mission.from_string(
+        "ProcessConfig = ANTLER\n{\n"
+        "  Run = pMarinePID @ NewConsole = true\n"
+        "}\n"
+        "ProcessConfig = pMarinePID\n{\n"
+        "  AppTick = 20\n"
+        "  CPUAffinity = 3\n"
+        "  Nice = -10\n"
+        "}\n"
+    )
+
+    (app,) = mission_to_actions(mission)
+
+    assert app.scheduling == Scheduling(cpus={3}, nice=-10)
+    app.execute(lc)
+    cmd = app.process_details["cmd"]
+    # scheduling first, then the console
+    assert cmd[: cmd.index("--") + 1] == shlex.split(app.scheduling.prefix())
+    assert cmd[cmd.index("--") + 1 : cmd.index("--") + 4] == [
+        "xterm",
+        "-e",
+        "pMarinePID",
+    ]
+    text = Path(cmd[-1]).read_text()
+    assert "AppTick = 20\n" in text
+    assert "Nice" not in text
+
+
+def test_antler_run_invalid_scheduling() -> None:
+    mission = Mission.from_string(
+        "ProcessConfig = ANTLER\n{\n  Run = pMarinePID\n}\n"
+        "ProcessConfig = pMarinePID\n{\n  Nice = very\n}\n"
+    )
+
+    with pytest.raises(InvalidMissionFileError):
+        mission_to_actions(mission)
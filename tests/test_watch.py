@@ -0,0 +1,72 @@
+"""Tests for watching mission files."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from launch_moos.watch import MissionFileWatcher
+
+
+async def next_change(watcher: MissionFileWatcher, path: Path, text: str) -> bytes:
+    changes = watcher.changes()
+    change = asyncio.ensure_future(changes.__anext__())
+    await asyncio.sleep(0.05)
+
+    path.write_text("ServerPort = 9000\n")  # unchanged contents are ignored
+    await asyncio.sleep(0.1)
+    assert not change.done()
+
+    path.write_text(text)
+    try:
+        return await asyncio.wait_for(change, 2)
+    finally:
+        await changes.aclose()
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher(tmp_path: Path, use_inotify: bool) -> None:
+    path = tmp_path / "alpha.moos"
+    path.write_text("ServerPort = 9000\n")
+    watcher = MissionFileWatcher(path, poll_interval=0.01, use_inotify=use_inotify)
+
+    contents = asyncio.run(next_change(watcher, path, "ServerPort = 9001\n"))
+
+    assert contents == b"ServerPort = 9001\n"
+
+
+def test_watcher_replaced_file(tmp_path: Path) -> None:
+    path = tmp_path / "alpha.moos"
+    path.write_text("ServerPort = 9000\n")
+    watcher = MissionFileWatcher(path, poll_interval=0.01)
+
+    async def replace() -> bytes:
+        changes = watcher.changes()
+        change = asyncio.ensure_future(changes.__anext__())
+        await asyncio.sleep(0.05)
+        new_path = tmp_path / "alpha.moos.swp"
+        new_path.write_text("ServerPort = 9002\n")
+        new_path.replace(path)
+        try:
+            return await asyncio.wait_for(change, 2)
+        finally:
+            await changes.aclose()
+
+    assert asyncio.run(replace()) == b"ServerPort = 9002\n"
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_dependencies(tmp_path: Path, use_inotify: bool) -> None:
+    path = tmp_path / "alpha.moos"
+    path.write_text("#include plugs/plug_pHelmIvP.moos\n")
+    plug = tmp_path / "plugs" / "plug_pHelmIvP.moos"
+    plug.parent.mkdir()
+    plug.write_text("ServerPort = 9000\n")
+    watcher = MissionFileWatcher(
+        path, poll_interval=0.01, use_inotify=use_inotify, dependencies=[plug]
+    )
+
+    contents = asyncio.run(next_change(watcher, plug, "ServerPort = 9001\n"))
+
+    # the included file changed, the contents are the ones of the mission file
+    assert contents == b"#include plugs/plug_pHelmIvP.moos\n"